@@ -1,29 +1,119 @@
-from flask import Flask, render_template, request, send_file
-import pandas as pd
-from sentiment_analyzer import SentimentAnalyzer
-import io
+from flask import Flask, Response, render_template, request, send_file, jsonify, url_for, abort, redirect, stream_with_context
+from student_analyzer import create_sentiment_analyzer
+from utils.ingestion import file_extension, is_supported, read_columns
+from utils.job_queue import JobQueue
+from utils.streaming import follow_file, gzip_stream
+import os
+import shutil
+import tempfile
 
 app = Flask(__name__)
-sentiment_analyzer = SentimentAnalyzer()
+# Warm-up runs here, before the server starts accepting connections.
+# SENTIMENT_BACKEND=student serves the distilled model instead of BERT
+sentiment_analyzer = create_sentiment_analyzer(warmup=True)
+# Uploads are processed in the background; state survives restarts
+job_queue = JobQueue(
+    sentiment_analyzer,
+    os.environ.get('SENTIMENT_JOBS_DIR', os.path.join(tempfile.gettempdir(), 'sentiment_jobs'))
+)
+
+def wants_json():
+    return request.accept_mimetypes.best == 'application/json'
+
+def job_status(job):
+    status = {
+        'job_id': job['id'],
+        'status': job['status'],
+        'progress': job['progress'],
+        'rows_done': job['rows_done'],
+        'rows_total': job['rows_total'],
+        'status_url': url_for('get_job', job_id=job['id']),
+        'stream_url': url_for('stream_job', job_id=job['id'])
+    }
+    if job['status'] == 'finished':
+        status['download_url'] = url_for('download_job', job_id=job['id'])
+        result_store = job_queue.get_result_store(job['id'])
+        if result_store is not None:
+            status['sentiment_counts'] = result_store.sentiment_counts()
+    if job['status'] == 'failed':
+        status['error'] = job['error']
+    return status
+
+@app.route('/ready')
+def ready():
+    if sentiment_analyzer.ready:
+        return jsonify(status='ready')
+    return jsonify(status='warming up'), 503
+
+@app.route('/metrics')
+def metrics():
+    # Rolling window of model calls from interactive requests and background jobs
+    return jsonify(sentiment_analyzer.monitor.snapshot())
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        abort(404)
+    if wants_json():
+        return jsonify(job_status(job))
+    return render_template('job.html', job=job_status(job))
+
+@app.route('/jobs/<job_id>/download')
+def download_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None or job['status'] != 'finished':
+        abort(404)
+    return send_file(job['output_path'], mimetype='text/csv', as_attachment=True, download_name=job['download_name'])
+
+@app.route('/jobs/<job_id>/stream')
+def stream_job(job_id):
+    # Rows are sent as the job appends them to its output file, so clients get
+    # results before the job finishes and memory does not grow with output size
+    job = job_queue.get(job_id)
+    if job is None or job['status'] == 'failed':
+        abort(404)
+
+    def is_finished():
+        return job_queue.get(job_id)['status'] in ('finished', 'failed')
+
+    body = follow_file(job['output_path'], is_finished)
+    download_name = job['download_name']
+    mimetype = 'text/csv'
+    if request.args.get('gzip') == '1':
+        body = gzip_stream(body)
+        download_name += '.gz'
+        mimetype = 'application/gzip'
+
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{download_name}"'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
     if request.method == 'POST':
         if 'file' in request.files:
             file = request.files['file']
-            if file.filename.endswith('.csv'):
-                df = pd.read_csv(file)
-                if 'feedback' in df.columns:
-                    df['sentiment'] = df['feedback'].apply(sentiment_analyzer.analyze_sentiment)
-                    output = io.BytesIO()
+            if is_supported(file.filename):
+                job_id, job_dir = job_queue.new_job_dir()
+                input_path = os.path.join(job_dir, 'input' + file_extension(file.filename))
+                file.save(input_path)
+                
+                columns = read_columns(input_path)
+                if 'feedback' in columns:
                     output_filename = f"{file.filename.split('.')[0]}_sentiments.csv"
-                    df.to_csv(output, index=False, encoding='utf-8')
-                    output.seek(0)
-                    return send_file(output, mimetype='text/csv', as_attachment=True, download_name=output_filename)
+                    job_queue.submit(job_id, input_path, 'feedback', output_filename)
+                    if request.values.get('stream'):
+                        return redirect(url_for('stream_job', job_id=job_id, gzip=request.values.get('gzip')), code=303)
+                    if wants_json():
+                        return jsonify(job_status(job_queue.get(job_id))), 202
+                    return render_template('job.html', job=job_status(job_queue.get(job_id)))
                 else:
-                    return render_template('index.html', error='CSV file must contain a "feedback" column.')
+                    shutil.rmtree(job_dir, ignore_errors=True)
+                    return render_template('index.html', error='File must contain a "feedback" column.')
             else:
-                return render_template('index.html', error='Please upload a CSV file.')
+                return render_template('index.html', error='Please upload a CSV, Excel (.xlsx) or JSON Lines file.')
         elif 'text' in request.form:
             text = request.form['text']
             sentiment = sentiment_analyzer.analyze_sentiment(text)
@@ -31,4 +121,5 @@ def index():
     return render_template('index.html')
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    # The reloader would start a second process with its own job workers
+    app.run(debug=True, use_reloader=False)
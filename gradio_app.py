@@ -1,29 +1,66 @@
 import gradio as gr
 import pandas as pd
 import numpy as np
-from sentiment_analyzer_2 import SentimentAnalyzer
+from student_analyzer import create_sentiment_analyzer
 from utils.text_preprocessor import TextPreprocessor
+from utils.language_detector import LanguageDetector
+from utils.lexicon_prefilter import LexiconPreFilter
 from utils.visualization_generator import VisualizationGenerator
+from utils.pipeline import SentimentPipeline
+from utils.ingestion import SUPPORTED_EXTENSIONS, estimate_rows, file_extension, read_sample
+from utils.visualization_cache import VisualizationCache
+from utils.keyword_engine import KeywordExtractor
+from utils.aspect_sentiment import AspectSentimentAnalyzer
+from utils.sentence_sentiment import SentenceSentimentAnalyzer
+from utils.duplicate_clusters import NearDuplicateClusterer, DuplicateResultCache
+from utils.session_store import SessionResultStore
 import plotly.graph_objects as go
-import base64
-from io import BytesIO
-from PIL import Image
 import os
 import tempfile
+import threading
+import time
+import uuid
 
 class SentimentAnalysisApp:
-    def __init__(self):
-        self.sentiment_analyzer = SentimentAnalyzer()
+    def __init__(self, interactive_concurrency=4, batch_concurrency=1, batch_queue_size=8):
+        # Single-text requests and CSV jobs run on separate queues ("lanes") so long
+        # batch jobs cannot hold up interactive analysis
+        self.interactive_concurrency = interactive_concurrency
+        self.batch_concurrency = batch_concurrency
+        self.batch_queue_size = batch_queue_size
+        self.batch_ticket_ttl = 3600
+        self._batch_tickets = {}
+        self._batch_running = 0
+        self._batch_jobs_lock = threading.Lock()
+        
+        # Warm-up finishes before the interface is launched, so the server only
+        # starts accepting connections once the model is ready
+        # SENTIMENT_BACKEND=student serves the distilled model instead of BERT
+        self.sentiment_analyzer = create_sentiment_analyzer(warmup=True)
         self.text_preprocessor = TextPreprocessor()
+        # WordNet and punkt load lazily on first use
+        self.text_preprocessor.clean_text("Warming up the lemmatizers and tokenizers.")
+        # The model is multilingual; English-only preprocessing is limited to English rows
+        self.language_detector = LanguageDetector()
+        self.prefilter = LexiconPreFilter()
+        self.aspect_analyzer = AspectSentimentAnalyzer(self.sentiment_analyzer)
+        self.sentence_analyzer = SentenceSentimentAnalyzer(self.sentiment_analyzer)
+        self.duplicate_clusterer = NearDuplicateClusterer()
+        # Labels of clustered texts, filled by runs that group duplicates and reused by
+        # later runs; it survives restarts in DEFAULT_CACHE_PATH
+        self.duplicate_cache = DuplicateResultCache.load()
         self.viz_generator = VisualizationGenerator()
-        self.processed_data = None
+        self.viz_cache = VisualizationCache()
+        # Results are stored per browser session; the interface only keeps a session id
+        self.session_store = SessionResultStore()
     
     def analyze_single_text(self, text, apply_preprocessing):
         if not text or not text.strip():
             return "⚠️ Please enter some text to analyze.", "", ""
         
         if apply_preprocessing:
-            cleaned_text = self.text_preprocessor.clean_text(text, apply_preprocessing=True)
+            language = self.language_detector.detect(text)
+            cleaned_text = self.text_preprocessor.clean_text_for_language(text, language, apply_preprocessing=True)
             analysis_text = cleaned_text
         else:
             cleaned_text = text
@@ -42,60 +79,162 @@ class SentimentAnalysisApp:
         emoji = sentiment_emoji.get(sentiment, "🤔")
         result = f"## {emoji} Sentiment Analysis Result\n\n**Sentiment:** {sentiment}\n\n**Confidence:** {confidence:.3f} ({confidence*100:.1f}%)"
         
+        # Multi-sentence texts also get a per-sentence breakdown of the original text;
+        # single sentences skip the extra forward pass
+        if len(self.sentence_analyzer.split_sentences(text)) > 1:
+            sentences, documents = self.sentence_analyzer.analyze([text], interactive=True)
+            result += f"\n\n### 🧾 Sentence Breakdown (average: {documents['star_score'].iloc[0]:.2f} ⭐)\n\n| Sentence | Sentiment | Confidence |\n|---|---|---|"
+            for row in sentences.itertuples():
+                sentence_text = row.sentence.replace('|', '\\|')
+                result += f"\n| {sentence_text} | {sentiment_emoji.get(row.sentiment, '🤔')} {row.sentiment} | {row.confidence:.1%} |"
+        
         confidence_bar = f"Confidence: {confidence:.1%}"
         
         return result, cleaned_text, confidence_bar
     
-    def process_csv_file(self, file, text_column, apply_preprocessing, progress=gr.Progress()):
+    def process_csv_file(self, file, text_column, apply_preprocessing, compress_download=False, use_prefilter=False, group_duplicates=False, session_id=None, progress=gr.Progress()):
+        session_id = session_id or self.session_store.new_session_id()
+        
         if file is None:
-            return "⚠️ Please upload a CSV file.", None, gr.update(choices=[], value=None)
+            return "⚠️ Please upload a CSV, Excel or JSON Lines file.", None, gr.update(choices=[], value=None), session_id
         
+        output_file = None
         try:
-            progress(0.1, desc="📖 Reading CSV file...")
-            df = pd.read_csv(file.name)
+            progress(0.1, desc="📖 Reading file...")
+            preview = read_sample(file.name, nrows=100)
             
-            if df.empty:
-                return "❌ The uploaded file is empty.", None, gr.update(choices=[], value=None)
+            if preview.empty:
+                return "❌ The uploaded file is empty.", None, gr.update(choices=[], value=None), session_id
             
-            text_columns = [col for col in df.columns if df[col].dtype == 'object']
+            text_columns = [col for col in preview.columns if preview[col].dtype == 'object']
             
-            if not text_column or text_column not in df.columns:
+            if not text_column or text_column not in preview.columns:
                 if text_columns:
-                    return f"⚠️ Please select a valid text column. Available: {', '.join(text_columns)}", None, gr.update(choices=text_columns, value=text_columns[0])
+                    return f"⚠️ Please select a valid text column. Available: {', '.join(text_columns)}", None, gr.update(choices=text_columns, value=text_columns[0]), session_id
                 else:
-                    return "❌ No text columns found in the CSV file.", None, gr.update(choices=[], value=None)
+                    return "❌ No text columns found in the file.", None, gr.update(choices=[], value=None), session_id
             
-            progress(0.2, desc="🧹 Preprocessing text...")
+            progress(0.2, desc="🤖 Analyzing sentiment...")
             
-            if apply_preprocessing:
-                df = self.text_preprocessor.preprocess_dataframe(df, text_column, apply_preprocessing=True)
-                analysis_column = f'{text_column}_cleaned'
-            else:
-                analysis_column = text_column
+            # Reading, preprocessing, tokenization and inference run as overlapping
+            # pipeline stages; results are written to the download file as they complete
+            # Runs that group duplicates need every row's embedding, so only the
+            # other runs answer known duplicates from the cache
+            prefilters = []
+            if not group_duplicates and len(self.duplicate_cache):
+                prefilters.append(self.duplicate_cache)
+            if use_prefilter:
+                prefilters.append(self.prefilter)
+            pipeline = SentimentPipeline(
+                self.sentiment_analyzer,
+                self.text_preprocessor,
+                apply_preprocessing=apply_preprocessing,
+                language_detector=self.language_detector,
+                prefilter=prefilters or None,
+                collect_embeddings=group_duplicates
+            )
+            output_file = self._prepare_download_path(file.name, session_id, compress_download)
+            # Line counts are cheap and close enough to move the bar from 0.2 to 0.8
+            rows_total = estimate_rows(file.name)
+            
+            def report_progress(rows):
+                if rows_total:
+                    progress(0.2 + 0.6 * min(rows / rows_total, 1.0), desc=f"🤖 Analyzed {rows} of ~{rows_total} rows...")
+                else:
+                    progress(0.5, desc=f"🤖 Analyzed {rows} rows...")
             
-            progress(0.4, desc="🤖 Analyzing sentiment...")
+            # The download keeps every input column; the session only keeps the text
+            # column and date columns for the timeline
+            df = pipeline.run(
+                file.name,
+                text_column,
+                output_path=output_file,
+                progress_callback=report_progress,
+                collect_columns=[text_column] + self._date_columns(preview.columns)
+            )
             
-            df = self.sentiment_analyzer.analyze_dataframe(df, analysis_column, show_progress=False)
+            if group_duplicates:
+                # Embeddings come from the same forward pass as the sentiment scores
+                progress(0.85, desc="🔁 Grouping near-duplicates...")
+                df['duplicate_cluster'] = self.duplicate_clusterer.fit(pipeline.embeddings)
+                self.duplicate_cache.add_clusters(df[text_column], df['sentiment'], df['confidence'], df['duplicate_cluster'])
+                self.duplicate_cache.save()
             
-            progress(0.8, desc="📊 Generating summary...")
+            progress(0.9, desc="📊 Generating summary...")
             
-            self.processed_data = df
+            self.session_store.put(
+                session_id,
+                df,
+                summary=pipeline.summary,
+                fingerprint=VisualizationCache.fingerprint(df),
+                # The store deletes the session's download folder when it drops the session
+                download_path=output_file
+            )
             
             total_entries = len(df)
-            sentiment_dist = self.sentiment_analyzer.get_sentiment_distribution(df)
-            confidence_stats = self.sentiment_analyzer.get_confidence_stats(df)
+            sentiment_dist = self.sentiment_analyzer.get_sentiment_distribution(summary=pipeline.summary)
+            confidence_stats = self.sentiment_analyzer.get_confidence_stats(summary=pipeline.summary)
             
             summary_html = self._create_animated_summary(total_entries, sentiment_dist, confidence_stats)
             
-            progress(0.9, desc="💾 Preparing download...")
-            output_file = self._prepare_download_file(df, file.name)
-            
             progress(1.0, desc="✅ Complete!")
             
-            return summary_html, output_file, gr.update(choices=text_columns, value=text_column)
+            return summary_html, output_file, gr.update(choices=text_columns, value=text_column), session_id
             
         except Exception as e:
-            return f"❌ Error processing file: {str(e)}", None, gr.update(choices=[], value=None)
+            self._discard_download(output_file)
+            return f"❌ Error processing file: {str(e)}", None, gr.update(choices=[], value=None), session_id
+    
+    def _discard_download(self, output_file):
+        # A failed run never reaches the session store, so its partial download
+        # would otherwise stay on disk
+        if output_file is None:
+            return
+        try:
+            os.remove(output_file)
+            os.rmdir(os.path.dirname(output_file))
+        except OSError:
+            # Missing, or the folder still holds the download of an earlier run
+            pass
+    
+    def _admit_batch_job(self):
+        with self._batch_jobs_lock:
+            # Tickets of clients that disconnected while waiting expire eventually
+            now = time.monotonic()
+            self._batch_tickets = {
+                ticket: admitted_at for ticket, admitted_at in self._batch_tickets.items()
+                if now - admitted_at < self.batch_ticket_ttl
+            }
+            
+            waiting = len(self._batch_tickets) + self._batch_running
+            if waiting >= self.batch_queue_size:
+                return None, "⏳ The batch queue is full. Please try again in a few minutes."
+            
+            ticket = uuid.uuid4().hex
+            self._batch_tickets[ticket] = now
+        
+        if waiting >= self.batch_concurrency:
+            return ticket, f"📥 Queued: {waiting - self.batch_concurrency + 1} file(s) ahead of yours. Processing starts automatically."
+        return ticket, "🚀 Processing started..."
+    
+    def queue_csv_file(self, file):
+        if file is None:
+            return "⚠️ Please upload a CSV file.", None
+        
+        ticket, message = self._admit_batch_job()
+        return f"<div style='text-align: center; padding: 40px; color: #6c757d;'>{message}</div>", ticket
+    
+    def run_queued_csv_file(self, ticket, file, text_column, apply_preprocessing, compress_download=False, use_prefilter=False, group_duplicates=False, session_id=None, progress=gr.Progress()):
+        with self._batch_jobs_lock:
+            if self._batch_tickets.pop(ticket, None) is None:
+                return gr.update(), None, gr.update(), session_id
+            self._batch_running += 1
+        
+        try:
+            return self.process_csv_file(file, text_column, apply_preprocessing, compress_download, use_prefilter, group_duplicates, session_id, progress)
+        finally:
+            with self._batch_jobs_lock:
+                self._batch_running -= 1
     
     def _create_animated_summary(self, total_entries, sentiment_dist, confidence_stats):
         html = f"""
@@ -265,67 +404,165 @@ class SentimentAnalysisApp:
         
         return html
     
-    def _prepare_download_file(self, df, original_filename):
-        import tempfile
-        
-        base_name = os.path.splitext(os.path.basename(original_filename))[0]
+    def _prepare_download_path(self, original_filename, session_id, compress=False):
+        base_name = os.path.basename(original_filename)
+        base_name = base_name[:-len(file_extension(base_name))]
         output_filename = f"{base_name}_sentiment_analysis.csv"
+        if compress:
+            # The pipeline gzips rows as it writes them when the name ends in .gz
+            output_filename += ".gz"
         
-        # Create a temporary file in the system temp directory
+        # Create a temporary file in a per-session directory so concurrent users
+        # uploading files with the same name do not overwrite each other's results
         temp_dir = tempfile.gettempdir()
-        temp_path = os.path.join(temp_dir, output_filename)
+        temp_path = os.path.join(temp_dir, 'sentiment_analysis', session_id, output_filename)
         
         # Ensure the directory exists
         os.makedirs(os.path.dirname(temp_path), exist_ok=True)
         
-        # Save the file
-        df.to_csv(temp_path, index=False, encoding='utf-8')
-        
         return temp_path
     
-    def generate_visualizations(self):
-        if self.processed_data is None:
-            return None, None, None, None, None, "⚠️ No data to visualize. Please process a CSV file first."
+    def _get_chart(self, chart_name, df, summary, fingerprint):
+        return self.viz_cache.get(
+            fingerprint,
+            chart_name,
+            lambda: self._build_chart(chart_name, df, summary, fingerprint)
+        )
+    
+    def _text_column(self, df, raw=False):
+        text_columns = [col for col in df.columns if 'text' in col.lower() or 'comment' in col.lower() or 'review' in col.lower() or 'feedback' in col.lower() or 'cleaned' in col.lower()]
+        if raw:
+            text_columns = [col for col in text_columns if not col.endswith('_cleaned')]
+        return text_columns[0] if text_columns else None
+    
+    def _date_columns(self, columns):
+        return [col for col in columns if 'date' in str(col).lower() or 'time' in str(col).lower()]
+    
+    def _build_chart(self, chart_name, df, summary, fingerprint=None):
+        if chart_name == 'pie':
+            return self.viz_generator.create_sentiment_pie_chart(df, summary=summary)
+        if chart_name == 'bar':
+            return self.viz_generator.create_sentiment_bar_chart(df, summary=summary)
+        if chart_name == 'confidence':
+            return self.viz_generator.create_confidence_distribution(df, summary=summary)
+        
+        if chart_name == 'wordcloud':
+            text_column = self._text_column(df)
+            if text_column is None:
+                return None
+            return self.viz_generator.create_wordcloud_image(df, text_column)
+        
+        if chart_name == 'keyword_counts':
+            text_column = self._text_column(df)
+            if text_column is None:
+                return None
+            return KeywordExtractor().update_dataframe(df, text_column)
+        
+        if chart_name == 'aspects':
+            # Spans need the original punctuation, so the raw text column is used
+            text_column = self._text_column(df, raw=True)
+            if text_column is None:
+                return None
+            aspect_results = self.aspect_analyzer.analyze_dataframe(df, text_column)
+            return self.aspect_analyzer.summarize(aspect_results).reset_index().rename(columns={'aspect': 'Aspect'})
+        
+        if chart_name == 'duplicates':
+            text_column = self._text_column(df, raw=True)
+            if text_column is None or 'duplicate_cluster' not in df.columns:
+                return None
+            return self.duplicate_clusterer.cluster_table(df, df['duplicate_cluster'].to_numpy(), text_column)
+        
+        if chart_name.startswith('keywords'):
+            # Counting is done once per dataset; switching the ranking only rescores
+            _, method, group = chart_name.split(':')
+            extractor = self._get_chart('keyword_counts', df, summary, fingerprint)
+            if extractor is None:
+                return None
+            return extractor.top_keywords(
+                top_n=30,
+                sentiment=None if group == 'All' else group,
+                method=method
+            )
+        
+        if chart_name.startswith('timeline'):
+            date_columns = self._date_columns(df.columns)
+            if not date_columns:
+                return None
+            _, granularity, rolling_window = chart_name.split(':')
+            return self.viz_generator.create_sentiment_timeline(
+                df, date_columns[0],
+                granularity=granularity,
+                rolling_window=int(rolling_window) or None
+            )
+        
+        raise ValueError(f"Unknown chart: {chart_name}")
+    
+    def _render_charts(self, chart_names, session_id):
+        df, metadata = self.session_store.get(session_id)
+        summary, fingerprint = metadata.get('summary'), metadata.get('fingerprint')
+        if df is None:
+            return [None] * len(chart_names) + ["⚠️ No data to visualize. Please process a CSV file first."]
         
         try:
-            df = self.processed_data
-            
-            pie_chart = self.viz_generator.create_sentiment_pie_chart(df)
-            bar_chart = self.viz_generator.create_sentiment_bar_chart(df)
-            confidence_chart = self.viz_generator.create_confidence_distribution(df)
-            
-            wordcloud_img = None
-            text_columns = [col for col in df.columns if 'text' in col.lower() or 'comment' in col.lower() or 'review' in col.lower() or 'feedback' in col.lower() or 'cleaned' in col.lower()]
-            
-            if text_columns:
-                wordcloud_base64 = self.viz_generator.create_wordcloud(df, text_columns[0])
-                if wordcloud_base64:
-                    img_data = base64.b64decode(wordcloud_base64)
-                    wordcloud_img = Image.open(BytesIO(img_data))
-            
-            timeline_chart = None
-            date_columns = [col for col in df.columns if 'date' in col.lower() or 'time' in col.lower()]
-            if date_columns:
-                timeline_chart = self.viz_generator.create_sentiment_timeline(df, date_columns[0])
-            
-            return pie_chart, bar_chart, confidence_chart, wordcloud_img, timeline_chart, "✅ Visualizations generated successfully! 🎨"
-            
+            charts = [self._get_chart(name, df, summary, fingerprint) for name in chart_names]
+            return charts + ["✅ Visualizations generated successfully! 🎨"]
         except Exception as e:
-            return None, None, None, None, None, f"❌ Error generating visualizations: {str(e)}"
+            return [None] * len(chart_names) + [f"❌ Error generating visualizations: {str(e)}"]
+    
+    def _timeline_chart_name(self, granularity, rolling_window):
+        return f"timeline:{granularity or 'day'}:{int(rolling_window or 0)}"
+    
+    def generate_visualizations(self, granularity='day', rolling_window=0, session_id=None):
+        timeline = self._timeline_chart_name(granularity, rolling_window)
+        return tuple(self._render_charts(['pie', 'bar', 'confidence', 'wordcloud', timeline], session_id))
+    
+    def render_distribution_charts(self, session_id=None):
+        return tuple(self._render_charts(['pie', 'bar'], session_id))
+    
+    def render_confidence_chart(self, session_id=None):
+        return tuple(self._render_charts(['confidence'], session_id))
+    
+    def render_wordcloud(self, session_id=None):
+        return tuple(self._render_charts(['wordcloud'], session_id))
+    
+    def render_keywords(self, method='contrast', group='Any Negative', session_id=None):
+        # Contrastive scores need a subset to compare against the rest
+        if method == 'contrast' and group == 'All':
+            group = 'Any Negative'
+        return tuple(self._render_charts([f"keywords:{method or 'contrast'}:{group or 'Any Negative'}"], session_id))
+    
+    def render_aspects(self, session_id=None):
+        # Aspect spans need a model pass over the whole dataset, so the table is kept
+        # with the session and survives visualization cache eviction
+        _, metadata = self.session_store.get(session_id)
+        if metadata.get('aspects') is not None:
+            return metadata['aspects'], "✅ Visualizations generated successfully! 🎨"
+        
+        table, status = self._render_charts(['aspects'], session_id)
+        if table is not None:
+            self.session_store.update_metadata(session_id, aspects=table)
+        return table, status
+    
+    def render_duplicates(self, session_id=None):
+        return tuple(self._render_charts(['duplicates'], session_id))
+    
+    def render_timeline(self, granularity='day', rolling_window=0, session_id=None):
+        return tuple(self._render_charts([self._timeline_chart_name(granularity, rolling_window)], session_id))
     
     def _get_csv_columns(self, file):
         if file is None:
             return gr.update(choices=[], value=None)
         
         try:
-            df = pd.read_csv(file.name, nrows=5)
+            # XLSX files are read in openpyxl's read-only mode, row by row
+            df = read_sample(file.name, nrows=5)
             text_columns = [col for col in df.columns if df[col].dtype == 'object']
             if text_columns:
                 return gr.update(choices=text_columns, value=text_columns[0])
             else:
                 return gr.update(choices=[], value=None)
         except Exception as e:
-            print(f"Error reading CSV: {e}")
+            print(f"Error reading file: {e}")
             return gr.update(choices=[], value=None)
     
     def create_interface(self):
@@ -492,8 +729,8 @@ class SentimentAnalysisApp:
                     with gr.Row():
                         with gr.Column():
                             file_upload = gr.File(
-                                label="📂 Upload CSV File (Drag & Drop Supported)",
-                                file_types=[".csv"],
+                                label="📂 Upload CSV, Excel or JSON Lines File (Drag & Drop Supported)",
+                                file_types=SUPPORTED_EXTENSIONS,
                                 type="filepath",
                                 height=120
                             )
@@ -513,6 +750,24 @@ class SentimentAnalysisApp:
                                 info="Recommended for better analysis accuracy"
                             )
                             
+                            csv_compress = gr.Checkbox(
+                                label="🗜️ Compress download (gzip)",
+                                value=False,
+                                info="Smaller download for large files"
+                            )
+                            
+                            csv_prefilter = gr.Checkbox(
+                                label="⚡ Fast pre-filter for obvious rows",
+                                value=False,
+                                info="Short, clearly positive or negative rows skip the model; see the sentiment_tier column (their confidence is the lexicon polarity)"
+                            )
+                            
+                            csv_duplicates = gr.Checkbox(
+                                label="🔁 Group near-duplicate feedback",
+                                value=False,
+                                info="Clusters rows by model embeddings; see the Duplicates visualization. Clustered texts are remembered, so later runs without grouping skip the model for them"
+                            )
+                            
                             process_btn = gr.Button(
                                 "🚀 Process CSV File",
                                 variant="primary",
@@ -531,7 +786,7 @@ class SentimentAnalysisApp:
                             interactive=False
                         )
                 
-                with gr.Tab("📈 Interactive Visualizations", elem_id="viz-tab"):
+                with gr.Tab("📈 Interactive Visualizations", elem_id="viz-tab") as viz_tab:
                     gr.HTML("<h2 style='text-align: center; color: #495057; margin-bottom: 20px;'>🎨 Data Visualizations & Insights</h2>")
                     
                     viz_btn = gr.Button(
@@ -544,37 +799,110 @@ class SentimentAnalysisApp:
                         value="📊 Process a CSV file first, then click above to generate interactive visualizations!"
                     )
                     
-                    with gr.Row():
-                        with gr.Column():
-                            pie_chart = gr.Plot(
-                                label="🥧 Sentiment Distribution (Pie Chart)",
-                                show_label=True
-                            )
+                    # Each chart is rendered the first time its tab is opened and
+                    # served from the per-dataset cache afterwards
+                    with gr.Tabs():
+                        with gr.Tab("🎭 Sentiment Distribution") as distribution_tab:
+                            with gr.Row():
+                                with gr.Column():
+                                    pie_chart = gr.Plot(
+                                        label="🥧 Sentiment Distribution (Pie Chart)",
+                                        show_label=True
+                                    )
+                                
+                                with gr.Column():
+                                    bar_chart = gr.Plot(
+                                        label="📊 Sentiment Distribution (Bar Chart)",
+                                        show_label=True
+                                    )
+                        
+                        with gr.Tab("🎯 Confidence") as confidence_tab:
                             confidence_chart = gr.Plot(
                                 label="📊 Confidence Score Distribution",
                                 show_label=True
                             )
                         
-                        with gr.Column():
-                            bar_chart = gr.Plot(
-                                label="📊 Sentiment Distribution (Bar Chart)",
-                                show_label=True
-                            )
+                        with gr.Tab("☁️ Word Cloud") as wordcloud_tab:
                             wordcloud_display = gr.Image(
                                 label="☁️ Word Cloud",
+                                show_label=True,
+                                type="pil"
+                            )
+                        
+                        with gr.Tab("🔑 Keywords") as keywords_tab:
+                            with gr.Row():
+                                keyword_method = gr.Dropdown(
+                                    label="📐 Ranking",
+                                    choices=[("Over-represented vs other sentiments", "contrast"), ("TF-IDF", "tfidf"), ("Most frequent", "count")],
+                                    value="contrast",
+                                    interactive=True
+                                )
+                                keyword_group = gr.Dropdown(
+                                    label="🎭 Sentiment",
+                                    choices=["Any Negative", "Any Positive", "Very Negative", "Negative", "Neutral", "Positive", "Very Positive", "All"],
+                                    value="Any Negative",
+                                    interactive=True
+                                )
+                            keywords_table = gr.Dataframe(
+                                label="🔑 Top Keywords",
+                                interactive=False
+                            )
+                        
+                        with gr.Tab("🧩 Aspects") as aspects_tab:
+                            gr.Markdown("Sentiment of the sentences mentioning delivery, price, support, quality and usability.")
+                            aspects_table = gr.Dataframe(
+                                label="🧩 Sentiment by Aspect",
+                                interactive=False
+                            )
+                        
+                        with gr.Tab("🔁 Duplicates") as duplicates_tab:
+                            gr.Markdown("Groups of near-identical feedback, largest first. Enable grouping before processing the file.")
+                            duplicates_table = gr.Dataframe(
+                                label="🔁 Near-Duplicate Clusters",
+                                interactive=False
+                            )
+                        
+                        with gr.Tab("📈 Timeline") as timeline_tab:
+                            with gr.Row():
+                                timeline_granularity = gr.Dropdown(
+                                    label="🕒 Granularity",
+                                    choices=["hour", "day", "week", "month"],
+                                    value="day",
+                                    interactive=True
+                                )
+                                timeline_rolling = gr.Slider(
+                                    label="📉 Rolling average of star rating (buckets, 0 = off)",
+                                    minimum=0,
+                                    maximum=30,
+                                    step=1,
+                                    value=0
+                                )
+                            timeline_chart = gr.Plot(
+                                label="📈 Sentiment Timeline (if date data available)",
                                 show_label=True
                             )
-                    
-                    with gr.Row():
-                        timeline_chart = gr.Plot(
-                            label="📈 Sentiment Timeline (if date data available)",
-                            show_label=True
-                        )
+                
+                with gr.Tab("📡 Monitoring", elem_id="monitoring-tab"):
+                    gr.HTML("<h2 style='text-align: center; color: #495057; margin-bottom: 20px;'>📡 Live Model Metrics</h2>")
+                    gr.Markdown("Rolling window over recent model calls: sentiment mix, confidence, throughput and latency. Refreshes every 5 seconds.")
+                    # Snapshots sum a fixed ring of time buckets, so polling stays cheap
+                    gr.JSON(
+                        value=self.sentiment_analyzer.monitor.snapshot,
+                        every=5,
+                        label="📊 Metrics (last 5 minutes)"
+                    )
+            
+            # Per-browser-session key into the result store
+            session_state = gr.State(value=None)
+            
+            batch_ticket = gr.State(value=None)
             
             analyze_btn.click(
                 fn=self.analyze_single_text,
                 inputs=[text_input, single_preprocessing],
-                outputs=[sentiment_result, cleaned_text_display, confidence_display]
+                outputs=[sentiment_result, cleaned_text_display, confidence_display],
+                concurrency_limit=self.interactive_concurrency,
+                concurrency_id="interactive"
             )
             
             file_upload.change(
@@ -583,16 +911,80 @@ class SentimentAnalysisApp:
                 outputs=[column_dropdown]
             )
             
+            # Admission is instant and bounded; the job itself waits on the batch lane,
+            # where Gradio reports its queue position
             process_btn.click(
-                fn=self.process_csv_file,
-                inputs=[file_upload, column_dropdown, csv_preprocessing],
-                outputs=[analysis_summary, download_file, column_dropdown]
+                fn=self.queue_csv_file,
+                inputs=[file_upload],
+                outputs=[analysis_summary, batch_ticket],
+                queue=False
+            ).then(
+                fn=self.run_queued_csv_file,
+                inputs=[batch_ticket, file_upload, column_dropdown, csv_preprocessing, csv_compress, csv_prefilter, csv_duplicates, session_state],
+                outputs=[analysis_summary, download_file, column_dropdown, session_state],
+                concurrency_limit=self.batch_concurrency,
+                concurrency_id="batch",
+                show_progress="full"
             )
             
             viz_btn.click(
                 fn=self.generate_visualizations,
+                inputs=[timeline_granularity, timeline_rolling, session_state],
                 outputs=[pie_chart, bar_chart, confidence_chart, wordcloud_display, timeline_chart, viz_status]
             )
+            
+            viz_tab.select(
+                fn=self.render_distribution_charts,
+                inputs=[session_state],
+                outputs=[pie_chart, bar_chart, viz_status]
+            )
+            
+            distribution_tab.select(
+                fn=self.render_distribution_charts,
+                inputs=[session_state],
+                outputs=[pie_chart, bar_chart, viz_status]
+            )
+            
+            confidence_tab.select(
+                fn=self.render_confidence_chart,
+                inputs=[session_state],
+                outputs=[confidence_chart, viz_status]
+            )
+            
+            wordcloud_tab.select(
+                fn=self.render_wordcloud,
+                inputs=[session_state],
+                outputs=[wordcloud_display, viz_status]
+            )
+            
+            # Aspect extraction runs the model over the dataset, so it shares the batch lane
+            aspects_tab.select(
+                fn=self.render_aspects,
+                inputs=[session_state],
+                outputs=[aspects_table, viz_status],
+                concurrency_limit=self.batch_concurrency,
+                concurrency_id="batch"
+            )
+            
+            duplicates_tab.select(
+                fn=self.render_duplicates,
+                inputs=[session_state],
+                outputs=[duplicates_table, viz_status]
+            )
+            
+            for keywords_event in (keywords_tab.select, keyword_method.change, keyword_group.change):
+                keywords_event(
+                    fn=self.render_keywords,
+                    inputs=[keyword_method, keyword_group, session_state],
+                    outputs=[keywords_table, viz_status]
+                )
+            
+            for timeline_event in (timeline_tab.select, timeline_granularity.change, timeline_rolling.release):
+                timeline_event(
+                    fn=self.render_timeline,
+                    inputs=[timeline_granularity, timeline_rolling, session_state],
+                    outputs=[timeline_chart, viz_status]
+                )
         
         return interface
 
@@ -607,6 +999,7 @@ def main():
     print("🌐 Opening in your default web browser...")
     print("📱 Access at: http://localhost:7860")
     
+    interface.queue(default_concurrency_limit=2, max_size=64)
     interface.launch(
         server_name="0.0.0.0",
         server_port=7860,
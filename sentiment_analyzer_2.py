@@ -3,19 +3,131 @@ import torch
 import pandas as pd
 from tqdm import tqdm
 import numpy as np
+import time
+import logging
+import threading
+from utils.runtime_profile import load_runtime_profile, apply_runtime_profile, synthetic_texts
+from utils.pretokenizer import BatchPreTokenizer
+from utils.priority_gate import InferencePriorityGate
+from utils.monitoring import RollingMonitor
+from utils.sentiment_labels import SENTIMENT_LABELS, SentimentLabel, to_sentiment_categorical
+
+logger = logging.getLogger(__name__)
 
 class SentimentAnalyzer:
-    def __init__(self):
-        """Initialize the sentiment analyzer with BERT model."""
-        self.tokenizer = AutoTokenizer.from_pretrained("nlptown/bert-base-multilingual-uncased-sentiment")
-        self.model = AutoModelForSequenceClassification.from_pretrained("nlptown/bert-base-multilingual-uncased-sentiment")
-        self.sentiment_labels = {
-            1: "Very Negative",
-            2: "Negative", 
-            3: "Neutral",
-            4: "Positive",
-            5: "Very Positive"
-        }
+    def __init__(self, runtime_profile=None, warmup=True, require_fast_tokenizer=False):
+        """
+        Initialize the sentiment analyzer with BERT model.
+        
+        Args:
+            runtime_profile (dict|str|bool): Runtime profile to apply. None loads the
+                host profile saved by ``python -m utils.runtime_profile`` if present,
+                a string loads that file, False keeps torch defaults.
+            warmup (bool): Run synthetic batches before returning so the first real
+                request does not pay for allocator, kernel and tokenizer setup
+            require_fast_tokenizer (bool): Raise instead of warning when only the slow
+                Python tokenizer is available
+        """
+        if runtime_profile is None or isinstance(runtime_profile, str):
+            runtime_profile = load_runtime_profile(runtime_profile)
+        runtime_profile = runtime_profile or {}
+        apply_runtime_profile(runtime_profile)
+        
+        tokenizer = AutoTokenizer.from_pretrained("nlptown/bert-base-multilingual-uncased-sentiment", use_fast=True)
+        if not tokenizer.is_fast:
+            message = ("Fast (Rust) tokenizer is not available, falling back to the slow Python "
+                       "tokenizer; install the 'tokenizers' package for much faster encoding.")
+            if require_fast_tokenizer:
+                raise RuntimeError(message)
+            logger.warning(message)
+        
+        model = AutoModelForSequenceClassification.from_pretrained("nlptown/bert-base-multilingual-uncased-sentiment")
+        # The pooled [CLS] representation feeding the classifier doubles as a sentence embedding
+        self._setup(
+            model,
+            tokenizer,
+            batch_size=runtime_profile.get('batch_size', 32),
+            runtime_profile=runtime_profile,
+            embedding_module=model.base_model.pooler,
+            embedding_dim=model.config.hidden_size,
+            warmup=warmup
+        )
+    
+    def _setup(self, model, tokenizer, batch_size, runtime_profile, embedding_module, embedding_dim, warmup):
+        """
+        State shared by every analyzer backend, set up around a loaded model and tokenizer.
+        
+        Args:
+            model (torch.nn.Module): Classifier returning logits over the 5 labels
+            tokenizer (callable): Tokenizer producing the model's inputs
+            batch_size (int): Number of texts per batch
+            runtime_profile (dict): Applied runtime profile
+            embedding_module (torch.nn.Module): Layer whose output is the sentence embedding
+            embedding_dim (int): Size of that output
+            warmup (bool): Run synthetic batches before returning
+        """
+        self.ready = False
+        self.runtime_profile = runtime_profile
+        self.batch_size = batch_size
+        self.tokenizer = tokenizer
+        # Fast tokenizers must not be called from several threads at once
+        self.tokenizer_lock = threading.Lock()
+        # The model itself is shared by interactive and batch callers
+        self.priority_gate = InferencePriorityGate()
+        # Rolling sentiment, confidence and latency metrics of every model call
+        self.monitor = RollingMonitor()
+        
+        self.model = model
+        self.model.eval()
+        self.model.requires_grad_(False)
+        self.sentiment_labels = {stars: label for stars, label in enumerate(SENTIMENT_LABELS, start=1)}
+        self._register_embedding_hook(embedding_module, embedding_dim)
+        
+        if warmup:
+            self.warmup()
+        else:
+            self.ready = True
+    
+    def _register_embedding_hook(self, module, embedding_dim):
+        """
+        Capture the output of ``module`` as the sentence embedding of each forward pass.
+        
+        The hook only keeps the output when the calling thread asked for embeddings,
+        so plain classification is unaffected and concurrent callers sharing the
+        model each see their own batch.
+        
+        Args:
+            module (torch.nn.Module): Layer whose output is the sentence embedding
+            embedding_dim (int): Size of that output
+        """
+        self.embedding_dim = embedding_dim
+        self._embedding_capture = threading.local()
+        
+        def capture(module, inputs, output):
+            if getattr(self._embedding_capture, 'enabled', False):
+                self._embedding_capture.output = output
+        
+        module.register_forward_hook(capture)
+    
+    def warmup(self):
+        """
+        Run synthetic inputs at representative shapes and mark the analyzer ready.
+        
+        Returns:
+            float: Seconds spent warming up
+        """
+        start = time.perf_counter()
+        
+        # Single-text path used by interactive requests
+        self.analyze_sentiment_with_confidence(synthetic_texts(1)[0])
+        
+        # Full batches with short, medium and long texts
+        self.analyze_batch(synthetic_texts(self.batch_size * 2), show_progress=False)
+        
+        # Synthetic traffic should not show up in service metrics
+        self.monitor.reset()
+        self.ready = True
+        return time.perf_counter() - start
     
     def analyze_sentiment(self, text):
         """
@@ -30,19 +142,23 @@ class SentimentAnalyzer:
         if pd.isna(text) or not isinstance(text, str) or not text.strip():
             return "Neutral"
         
-        inputs = self.tokenizer(
-            text, 
-            return_tensors="pt", 
-            truncation=True, 
-            padding=True, 
-            max_length=512
-        )
+        with self.tokenizer_lock:
+            inputs = self.tokenizer(
+                text, 
+                return_tensors="pt", 
+                truncation=True, 
+                padding=True, 
+                max_length=512
+            )
         
-        with torch.no_grad():
+        with self.priority_gate.interactive(), torch.inference_mode():
+            start = time.perf_counter()
             outputs = self.model(**inputs)
+            elapsed = time.perf_counter() - start
         
         probabilities = torch.softmax(outputs.logits, dim=1)
         sentiment_score = torch.argmax(probabilities).item() + 1
+        self.monitor.record(sentiment_score, torch.max(probabilities).item(), elapsed, source='interactive')
         
         return self.sentiment_labels[sentiment_score]
     
@@ -59,56 +175,256 @@ class SentimentAnalyzer:
         if pd.isna(text) or not isinstance(text, str) or not text.strip():
             return "Neutral", 0.0
         
-        inputs = self.tokenizer(
-            text, 
-            return_tensors="pt", 
-            truncation=True, 
-            padding=True, 
-            max_length=512
-        )
+        with self.tokenizer_lock:
+            inputs = self.tokenizer(
+                text, 
+                return_tensors="pt", 
+                truncation=True, 
+                padding=True, 
+                max_length=512
+            )
         
-        with torch.no_grad():
+        with self.priority_gate.interactive(), torch.inference_mode():
+            start = time.perf_counter()
             outputs = self.model(**inputs)
+            elapsed = time.perf_counter() - start
         
         probabilities = torch.softmax(outputs.logits, dim=1)
         confidence_score = torch.max(probabilities).item()
         sentiment_score = torch.argmax(probabilities).item() + 1
+        self.monitor.record(sentiment_score, confidence_score, elapsed, source='interactive')
         
         return self.sentiment_labels[sentiment_score], round(confidence_score, 3)
     
-    def analyze_batch(self, texts, batch_size=32, show_progress=True):
+    def _original_lengths(self, texts, lengths, max_length):
+        """Token counts before truncation; only texts at the limit are encoded again."""
+        lengths = list(lengths)
+        at_limit = [i for i, length in enumerate(lengths) if length >= max_length]
+        if at_limit:
+            with self.tokenizer_lock:
+                encoded = self.tokenizer(
+                    [texts[i] for i in at_limit],
+                    truncation=False,
+                    return_attention_mask=False,
+                    return_token_type_ids=False
+                )['input_ids']
+            for i, ids in zip(at_limit, encoded):
+                lengths[i] = len(ids)
+        return lengths
+    
+    def analyze_batch(self, texts, batch_size=None, show_progress=True, profiler=None,
+                      sort_by_length=False, background_tokenization=True, result_store=None, row_offset=0,
+                      return_embeddings=False):
         """
         Analyze sentiment for a batch of texts.
         
+        Texts are pre-tokenized chunk-wise and each batch runs through the model as
+        one padded tensor. With a result store, results are written into its
+        memory-mapped file as batches complete instead of being collected in a list.
+        
         Args:
             texts (list): List of texts to analyze
-            batch_size (int): Number of texts to process at once
+            batch_size (int): Number of texts to process at once (defaults to the runtime profile's)
             show_progress (bool): Whether to show progress bar
+            profiler (PaddingProfiler): Optional profiler recording token and padding statistics
+            sort_by_length (bool): Group texts of similar token length to reduce padding
+            background_tokenization (bool): Tokenize the next chunk while the model runs
+            result_store (MemmapResultStore): Store receiving the results (optional)
+            row_offset (int): Row id of ``texts[0]`` in the store, for filling one store
+                over several calls
+            return_embeddings (bool): Also return sentence embeddings from the same forward pass
             
         Returns:
-            list: List of tuples (sentiment, confidence)
+            list: List of tuples (sentiment, confidence), or the result store if one was given.
+                With ``return_embeddings``, a tuple of that and a float16 array of shape
+                (len(texts), embedding_dim) with zero rows for empty texts.
         """
-        results = []
+        batch_size = batch_size or self.batch_size
         
-        # Process in batches
-        if show_progress:
-            iterator = tqdm(range(0, len(texts), batch_size), desc="Analyzing sentiment")
+        # Empty or missing texts never reach the model
+        valid_indices = [i for i, text in enumerate(texts) if self.is_valid_text(text)]
+        if result_store is None:
+            results = [("Neutral", 0.0)] * len(texts)
         else:
-            iterator = range(0, len(texts), batch_size)
+            results = result_store
+            store_rows = np.arange(len(texts), dtype=np.int64) + row_offset
+            result_store.write(store_rows, SentimentLabel.NEUTRAL, 0.0)
+            store_rows = store_rows[valid_indices]
+        embeddings = np.zeros((len(texts), self.embedding_dim), dtype=np.float16) if return_embeddings else None
+        
+        pretokenizer = BatchPreTokenizer(
+            self.tokenizer,
+            batch_size=batch_size,
+            max_length=512,
+            sort_by_length=sort_by_length,
+            background=background_tokenization,
+            lock=self.tokenizer_lock
+        )
+        
+        progress_bar = tqdm(total=len(valid_indices), desc="Analyzing sentiment") if show_progress else None
         
-        for i in iterator:
-            batch_texts = texts[i:i+batch_size]
-            batch_results = []
+        for positions, encoding in pretokenizer.iter_batches([texts[i] for i in valid_indices]):
+            start = time.perf_counter()
+            if result_store is None and not return_embeddings:
+                batch_results = self.predict_encoded(encoding)
+                for position, result in zip(positions, batch_results):
+                    results[valid_indices[position]] = result
+            else:
+                stars, confidences, probabilities, *batch_embeddings = self.predict_encoded_stars(
+                    encoding, return_probabilities=True, return_embeddings=return_embeddings
+                )
+                if return_embeddings:
+                    embeddings[[valid_indices[p] for p in positions]] = batch_embeddings[0]
+                if result_store is None:
+                    for position, star, confidence in zip(positions, stars.tolist(), confidences.tolist()):
+                        results[valid_indices[position]] = (self.sentiment_labels[star], confidence)
+                else:
+                    result_store.write(store_rows[positions], stars, confidences, probabilities)
+            elapsed = time.perf_counter() - start
             
-            for text in batch_texts:
-                sentiment, confidence = self.analyze_sentiment_with_confidence(text)
-                batch_results.append((sentiment, confidence))
+            if profiler is not None:
+                lengths = encoding['attention_mask'].sum(dim=1).tolist()
+                profiler.record_batch(lengths, encoding['input_ids'].shape[1], elapsed,
+                                      original_lengths=self._original_lengths(
+                                          [texts[valid_indices[p]] for p in positions], lengths, pretokenizer.max_length))
             
-            results.extend(batch_results)
+            if progress_bar is not None:
+                progress_bar.update(len(positions))
+        
+        if progress_bar is not None:
+            progress_bar.close()
+        if result_store is not None:
+            result_store.flush()
         
+        if return_embeddings:
+            return results, embeddings
         return results
     
-    def analyze_dataframe(self, df, text_column, show_progress=True):
+    def predict_probabilities(self, texts, batch_size=None, show_progress=True):
+        """
+        Get the full 5-class probability distribution for a batch of texts.
+        
+        Args:
+            texts (list): List of texts to analyze
+            batch_size (int): Number of texts to process at once (defaults to the runtime profile's)
+            show_progress (bool): Whether to show progress bar
+            
+        Returns:
+            np.ndarray: Probabilities of shape (len(texts), 5); empty texts get a uniform distribution
+        """
+        probabilities = np.full((len(texts), len(self.sentiment_labels)), 1 / len(self.sentiment_labels), dtype=np.float32)
+        valid_indices = [i for i, text in enumerate(texts) if self.is_valid_text(text)]
+        
+        pretokenizer = BatchPreTokenizer(
+            self.tokenizer,
+            batch_size=batch_size or self.batch_size,
+            max_length=512,
+            sort_by_length=True,
+            lock=self.tokenizer_lock
+        )
+        
+        progress_bar = tqdm(total=len(valid_indices), desc="Scoring probabilities") if show_progress else None
+        
+        for positions, encoding in pretokenizer.iter_batches([texts[i] for i in valid_indices]):
+            self.priority_gate.yield_to_interactive()
+            batch_probabilities = self._predict_probabilities(encoding).numpy()
+            probabilities[[valid_indices[p] for p in positions]] = batch_probabilities
+            
+            if progress_bar is not None:
+                progress_bar.update(len(positions))
+        
+        if progress_bar is not None:
+            progress_bar.close()
+        
+        return probabilities
+    
+    def is_valid_text(self, text):
+        """Whether a text should be sent to the model."""
+        return not pd.isna(text) and isinstance(text, str) and bool(text.strip())
+    
+    def _predict_probabilities(self, encoding, return_embeddings=False):
+        """
+        Run the model on an encoded batch.
+        
+        Args:
+            encoding (dict): Tokenizer output tensors
+            return_embeddings (bool): Also return the sentence embeddings captured
+                during the forward pass
+            
+        Returns:
+            torch.Tensor: Class probabilities of shape (batch, 5), plus a float16 array
+                of shape (batch, embedding_dim) if embeddings were requested
+        """
+        self._embedding_capture.enabled = return_embeddings
+        try:
+            with torch.inference_mode():
+                outputs = self.model(**encoding)
+        finally:
+            self._embedding_capture.enabled = False
+        
+        probabilities = torch.softmax(outputs.logits, dim=1)
+        if return_embeddings:
+            embeddings = self._embedding_capture.output.to(torch.float16).numpy()
+            self._embedding_capture.output = None
+            return probabilities, embeddings
+        return probabilities
+    
+    def predict_encoded_stars(self, encoding, return_probabilities=False, return_embeddings=False,
+                              source='batch'):
+        """
+        Classify an already tokenized and padded batch without creating label strings.
+        
+        Args:
+            encoding (dict): Tokenizer output tensors, e.g. from BatchPreTokenizer
+            return_probabilities (bool): Also return the 5-class probabilities
+            return_embeddings (bool): Also return float16 sentence embeddings from the
+                same forward pass
+            source (str): 'batch' waits for running interactive requests; 'interactive'
+                is for callers already inside ``priority_gate.interactive()``
+            
+        Returns:
+            tuple: (int8 array of star ratings 1-5, float array of confidences) in batch
+                order, plus the probability and embedding arrays if requested
+        """
+        # Batch work steps aside while single-text requests share the model
+        if source == 'batch':
+            self.priority_gate.yield_to_interactive()
+        start = time.perf_counter()
+        if return_embeddings:
+            probabilities, embeddings = self._predict_probabilities(encoding, return_embeddings=True)
+        else:
+            probabilities = self._predict_probabilities(encoding)
+        elapsed = time.perf_counter() - start
+        confidences, predictions = torch.max(probabilities, dim=1)
+        
+        stars = predictions.numpy().astype(np.int8) + 1
+        confidences = np.round(confidences.numpy().astype(np.float64), 3)
+        self.monitor.record(stars, confidences, elapsed, source=source)
+        outputs = (stars, confidences)
+        if return_probabilities:
+            outputs += (probabilities.numpy(),)
+        if return_embeddings:
+            outputs += (embeddings,)
+        return outputs
+    
+    def predict_encoded(self, encoding):
+        """
+        Classify an already tokenized and padded batch.
+        
+        Args:
+            encoding (dict): Tokenizer output tensors, e.g. from BatchPreTokenizer
+            
+        Returns:
+            list: List of tuples (sentiment, confidence) in batch order
+        """
+        stars, confidences = self.predict_encoded_stars(encoding)
+        
+        return [
+            (self.sentiment_labels[star], confidence)
+            for star, confidence in zip(stars.tolist(), confidences.tolist())
+        ]
+    
+    def analyze_dataframe(self, df, text_column, show_progress=True, profiler=None):
         """
         Analyze sentiment for texts in a DataFrame.
         
@@ -116,6 +432,7 @@ class SentimentAnalyzer:
             df (pd.DataFrame): Input DataFrame
             text_column (str): Name of the column containing text
             show_progress (bool): Whether to show progress bar
+            profiler (PaddingProfiler): Optional profiler recording token and padding statistics
             
         Returns:
             pd.DataFrame: DataFrame with sentiment and confidence columns added
@@ -126,30 +443,36 @@ class SentimentAnalyzer:
         texts = df_copy[text_column].astype(str).tolist()
         
         # Analyze sentiment
-        results = self.analyze_batch(texts, show_progress=show_progress)
+        results = self.analyze_batch(texts, show_progress=show_progress, profiler=profiler)
         
-        # Add results to DataFrame
-        sentiments, confidences = zip(*results)
-        df_copy['sentiment'] = sentiments
+        # Add results to DataFrame; labels are stored as a fixed-order categorical
+        sentiments, confidences = zip(*results) if results else ((), ())
+        df_copy['sentiment'] = to_sentiment_categorical(list(sentiments))
         df_copy['confidence'] = confidences
         
         return df_copy
     
-    def get_sentiment_distribution(self, df, sentiment_column='sentiment'):
+    def get_sentiment_distribution(self, df=None, sentiment_column='sentiment', summary=None):
         """
         Get sentiment distribution statistics.
         
         Args:
             df (pd.DataFrame): DataFrame with sentiment data
             sentiment_column (str): Name of the sentiment column
+            summary (SentimentSummary): Precomputed summary; the DataFrame is not scanned if given
             
         Returns:
             dict: Sentiment distribution statistics
         """
+        if summary is not None:
+            return summary.to_distribution()
+        
         if sentiment_column not in df.columns:
             return {}
         
-        distribution = df[sentiment_column].value_counts().to_dict()
+        # Categorical columns also count labels that never occur
+        counts = df[sentiment_column].value_counts()
+        distribution = counts[counts > 0].to_dict()
         total_count = len(df)
         
         # Calculate percentages
@@ -160,17 +483,21 @@ class SentimentAnalyzer:
         
         return distribution_pct
     
-    def get_confidence_stats(self, df, confidence_column='confidence'):
+    def get_confidence_stats(self, df=None, confidence_column='confidence', summary=None):
         """
         Get confidence score statistics.
         
         Args:
             df (pd.DataFrame): DataFrame with confidence data
             confidence_column (str): Name of the confidence column
+            summary (SentimentSummary): Precomputed summary; the DataFrame is not scanned if given
             
         Returns:
             dict: Confidence statistics
         """
+        if summary is not None:
+            return summary.to_confidence_stats()
+        
         if confidence_column not in df.columns:
             return {}
         
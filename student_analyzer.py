@@ -0,0 +1,337 @@
+import argparse
+import os
+import re
+import time
+import zlib
+import numpy as np
+import pandas as pd
+import torch
+from transformers.modeling_outputs import SequenceClassifierOutput
+from sentiment_analyzer_2 import SentimentAnalyzer
+
+DEFAULT_STUDENT_PATH = os.environ.get(
+    'SENTIMENT_STUDENT_MODEL',
+    os.path.join(os.path.expanduser('~'), '.cache', 'sentiment_analysis', 'student.pt')
+)
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# 2**18 buckets x 64 dimensions is about 17M parameters, 33 MB as a float16 checkpoint
+DEFAULT_NUM_BUCKETS = 2**18
+
+
+class HashingNgramTokenizer:
+    def __init__(self, num_buckets=DEFAULT_NUM_BUCKETS, ngram_range=(1, 2)):
+        """
+        fastText-style tokenizer mapping word n-grams to hashed bucket ids.
+
+        Called like a Hugging Face tokenizer, so it works with BatchPreTokenizer and
+        the SentimentAnalyzer batch code. Id 0 is reserved for padding.
+
+        Args:
+            num_buckets (int): Number of hash buckets
+            ngram_range (tuple): Smallest and largest word n-gram
+        """
+        self.num_buckets = num_buckets
+        self.ngram_range = tuple(ngram_range)
+        self.pad_token_id = 0
+        self.is_fast = True
+
+    def encode(self, text, max_length=None):
+        """
+        Map a text to bucket ids.
+
+        Args:
+            text (str): Input text
+            max_length (int): Maximum number of ids (optional)
+
+        Returns:
+            list: Bucket ids, [0] for texts without tokens
+        """
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        ids = []
+        for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+            for i in range(len(tokens) - n + 1):
+                # crc32 is stable across processes, unlike hash()
+                gram = ' '.join(tokens[i:i+n])
+                ids.append(zlib.crc32(gram.encode('utf-8')) % self.num_buckets + 1)
+        if max_length:
+            ids = ids[:max_length]
+        return ids or [self.pad_token_id]
+
+    def __call__(self, texts, return_tensors=None, truncation=True, padding=False, max_length=None, **kwargs):
+        single = isinstance(texts, str)
+        encoded = [self.encode(text, max_length if truncation else None) for text in ([texts] if single else texts)]
+        if return_tensors != 'pt':
+            return {'input_ids': encoded[0] if single else encoded}
+
+        padded_length = max(len(ids) for ids in encoded)
+        input_ids = torch.full((len(encoded), padded_length), self.pad_token_id, dtype=torch.long)
+        for row, ids in enumerate(encoded):
+            input_ids[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+        return {
+            'input_ids': input_ids,
+            'attention_mask': (input_ids != self.pad_token_id).long(),
+            'token_type_ids': torch.zeros_like(input_ids)
+        }
+
+
+class FastTextClassifier(torch.nn.Module):
+    def __init__(self, num_buckets=DEFAULT_NUM_BUCKETS, embedding_dim=64, num_labels=5):
+        """
+        Mean of hashed n-gram embeddings followed by a linear layer.
+
+        Args:
+            num_buckets (int): Number of hash buckets (excluding the padding id)
+            embedding_dim (int): Embedding size
+            num_labels (int): Number of output classes
+        """
+        super().__init__()
+        self.embedding = torch.nn.EmbeddingBag(num_buckets + 1, embedding_dim, mode='mean',
+                                               padding_idx=0, sparse=True)
+        self.classifier = torch.nn.Linear(embedding_dim, num_labels)
+
+    def forward(self, input_ids, attention_mask=None, token_type_ids=None, offsets=None):
+        # 2-D padded input for inference, flat ids with offsets for training
+        logits = self.classifier(self.embedding(input_ids, offsets))
+        return SequenceClassifierOutput(logits=logits)
+
+
+class StudentSentimentAnalyzer(SentimentAnalyzer):
+    def __init__(self, model, tokenizer, batch_size=256, warmup=False):
+        """
+        Sentiment analyzer backed by a small distilled student model.
+
+        Provides the same interface as SentimentAnalyzer, including the
+        ``(label, confidence)`` results and the batch methods used by
+        SentimentPipeline, at a fraction of BERT's cost.
+
+        Args:
+            model (FastTextClassifier): Trained student model
+            tokenizer (HashingNgramTokenizer): Tokenizer the model was trained with
+            batch_size (int): Number of texts per batch
+            warmup (bool): Run synthetic batches before returning
+        """
+        # The mean n-gram embedding is the student's sentence representation
+        self._setup(
+            model,
+            tokenizer,
+            batch_size=batch_size,
+            runtime_profile={},
+            embedding_module=model.embedding,
+            embedding_dim=model.embedding.embedding_dim,
+            warmup=warmup
+        )
+
+    def save(self, path=None):
+        """
+        Save the student model and its tokenizer settings.
+
+        Args:
+            path (str): Output file (defaults to DEFAULT_STUDENT_PATH)
+
+        Returns:
+            str: Path written
+        """
+        path = path or DEFAULT_STUDENT_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        torch.save({
+            'num_buckets': self.tokenizer.num_buckets,
+            'ngram_range': list(self.tokenizer.ngram_range),
+            'embedding_dim': self.model.embedding.embedding_dim,
+            # Stored as float16 to halve the file; loading casts back to float32
+            'state_dict': {name: tensor.half() for name, tensor in self.model.state_dict().items()}
+        }, path)
+        return path
+
+    @classmethod
+    def load(cls, path=None, **kwargs):
+        """
+        Load a student saved with ``save``.
+
+        Args:
+            path (str): Model file (defaults to DEFAULT_STUDENT_PATH)
+            **kwargs: Passed to the constructor
+
+        Returns:
+            StudentSentimentAnalyzer: Loaded analyzer
+        """
+        checkpoint = torch.load(path or DEFAULT_STUDENT_PATH, map_location='cpu', weights_only=True)
+        model = FastTextClassifier(checkpoint['num_buckets'], checkpoint['embedding_dim'])
+        model.load_state_dict(checkpoint['state_dict'])
+        tokenizer = HashingNgramTokenizer(checkpoint['num_buckets'], checkpoint['ngram_range'])
+        return cls(model, tokenizer, **kwargs)
+
+
+def create_sentiment_analyzer(backend=None, student_path=None, **kwargs):
+    """
+    Create the analyzer for a backend name.
+
+    Args:
+        backend (str): 'bert' or 'student' (defaults to the SENTIMENT_BACKEND
+            environment variable, then 'bert')
+        student_path (str): Student model file for the 'student' backend
+        **kwargs: Passed to the BERT analyzer's constructor
+
+    Returns:
+        SentimentAnalyzer: Analyzer instance
+    """
+    backend = backend or os.environ.get('SENTIMENT_BACKEND', 'bert')
+    if backend == 'student':
+        return StudentSentimentAnalyzer.load(student_path, warmup=kwargs.get('warmup', False))
+    if backend == 'bert':
+        return SentimentAnalyzer(**kwargs)
+    raise ValueError(f"Unknown sentiment backend: {backend}")
+
+
+def _soft_cross_entropy(logits, targets):
+    return -(targets * torch.log_softmax(logits, dim=1)).sum(dim=1).mean()
+
+
+def evaluate_student(student, texts, teacher_probabilities):
+    """
+    Compare a student with its teacher on held-out texts.
+
+    Args:
+        student (StudentSentimentAnalyzer): Student to evaluate
+        texts (list): Held-out texts
+        teacher_probabilities (np.ndarray): Teacher probabilities for ``texts``
+
+    Returns:
+        dict: Agreement with the teacher and student throughput
+    """
+    start = time.perf_counter()
+    student_probabilities = student.predict_probabilities(texts, show_progress=False)
+    elapsed = time.perf_counter() - start
+
+    teacher_labels = teacher_probabilities.argmax(axis=1)
+    student_labels = student_probabilities.argmax(axis=1)
+    eps = 1e-8
+    kl = (teacher_probabilities * (np.log(teacher_probabilities + eps) - np.log(student_probabilities + eps))).sum(axis=1)
+
+    return {
+        'rows': len(texts),
+        'top1_agreement': round(float((teacher_labels == student_labels).mean()), 4),
+        'within_one_star': round(float((np.abs(teacher_labels - student_labels) <= 1).mean()), 4),
+        'same_polarity': round(float((np.sign(teacher_labels - 2) == np.sign(student_labels - 2)).mean()), 4),
+        'mean_kl_divergence': round(float(kl.mean()), 4),
+        'student_rows_per_second': round(len(texts) / elapsed, 1) if elapsed > 0 else None
+    }
+
+
+def distill_student(teacher, texts, teacher_probabilities=None, num_buckets=DEFAULT_NUM_BUCKETS, embedding_dim=64,
+                    ngram_range=(1, 2), epochs=5, batch_size=256, learning_rate=0.01, temperature=1.0,
+                    validation_split=0.1, seed=0, show_progress=True):
+    """
+    Train a student on the teacher's soft probabilities over unlabeled texts.
+
+    Args:
+        teacher (SentimentAnalyzer): Teacher model
+        texts (list): Unlabeled training texts
+        teacher_probabilities (np.ndarray): Precomputed teacher probabilities aligned with
+            ``texts`` (optional; empty texts are dropped only when these are computed here)
+        num_buckets (int): Hash buckets for n-grams
+        embedding_dim (int): Student embedding size
+        ngram_range (tuple): Smallest and largest word n-gram
+        epochs (int): Passes over the training texts
+        batch_size (int): Texts per optimization step
+        learning_rate (float): Adam learning rate
+        temperature (float): Softening applied to teacher probabilities (1.0 keeps them)
+        validation_split (float): Fraction of texts held out for evaluation
+        seed (int): Random seed for the split and initialization
+        show_progress (bool): Whether to print progress
+
+    Returns:
+        tuple: (StudentSentimentAnalyzer, report dict)
+    """
+    report = {}
+    if teacher_probabilities is None:
+        texts = [text for text in texts if teacher.is_valid_text(text)]
+        start = time.perf_counter()
+        teacher_probabilities = teacher.predict_probabilities(texts, show_progress=show_progress)
+        report['teacher_rows_per_second'] = round(len(texts) / (time.perf_counter() - start), 1)
+
+    if not texts:
+        raise ValueError("No non-empty texts to train on")
+
+    targets = teacher_probabilities.astype(np.float64) ** (1.0 / temperature)
+    targets = (targets / targets.sum(axis=1, keepdims=True)).astype(np.float32)
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(texts))
+    n_validation = int(len(texts) * validation_split)
+    validation_indices, train_indices = order[:n_validation], order[n_validation:]
+
+    torch.manual_seed(seed)
+    tokenizer = HashingNgramTokenizer(num_buckets, ngram_range)
+    model = FastTextClassifier(num_buckets, embedding_dim, targets.shape[1])
+    encoded = [tokenizer.encode(texts[i], max_length=512) for i in train_indices]
+    train_targets = torch.from_numpy(targets[train_indices])
+
+    # Sparse gradients keep each step proportional to the n-grams in the batch
+    optimizers = [
+        torch.optim.SparseAdam(model.embedding.parameters(), lr=learning_rate),
+        torch.optim.Adam(model.classifier.parameters(), lr=learning_rate)
+    ]
+
+    model.train()
+    for epoch in range(epochs):
+        total_loss = 0.0
+        permutation = rng.permutation(len(encoded))
+        for start in range(0, len(permutation), batch_size):
+            batch = permutation[start:start+batch_size]
+            lengths = [len(encoded[i]) for i in batch]
+            flat_ids = torch.tensor([token for i in batch for token in encoded[i]], dtype=torch.long)
+            offsets = torch.tensor(np.concatenate([[0], np.cumsum(lengths)[:-1]]), dtype=torch.long)
+
+            for optimizer in optimizers:
+                optimizer.zero_grad()
+            loss = _soft_cross_entropy(model(flat_ids, offsets=offsets).logits, train_targets[batch])
+            loss.backward()
+            for optimizer in optimizers:
+                optimizer.step()
+            total_loss += loss.item() * len(batch)
+
+        if show_progress:
+            print(f"Epoch {epoch + 1}/{epochs}: loss {total_loss / max(len(encoded), 1):.4f}")
+
+    student = StudentSentimentAnalyzer(model, tokenizer)
+    report['train_rows'] = len(train_indices)
+    if n_validation:
+        report.update(evaluate_student(student, [texts[i] for i in validation_indices],
+                                       teacher_probabilities[validation_indices]))
+
+    return student, report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Distill a fast student sentiment model from BERT.")
+    parser.add_argument('csv_file', help="CSV file with unlabeled feedback")
+    parser.add_argument('text_column', help="Name of the text column")
+    parser.add_argument('--output', default=DEFAULT_STUDENT_PATH, help="Where to save the student model")
+    parser.add_argument('--max-rows', type=int, default=None, help="Use at most this many rows")
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--teacher-cache', default=None,
+                        help="NumPy file caching teacher probabilities between runs")
+    args = parser.parse_args()
+
+    texts = pd.read_csv(args.csv_file, usecols=[args.text_column], nrows=args.max_rows)[args.text_column].tolist()
+    teacher = SentimentAnalyzer(warmup=False)
+    texts = [text for text in texts if teacher.is_valid_text(text)]
+
+    teacher_probabilities = None
+    if args.teacher_cache and os.path.exists(args.teacher_cache):
+        teacher_probabilities = np.load(args.teacher_cache)
+        if len(teacher_probabilities) != len(texts):
+            print("Teacher cache does not match the input, recomputing")
+            teacher_probabilities = None
+    if teacher_probabilities is None:
+        print(f"Scoring {len(texts)} texts with the teacher model...")
+        teacher_probabilities = teacher.predict_probabilities(texts)
+        if args.teacher_cache:
+            np.save(args.teacher_cache, teacher_probabilities)
+
+    student, report = distill_student(teacher, texts, teacher_probabilities, epochs=args.epochs)
+    print(f"Saved student to {student.save(args.output)}")
+    for key, value in report.items():
+        print(f"  {key}: {value}")
@@ -0,0 +1,64 @@
+import numpy as np
+
+from utils.duplicate_clusters import DuplicateResultCache, NearDuplicateClusterer
+
+
+def _embeddings(n_rows=60, dim=32, seed=1):
+    rng = np.random.default_rng(seed)
+    # A shared offset, like the common direction of pooled BERT outputs
+    embeddings = rng.standard_normal((n_rows, dim)) + 5.0
+    embeddings[1] = embeddings[0]
+    embeddings[3] = embeddings[2] + 0.01 * rng.standard_normal(dim)
+    embeddings[4] = 0.0
+    return embeddings.astype(np.float16)
+
+
+def test_fit_groups_identical_and_near_pairs():
+    clusterer = NearDuplicateClusterer()
+    labels = clusterer.fit(_embeddings())
+
+    assert labels[0] == labels[1] >= 0
+    assert labels[2] == labels[3] >= 0
+    assert labels[0] != labels[2]
+    # All-zero rows were never scored by the model
+    assert labels[4] == -1
+    # The shared offset is removed before comparing, so unrelated rows stay apart
+    assert np.all(labels[5:] == -1)
+    assert clusterer.last_stats['clusters'] == 2
+    assert clusterer.last_stats['unique_vectors'] == 58
+
+
+def test_fit_compares_oversized_buckets_in_windows():
+    clusterer = NearDuplicateClusterer(n_bits=1, max_bucket_size=8)
+    labels = clusterer.fit(_embeddings())
+
+    assert clusterer.last_stats['capped_buckets'] > 0
+    assert labels[0] == labels[1] >= 0
+    assert labels[2] == labels[3] >= 0
+    assert np.all(labels[5:] == -1)
+
+
+def test_bucket_windows_overlap_and_cover_every_member():
+    clusterer = NearDuplicateClusterer(max_bucket_size=4)
+    members = np.arange(10)
+    windows = clusterer._bucket_windows(members, order_key=np.arange(10, 0, -1))
+
+    assert all(len(window) <= 4 for window in windows)
+    assert set(np.concatenate(windows)) == set(range(10))
+    # Neighbours in projection order always share a window
+    order = members[::-1]
+    for a, b in zip(order[:-1], order[1:]):
+        assert any(a in window and b in window for window in windows)
+
+
+def test_cache_reuses_cluster_labels_after_save(tmp_path):
+    cache = DuplicateResultCache(max_entries=3)
+    cache.add_clusters(['Great app!', 'great app', 'Slow', 'Crashes'],
+                       ['Positive', 'Positive', 'Negative', 'Very Negative'],
+                       [0.9, 0.7, 0.6, 0.8],
+                       [0, 0, -1, -1])
+    path = cache.save(str(tmp_path / 'cache.json'))
+
+    loaded = DuplicateResultCache.load(path)
+    assert loaded.score_many(['GREAT APP', 'Slow']) == [('Positive', 0.8), None]
+    assert len(DuplicateResultCache.load(str(tmp_path / 'missing.json'))) == 0
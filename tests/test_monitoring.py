@@ -0,0 +1,54 @@
+import numpy as np
+
+from utils import monitoring
+from utils.monitoring import LatencySketch, RollingMonitor
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(mean=-3.0, sigma=1.0, size=20000)
+    sketch = LatencySketch(relative_accuracy=0.01)
+    sketch.add(values)
+
+    p50, p99 = sketch.quantiles([0.5, 0.99])
+    expected_p50, expected_p99 = np.quantile(values, [0.5, 0.99], method='lower')
+
+    assert abs(p50 - expected_p50) <= 0.01 * expected_p50 + 1e-12
+    assert abs(p99 - expected_p99) <= 0.01 * expected_p99 + 1e-12
+
+
+def test_buckets_are_cleared_after_the_window_passes(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(monitoring.time, 'time', lambda: now[0])
+    monitor = RollingMonitor(window_seconds=30, bucket_seconds=10)
+
+    monitor.record([5, 5], [0.9, 0.8], 0.01)
+    now[0] = 1010.0
+    monitor.record([1], [0.7], 0.01, source='interactive')
+    now[0] = 1015.0
+    assert monitor.snapshot()['rows'] == 3
+
+    now[0] = 1045.0
+    snapshot = monitor.snapshot()
+    assert snapshot['rows'] == 0
+    assert snapshot['latency']['batch']['p50_ms'] is None
+
+    # The ring wraps onto the slot of the bucket at 1010, which must be cleared
+    monitor.record([3], [0.6], 0.01)
+    snapshot = monitor.snapshot()
+    assert snapshot['rows'] == 1
+    assert snapshot['sentiment_distribution']['Neutral'] == 1.0
+    assert monitor.label_counts[:, 0].sum() == 0
+    assert monitor.total_rows == 4
+
+
+def test_prefiltered_rows_count_towards_distribution():
+    monitor = RollingMonitor()
+    monitor.record([4, 4], [0.9, 0.9], 0.05)
+    monitor.record([1, 1], [0.8, 0.8], 0.001, source='prefilter')
+
+    snapshot = monitor.snapshot()
+    assert snapshot['rows'] == 4
+    assert snapshot['sentiment_distribution']['Very Negative'] == 0.5
+    assert snapshot['latency']['prefilter']['rows'] == 2
+    assert snapshot['latency']['batch']['rows'] == 2
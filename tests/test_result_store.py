@@ -0,0 +1,48 @@
+import sys
+
+import numpy as np
+import pytest
+
+from utils.ingestion import estimate_rows
+from utils.result_store import MemmapResultStore
+
+
+def test_estimate_rows_counts_last_line_without_newline(tmp_path):
+    path = tmp_path / 'input.csv'
+    path.write_text('feedback\ngood\nbad')
+    assert estimate_rows(str(path)) == 2
+
+    path.write_text('feedback\ngood\nbad\n')
+    assert estimate_rows(str(path)) == 2
+
+
+def test_store_grows_past_underestimated_capacity(tmp_path):
+    path = str(tmp_path / 'results.npy')
+    store = MemmapResultStore.create(path, 1)
+
+    store.write([0, 1, 2], [5, 1, 3], [0.9, 0.8, 0.7])
+    store.flush()
+
+    assert len(store) >= 3
+    reopened = MemmapResultStore.open(path)
+    assert reopened.row_ids[:3].tolist() == [0, 1, 2]
+    assert reopened.stars[:3].tolist() == [5, 1, 3]
+    assert np.all(reopened.row_ids[3:] == -1)
+    assert reopened.sentiment_counts() == {'Very Positive': 1, 'Very Negative': 1, 'Neutral': 1}
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='Windows cannot resize a file while a view maps it')
+def test_views_held_across_growth_keep_old_records(tmp_path):
+    path = str(tmp_path / 'results.npy')
+    store = MemmapResultStore.create(path, 2)
+    store.write([0, 1], [4, 2], [0.6, 0.7])
+    stars = store.stars
+
+    store.write([5], [1], [0.9])
+
+    assert stars.tolist() == [4, 2]
+    assert len(store) == 6
+    assert store.stars.tolist() == [4, 2, 0, 0, 0, 1]
+    assert np.isnan(store.confidences[2:5]).all()
+    store.flush()
+    assert len(MemmapResultStore.open(path)) == 6
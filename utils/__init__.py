@@ -5,5 +5,37 @@ Utility modules for sentiment analysis project
 
 from .text_preprocessor import TextPreprocessor
 from .visualization_generator import VisualizationGenerator
+from .padding_profiler import PaddingProfiler
+from .runtime_profile import calibrate_runtime, load_runtime_profile
+from .pretokenizer import BatchPreTokenizer
+from .pipeline import SentimentPipeline
+from .term_frequency import TermFrequencyCounter
+from .visualization_cache import VisualizationCache
+from .sentiment_summary import SentimentSummary
+from .sentiment_labels import SentimentLabel, SENTIMENT_DTYPE
+from .session_store import SessionResultStore
+from .priority_gate import InferencePriorityGate
+from .job_queue import JobQueue
+from .streaming import follow_file, gzip_stream
+from .language_detector import LanguageDetector
+from .lexicon_prefilter import LexiconPreFilter
+from .keyword_engine import KeywordExtractor
+from .result_store import MemmapResultStore
+from .aspect_sentiment import AspectSentimentAnalyzer
+from .sentence_sentiment import SentenceSentimentAnalyzer
+from .ingestion import read_columns, iter_chunks
+from .duplicate_clusters import NearDuplicateClusterer, DuplicateResultCache
+from .monitoring import LatencySketch, RollingMonitor
 
-__all__ = ['TextPreprocessor', 'VisualizationGenerator']
\ No newline at end of file
+__all__ = ['TextPreprocessor', 'VisualizationGenerator', 'PaddingProfiler',
+           'calibrate_runtime', 'load_runtime_profile', 'BatchPreTokenizer',
+           'SentimentPipeline', 'TermFrequencyCounter',
+           'VisualizationCache', 'SentimentSummary',
+           'SentimentLabel', 'SENTIMENT_DTYPE',
+           'SessionResultStore', 'InferencePriorityGate',
+           'JobQueue', 'follow_file', 'gzip_stream',
+           'LanguageDetector', 'LexiconPreFilter', 'KeywordExtractor',
+           'MemmapResultStore', 'AspectSentimentAnalyzer',
+           'SentenceSentimentAnalyzer', 'read_columns', 'iter_chunks',
+           'NearDuplicateClusterer', 'DuplicateResultCache',
+           'LatencySketch', 'RollingMonitor']
\ No newline at end of file
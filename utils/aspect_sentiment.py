@@ -0,0 +1,197 @@
+import re
+import numpy as np
+import pandas as pd
+from .pretokenizer import BatchPreTokenizer
+from .sentiment_labels import SENTIMENT_LABELS, stars_to_categorical
+
+# Aspect name -> regular expressions matching a mention (case-insensitive, whole words)
+DEFAULT_ASPECTS = {
+    'delivery': [r'deliver\w*', r'shipping', r'ship(?:ped|ment)', r'courier', r'arriv\w*', r'late', r'on time'],
+    'price': [r'prices?', r'pric(?:ey|ing)', r'costs?', r'expensive', r'cheap\w*', r'overpriced', r'value for money', r'refund\w*'],
+    'support': [r'support', r'customer service', r'help ?desk', r'agents?', r'staff', r'representatives?', r'response time'],
+    'quality': [r'quality', r'broke\w*', r'defect\w*', r'durab\w*', r'flimsy', r'sturdy', r'well made'],
+    'usability': [r'easy to use', r'user friendly', r'interface', r'setup', r'install\w*', r'confusing', r'intuitive'],
+}
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?;])\s+|\n+')
+_CLAUSE_BOUNDARY = re.compile(r',\s*|\s+(?:but|however|although|though|whereas)\s+', re.IGNORECASE)
+
+
+class AspectSentimentAnalyzer:
+    def __init__(self, sentiment_analyzer, aspects=None, span='sentence', max_span_tokens=128):
+        """
+        Aspect-based sentiment on top of a document-level analyzer.
+
+        Aspect mentions are found with a keyword/regex dictionary and the sentence
+        (or clause) around each mention is classified instead of the whole document.
+        All spans of a batch of documents are deduplicated and classified together in
+        length-sorted batches, so cost grows with the number of unique spans rather
+        than with aspects x documents. Spans mentioning the same aspect in one
+        document are aggregated by averaging their class probabilities.
+
+        Args:
+            sentiment_analyzer (SentimentAnalyzer): Analyzer providing tokenizer and model
+            aspects (dict): Mapping of aspect name to a list of regular expressions
+                (defaults to DEFAULT_ASPECTS)
+            span (str): 'sentence' or 'clause' (splits sentences further at commas
+                and contrast words such as "but")
+            max_span_tokens (int): Truncation limit for span encoding
+        """
+        if span not in ('sentence', 'clause'):
+            raise ValueError(f"Unknown span type '{span}', expected 'sentence' or 'clause'")
+
+        self.sentiment_analyzer = sentiment_analyzer
+        self.aspects = dict(aspects or DEFAULT_ASPECTS)
+        self.span = span
+        self.aspect_patterns = {
+            aspect: re.compile(r'\b(?:' + '|'.join(patterns) + r')\b', re.IGNORECASE)
+            for aspect, patterns in self.aspects.items()
+        }
+        self.pretokenizer = BatchPreTokenizer(
+            sentiment_analyzer.tokenizer,
+            batch_size=sentiment_analyzer.batch_size,
+            max_length=max_span_tokens,
+            sort_by_length=True,
+            background=False,
+            lock=sentiment_analyzer.tokenizer_lock
+        )
+        self.last_stats = {}
+
+    def split_spans(self, text):
+        """
+        Split a document into sentence or clause spans.
+
+        Args:
+            text (str): Input document
+
+        Returns:
+            list: Non-empty spans in document order
+        """
+        spans = _SENTENCE_BOUNDARY.split(text)
+        if self.span == 'clause':
+            spans = [clause for sentence in spans for clause in _CLAUSE_BOUNDARY.split(sentence)]
+        return [span.strip() for span in spans if span and span.strip()]
+
+    def find_mentions(self, text):
+        """
+        Find the spans of a document that mention each aspect.
+
+        Args:
+            text (str): Input document
+
+        Returns:
+            list: Tuples (aspect, span) in document order
+        """
+        if not self.sentiment_analyzer.is_valid_text(text):
+            return []
+
+        mentions = []
+        for span in self.split_spans(text):
+            for aspect, pattern in self.aspect_patterns.items():
+                if pattern.search(span):
+                    mentions.append((aspect, span))
+        return mentions
+
+    def _classify_spans(self, spans):
+        """Class probabilities for each span, classified in packed length-sorted batches."""
+        probabilities = np.zeros((len(spans), len(SENTIMENT_LABELS)), dtype=np.float32)
+        for positions, encoding in self.pretokenizer.encode_chunk(spans):
+            _, _, batch_probabilities = self.sentiment_analyzer.predict_encoded_stars(
+                encoding, return_probabilities=True
+            )
+            probabilities[positions] = batch_probabilities
+        return probabilities
+
+    def analyze(self, texts, row_ids=None):
+        """
+        Get sentiment per document and aspect.
+
+        Args:
+            texts (list): Documents
+            row_ids (list): Id of each document in the output (defaults to positions)
+
+        Returns:
+            pd.DataFrame: One row per (document, aspect) mention with columns row_id,
+                aspect, sentiment, confidence and mentions
+        """
+        texts = list(texts)
+        row_ids = list(range(len(texts))) if row_ids is None else list(row_ids)
+
+        # (document, aspect) -> indices of the unique spans mentioning it
+        unique_spans = {}
+        mentions = {}
+        n_mentions = 0
+        for document, text in enumerate(texts):
+            for aspect, span in self.find_mentions(text):
+                key = ' '.join(span.lower().split())
+                span_index = unique_spans.setdefault(key, len(unique_spans))
+                mentions.setdefault((document, aspect), []).append(span_index)
+                n_mentions += 1
+
+        self.last_stats = {
+            'documents': len(texts),
+            'mentions': n_mentions,
+            'unique_spans': len(unique_spans)
+        }
+
+        columns = ['row_id', 'aspect', 'sentiment', 'confidence', 'mentions']
+        if not mentions:
+            return pd.DataFrame(columns=columns)
+
+        probabilities = self._classify_spans(list(unique_spans))
+
+        keys = list(mentions)
+        aggregated = np.stack([probabilities[mentions[key]].mean(axis=0) for key in keys])
+        stars = aggregated.argmax(axis=1).astype(np.int8) + 1
+
+        return pd.DataFrame({
+            'row_id': [row_ids[document] for document, _ in keys],
+            'aspect': pd.Categorical([aspect for _, aspect in keys], categories=list(self.aspects)),
+            'sentiment': stars_to_categorical(stars),
+            'confidence': np.round(aggregated.max(axis=1).astype(np.float64), 3),
+            'mentions': [len(mentions[key]) for key in keys]
+        }, columns=columns)
+
+    def analyze_dataframe(self, df, text_column, chunk_size=1000):
+        """
+        Get sentiment per row and aspect for a DataFrame column.
+
+        Args:
+            df (pd.DataFrame): Input DataFrame
+            text_column (str): Name of the column containing text
+            chunk_size (int): Documents whose spans are deduplicated and classified together
+
+        Returns:
+            pd.DataFrame: Long-format results keyed by the DataFrame index (``row_id``)
+        """
+        results = []
+        stats = {'documents': 0, 'mentions': 0, 'unique_spans': 0}
+        for start in range(0, len(df), chunk_size):
+            chunk = df[text_column].iloc[start:start+chunk_size]
+            results.append(self.analyze(chunk.tolist(), row_ids=chunk.index))
+            for key in stats:
+                stats[key] += self.last_stats[key]
+
+        self.last_stats = stats
+        if not results:
+            return self.analyze([])
+        return pd.concat(results, ignore_index=True)
+
+    def summarize(self, aspect_results):
+        """
+        Count sentiments per aspect.
+
+        Args:
+            aspect_results (pd.DataFrame): Output of ``analyze`` or ``analyze_dataframe``
+
+        Returns:
+            pd.DataFrame: Aspects as rows, sentiment labels as columns, plus mean stars
+        """
+        table = pd.crosstab(aspect_results['aspect'], aspect_results['sentiment'], dropna=False)
+        table = table.reindex(index=list(self.aspects), columns=SENTIMENT_LABELS, fill_value=0)
+
+        stars = np.arange(1, len(SENTIMENT_LABELS) + 1)
+        totals = table.sum(axis=1)
+        table['Mentions'] = totals
+        table['Average Stars'] = (table[SENTIMENT_LABELS].to_numpy() @ stars / totals.replace(0, np.nan)).round(2)
+        return table
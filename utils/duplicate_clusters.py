@@ -0,0 +1,314 @@
+import json
+import os
+import re
+import threading
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+_NORMALIZE_PATTERN = re.compile(r'[^\w]+')
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    'SENTIMENT_DUPLICATE_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'sentiment_analysis', 'duplicate_cache.json')
+)
+
+
+def normalize_text(text):
+    """Lowercase a text and collapse punctuation and whitespace, for exact lookups."""
+    return _NORMALIZE_PATTERN.sub(' ', str(text).lower()).strip()
+
+
+class NearDuplicateClusterer:
+    def __init__(self, threshold=0.95, n_bits=16, n_tables=8, max_bucket_size=2000, block_size=1024, seed=0):
+        """
+        Group near-identical texts by the cosine similarity of their embeddings.
+
+        Rows with identical embeddings are merged first. The remaining vectors are
+        centered on their mean before hashing and comparison: pooled BERT vectors
+        share a large common direction, so uncentered vectors would fall into a few
+        buckets and look similar to each other. Candidate pairs come from
+        random-hyperplane locality-sensitive hashing: each of ``n_tables`` tables
+        hashes a vector to the signs of its projections on ``n_bits`` random
+        hyperplanes, so similar vectors tend to share a bucket in at least one table.
+        Only pairs within a bucket are compared exactly, and pairs above
+        ``threshold`` are joined into clusters by connected components.
+
+        Args:
+            threshold (float): Minimum cosine similarity of two near-duplicates,
+                measured on mean-centered embeddings
+            n_bits (int): Hyperplanes per table; more bits give smaller buckets
+            n_tables (int): Hash tables; more tables find more pairs
+            max_bucket_size (int): Larger buckets are only compared within overlapping
+                windows of this many rows, ordered by a random projection, so a skewed
+                bucket cannot make the comparison quadratic in the dataset size
+            block_size (int): Rows compared at once inside a bucket, bounding memory
+            seed (int): Seed of the random hyperplanes
+        """
+        self.threshold = threshold
+        self.n_bits = n_bits
+        self.n_tables = n_tables
+        self.max_bucket_size = max_bucket_size
+        self.block_size = block_size
+        self.seed = seed
+        self.last_stats = {}
+
+    def _projections(self, vectors):
+        """Projections of every row on each table's hyperplanes, shape (n_tables, n_rows, n_bits)."""
+        rng = np.random.default_rng(self.seed)
+        planes = rng.standard_normal((self.n_tables, vectors.shape[1], self.n_bits)).astype(np.float32)
+        return np.stack([vectors @ planes[table] for table in range(self.n_tables)])
+
+    def _similar_pairs(self, vectors, members):
+        """Pairs (i, j) with i < j among ``members`` whose similarity reaches the threshold."""
+        rows, cols = [], []
+        for start in range(0, len(members), self.block_size):
+            block = members[start:start+self.block_size]
+            similarities = vectors[block] @ vectors[members[start:]].T
+            i, j = np.nonzero(similarities >= self.threshold)
+            # Only compare each pair once, against rows later in the bucket
+            keep = j > i
+            rows.append(block[i[keep]])
+            cols.append(members[start:][j[keep]])
+        return np.concatenate(rows), np.concatenate(cols)
+
+    def _bucket_windows(self, members, order_key):
+        """Split an oversized bucket into overlapping windows of neighbouring rows."""
+        if len(members) <= self.max_bucket_size:
+            return [members]
+        members = members[np.argsort(order_key[members], kind='stable')]
+        step = max(self.max_bucket_size // 2, 1)
+        return [members[start:start+self.max_bucket_size]
+                for start in range(0, len(members) - step, step)]
+
+    def fit(self, embeddings):
+        """
+        Assign every row to a near-duplicate cluster.
+
+        Args:
+            embeddings (np.ndarray): Embeddings of shape (n_rows, dim), e.g. float16 from
+                ``SentimentAnalyzer.analyze_batch(..., return_embeddings=True)``; all-zero
+                rows (empty texts, rows not sent to the model) are left unclustered
+
+        Returns:
+            np.ndarray: Cluster id per row, numbered by decreasing cluster size, with
+                singletons and unclustered rows set to -1
+        """
+        embeddings = np.asarray(embeddings)
+        labels = np.full(len(embeddings), -1, dtype=np.int64)
+        valid = np.flatnonzero(np.any(embeddings != 0, axis=1)) if len(embeddings) else np.zeros(0, dtype=np.int64)
+        self.last_stats = {'rows': len(embeddings), 'unique_vectors': 0, 'compared_pairs': 0,
+                           'capped_buckets': 0, 'clusters': 0}
+        if len(valid) < 2:
+            return labels
+
+        # Identical texts give identical embeddings; they are clustered without hashing
+        unique_vectors, inverse = np.unique(embeddings[valid], axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        vectors = unique_vectors.astype(np.float32)
+        vectors -= vectors.mean(axis=0)
+        norms = np.linalg.norm(vectors, axis=1)
+        # A vector at the mean has no direction and only matches its exact duplicates
+        norms[norms == 0] = 1.0
+        vectors /= norms[:, None]
+
+        rows, cols = [], []
+        compared = 0
+        capped = 0
+        if len(vectors) > 1:
+            weights = np.left_shift(1, np.arange(self.n_bits, dtype=np.int64))
+            for projections in self._projections(vectors):
+                codes = (projections > 0) @ weights
+                order = np.argsort(codes, kind='stable')
+                boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+                for members in np.split(order, boundaries):
+                    if len(members) < 2:
+                        continue
+                    capped += len(members) > self.max_bucket_size
+                    for window in self._bucket_windows(members, projections[:, 0]):
+                        compared += len(window) * (len(window) - 1) // 2
+                        window_rows, window_cols = self._similar_pairs(vectors, window)
+                        rows.append(window_rows)
+                        cols.append(window_cols)
+
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        graph = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(len(vectors),) * 2)
+        _, components = connected_components(graph, directed=False)
+        components = components[inverse]
+
+        # Renumber clusters of two or more rows, largest first
+        sizes = np.bincount(components)
+        ranked = np.argsort(-sizes, kind='stable')
+        ranked = ranked[sizes[ranked] > 1]
+        cluster_ids = np.full(len(sizes), -1, dtype=np.int64)
+        cluster_ids[ranked] = np.arange(len(ranked))
+        labels[valid] = cluster_ids[components]
+
+        self.last_stats.update({
+            'unique_vectors': len(vectors),
+            'compared_pairs': int(compared),
+            'capped_buckets': int(capped),
+            'clusters': len(ranked)
+        })
+        return labels
+
+    def cluster_table(self, df, labels, text_column, sentiment_column='sentiment', top_n=20):
+        """
+        Summarize the largest clusters, e.g. "N customers said essentially this".
+
+        Args:
+            df (pd.DataFrame): Rows the labels were computed for, in the same order
+            labels (np.ndarray): Output of ``fit``
+            text_column (str): Column shown as the cluster's representative text
+            sentiment_column (str): Column with each row's sentiment label
+            top_n (int): Number of clusters returned
+
+        Returns:
+            pd.DataFrame: One row per cluster with columns Cluster, Size, Representative,
+                Sentiment (most common label) and Agreement (share of rows with it)
+        """
+        columns = ['Cluster', 'Size', 'Representative', 'Sentiment', 'Agreement']
+        labels = np.asarray(labels)
+        clustered = df.loc[labels >= 0, [text_column, sentiment_column]].assign(cluster=labels[labels >= 0])
+        clustered = clustered[clustered['cluster'] < top_n]
+        if clustered.empty:
+            return pd.DataFrame(columns=columns)
+
+        rows = []
+        for cluster, members in clustered.groupby('cluster', sort=True):
+            sentiments = members[sentiment_column].astype(str).value_counts()
+            rows.append((
+                int(cluster),
+                len(members),
+                # The most frequent wording stands for the cluster
+                members[text_column].astype(str).value_counts().index[0],
+                sentiments.index[0],
+                round(sentiments.iloc[0] / len(members), 3)
+            ))
+        return pd.DataFrame(rows, columns=columns)
+
+
+class DuplicateResultCache:
+    tier_name = 'duplicate'
+
+    def __init__(self, entries=None, max_entries=200000):
+        """
+        Sentiment results of previously clustered texts, reused in later runs.
+
+        Every member of a near-duplicate cluster is stored under its normalized text
+        with the cluster's majority label, so the same wording (up to case, whitespace
+        and punctuation) in a later run skips the model. Lookups are exact: a new
+        paraphrase is only recognised once a run that groups duplicates has seen it,
+        since matching it by embedding would need the forward pass the cache saves.
+        The cache has the ``score_many`` interface of LexiconPreFilter and can be
+        passed to SentimentPipeline as ``prefilter``.
+
+        Args:
+            entries (dict): Mapping of normalized text to (label, confidence) (optional)
+            max_entries (int): Texts kept; the least recently added are dropped first
+        """
+        self.entries = dict(entries or {})
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add_clusters(self, texts, sentiments, confidences, labels):
+        """
+        Add the clustered rows of a run.
+
+        Args:
+            texts (list): Texts the clusters were computed for
+            sentiments (list): Sentiment label per text
+            confidences (list): Confidence per text
+            labels (np.ndarray): Cluster id per text from ``NearDuplicateClusterer.fit``
+        """
+        frame = pd.DataFrame({
+            'text': list(texts),
+            'sentiment': pd.Series(list(sentiments), dtype=object).astype(str),
+            'confidence': np.asarray(confidences, dtype=np.float64),
+            'cluster': np.asarray(labels)
+        })
+        added = {}
+        for _, members in frame[frame['cluster'] >= 0].groupby('cluster'):
+            label = members['sentiment'].value_counts().index[0]
+            confidence = round(float(members.loc[members['sentiment'] == label, 'confidence'].mean()), 3)
+            for text in members['text']:
+                added[normalize_text(text)] = (label, confidence)
+
+        with self._lock:
+            for text, result in added.items():
+                # Re-added texts move to the end, so they are dropped last
+                self.entries.pop(text, None)
+                self.entries[text] = result
+            for text in list(self.entries)[:max(len(self.entries) - self.max_entries, 0)]:
+                del self.entries[text]
+
+    def score(self, text):
+        """
+        Look up a text.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            tuple: (label, confidence), or None if the text is not a known duplicate
+        """
+        if pd.isna(text) or not isinstance(text, str):
+            return None
+        return self.entries.get(normalize_text(text))
+
+    def score_many(self, texts, threshold=None):
+        """
+        Look up several texts.
+
+        Args:
+            texts (iterable): Input texts
+            threshold (float): Ignored, for compatibility with LexiconPreFilter
+
+        Returns:
+            list: (label, confidence) or None per text, in input order
+        """
+        return [self.score(text) for text in texts]
+
+    def save(self, path=None):
+        """
+        Write the cache to a JSON file.
+
+        Args:
+            path (str): Output file (defaults to DEFAULT_CACHE_PATH)
+
+        Returns:
+            str: Path written
+        """
+        path = path or DEFAULT_CACHE_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Written next to the target first, so a crash never leaves a truncated cache
+        tmp_path = path + '.tmp'
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({text: list(result) for text, result in self.entries.items()}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=None, **kwargs):
+        """
+        Read a cache written by ``save``.
+
+        Args:
+            path (str): JSON file (defaults to DEFAULT_CACHE_PATH); a missing file
+                gives an empty cache
+            **kwargs: Passed to the constructor
+
+        Returns:
+            DuplicateResultCache: Loaded cache
+        """
+        path = path or DEFAULT_CACHE_PATH
+        if not os.path.exists(path):
+            return cls(**kwargs)
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls({text: tuple(result) for text, result in json.load(f).items()}, **kwargs)
@@ -0,0 +1,239 @@
+import gzip
+import io
+import json
+import os
+import pandas as pd
+
+try:
+    import zstandard
+except ImportError:  # zstd-compressed inputs are optional
+    zstandard = None
+
+COMPRESSIONS = {'.gz': 'gzip', '.zst': 'zstd', '.zstd': 'zstd'}
+FORMATS = {'.csv': 'csv', '.xlsx': 'xlsx', '.xlsm': 'xlsx', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+# Extensions offered by file pickers; compressed variants are matched by their last suffix
+SUPPORTED_EXTENSIONS = ['.csv', '.xlsx', '.xlsm', '.jsonl', '.ndjson', '.gz', '.zst', '.zstd']
+
+
+def detect_format(path):
+    """
+    Detect the format and compression of an input file from its name.
+
+    Args:
+        path (str): File path or name
+
+    Returns:
+        tuple: (format, compression) where format is 'csv', 'xlsx' or 'jsonl' and
+            compression is None, 'gzip' or 'zstd'
+
+    Raises:
+        ValueError: If the file type is not supported
+    """
+    base, extension = os.path.splitext(path.lower())
+    compression = COMPRESSIONS.get(extension)
+    if compression:
+        base, extension = os.path.splitext(base)
+
+    file_format = FORMATS.get(extension)
+    if file_format is None or (file_format == 'xlsx' and compression):
+        raise ValueError(f"Unsupported file type: {os.path.basename(path)}. "
+                         "Use CSV (optionally .gz/.zst), XLSX or JSON Lines.")
+    return file_format, compression
+
+
+def file_extension(path):
+    """
+    Get the recognised extension of an input file, including any compression suffix.
+
+    Args:
+        path (str): File path or name
+
+    Returns:
+        str: Extension such as '.csv', '.csv.gz' or '.xlsx'
+    """
+    detect_format(path)
+    base, extension = os.path.splitext(path.lower())
+    if extension in COMPRESSIONS:
+        return os.path.splitext(base)[1] + extension
+    return extension
+
+
+def is_supported(path):
+    """Whether ``detect_format`` accepts a file name."""
+    try:
+        detect_format(path)
+        return True
+    except ValueError:
+        return False
+
+
+def _open_text(path, compression):
+    """Open a possibly compressed text file for streaming reads."""
+    if compression == 'gzip':
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("Reading .zst files requires the 'zstandard' package")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True), encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def _xlsx_header(rows):
+    header = next(rows, ())
+    return [str(name) if name is not None else f'Unnamed: {i}' for i, name in enumerate(header)]
+
+
+def read_columns(path):
+    """
+    Get the column names of an input file without parsing its data.
+
+    CSV files are read up to the header line, XLSX files up to the first row in
+    openpyxl's read-only mode, and JSON Lines files up to their first records.
+
+    Args:
+        path (str): Input file
+
+    Returns:
+        list: Column names
+    """
+    file_format, compression = detect_format(path)
+
+    if file_format == 'csv':
+        return list(pd.read_csv(path, nrows=0, compression=compression).columns)
+
+    if file_format == 'xlsx':
+        import openpyxl
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            return _xlsx_header(workbook.active.iter_rows(values_only=True))
+        finally:
+            workbook.close()
+
+    # JSON Lines records may omit keys, so a few records are merged
+    columns = {}
+    with _open_text(path, compression) as f:
+        for i, line in enumerate(f):
+            if i >= 20:
+                break
+            if line.strip():
+                columns.update(dict.fromkeys(json.loads(line)))
+    return list(columns)
+
+
+def iter_chunks(path, chunk_size=1000, nrows=None):
+    """
+    Stream an input file as DataFrame chunks.
+
+    Chunks are indexed by row number in the file, continuing across chunks, so
+    results can be joined back to the source rows.
+
+    Args:
+        path (str): Input file
+        chunk_size (int): Rows per chunk
+        nrows (int): Stop after this many rows (optional)
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of rows
+    """
+    file_format, compression = detect_format(path)
+
+    if file_format == 'csv':
+        yield from pd.read_csv(path, chunksize=chunk_size, nrows=nrows, compression=compression)
+        return
+
+    if file_format == 'jsonl':
+        with _open_text(path, compression) as f:
+            yield from pd.read_json(f, lines=True, chunksize=chunk_size, nrows=nrows, dtype=False)
+        return
+
+    import openpyxl
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        columns = _xlsx_header(rows)
+
+        buffer = []
+        start = 0
+        for row in rows:
+            # Read-only sheets often report trailing blank rows
+            if all(value is None for value in row):
+                continue
+            buffer.append([row[i] if i < len(row) else None for i in range(len(columns))])
+            if nrows is not None and start + len(buffer) >= nrows:
+                break
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame(buffer, columns=columns, index=pd.RangeIndex(start, start + len(buffer)))
+                start += len(buffer)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns, index=pd.RangeIndex(start, start + len(buffer)))
+    finally:
+        workbook.close()
+
+
+def read_sample(path, nrows=100):
+    """
+    Read the first rows of an input file, e.g. to detect text columns.
+
+    Args:
+        path (str): Input file
+        nrows (int): Number of rows
+
+    Returns:
+        pd.DataFrame: Up to ``nrows`` rows
+    """
+    chunks = list(iter_chunks(path, chunk_size=nrows, nrows=nrows))
+    if not chunks:
+        return pd.DataFrame(columns=read_columns(path))
+    return pd.concat(chunks)
+
+
+def estimate_rows(path):
+    """
+    Estimate the number of data rows of an input file without parsing it.
+
+    For text formats this counts lines, so quoted fields with newlines make it an
+    overestimate. XLSX files report the dimension stored in the sheet, which can be
+    stale in either direction, so callers must not rely on it as a bound.
+
+    Args:
+        path (str): Input file
+
+    Returns:
+        int: Estimated row count, or None if it cannot be estimated
+    """
+    file_format, compression = detect_format(path)
+
+    if file_format == 'xlsx':
+        import openpyxl
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        try:
+            max_row = workbook.active.max_row
+        finally:
+            workbook.close()
+        return max(max_row - 1, 0) if max_row else None
+
+    try:
+        if compression == 'gzip':
+            f = gzip.open(path, 'rb')
+        elif compression == 'zstd':
+            if zstandard is None:
+                return None
+            f = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        else:
+            f = open(path, 'rb')
+        with f:
+            lines = 0
+            last_byte = b'\n'
+            for block in iter(lambda: f.read(1 << 20), b''):
+                lines += block.count(b'\n')
+                last_byte = block[-1:]
+    except OSError:
+        return None
+
+    # A last line without a line break still holds a row
+    if last_byte != b'\n':
+        lines += 1
+    # CSV has a header line
+    return max(lines - 1, 0) if file_format == 'csv' else lines
@@ -0,0 +1,170 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from .ingestion import estimate_rows
+from .pipeline import SentimentPipeline
+from .result_store import MemmapResultStore
+
+
+class JobQueue:
+    def __init__(self, sentiment_analyzer, jobs_dir, max_workers=1, chunk_size=1000):
+        """
+        Local background job queue for CSV sentiment analysis.
+
+        Job state lives in a SQLite database inside ``jobs_dir`` and jobs run on a
+        thread pool sharing one analyzer. Jobs that were queued or running when the
+        process stopped are queued again on startup.
+
+        Args:
+            sentiment_analyzer (SentimentAnalyzer): Analyzer used by every job
+            jobs_dir (str): Directory holding the job database and per-job files
+            max_workers (int): Number of jobs processed concurrently
+            chunk_size (int): Rows read and analyzed at a time
+        """
+        self.sentiment_analyzer = sentiment_analyzer
+        self.jobs_dir = jobs_dir
+        self.chunk_size = chunk_size
+        os.makedirs(jobs_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(jobs_dir, 'jobs.db'), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock, self._db:
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    text_column TEXT NOT NULL,
+                    input_path TEXT NOT NULL,
+                    output_path TEXT NOT NULL,
+                    download_name TEXT NOT NULL,
+                    rows_total INTEGER,
+                    rows_done INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sentiment-job')
+
+        for job in self._query("SELECT id FROM jobs WHERE status IN ('queued', 'running')"):
+            self._update(job['id'], status='queued', rows_done=0)
+            self._executor.submit(self._run, job['id'])
+
+    def new_job_dir(self):
+        """
+        Reserve a job id and create its working directory.
+
+        Returns:
+            tuple: (job_id, directory path)
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.jobs_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        return job_id, job_dir
+
+    def submit(self, job_id, input_path, text_column, download_name):
+        """
+        Queue a file for analysis.
+
+        Args:
+            job_id (str): Id from ``new_job_dir``
+            input_path (str): Path of the uploaded CSV, XLSX or JSON Lines file
+            text_column (str): Name of the column containing text
+            download_name (str): File name offered for the result download
+
+        Returns:
+            str: Job id
+        """
+        now = time.time()
+        output_path = os.path.join(os.path.dirname(input_path), 'output.csv')
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, text_column, input_path, output_path, download_name, "
+                "rows_total, created_at, updated_at) VALUES (?, 'queued', ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, text_column, input_path, output_path, download_name,
+                 estimate_rows(input_path), now, now)
+            )
+
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def get(self, job_id):
+        """
+        Get the state of a job.
+
+        Args:
+            job_id (str): Job id
+
+        Returns:
+            dict: Job fields, or None if the job does not exist
+        """
+        rows = self._query("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+
+        job = dict(rows[0])
+        if job['status'] == 'finished':
+            job['progress'] = 1.0
+        elif job['rows_total']:
+            job['progress'] = round(min(job['rows_done'] / job['rows_total'], 0.99), 3)
+        else:
+            job['progress'] = 0.0
+        return job
+
+    def get_result_store(self, job_id):
+        """
+        Open the memory-mapped results of a finished job for aggregation.
+
+        Args:
+            job_id (str): Job id
+
+        Returns:
+            MemmapResultStore: Read-only store, or None if the job has no results
+        """
+        job = self.get(job_id)
+        if job is None or job['status'] != 'finished':
+            return None
+        path = self._result_store_path(job)
+        return MemmapResultStore.open(path) if os.path.exists(path) else None
+
+    def _result_store_path(self, job):
+        return os.path.join(os.path.dirname(job['output_path']), 'results.npy')
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _update(self, job_id, **fields):
+        fields['updated_at'] = time.time()
+        assignments = ', '.join(f'{name} = ?' for name in fields)
+        with self._lock, self._db:
+            self._db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def _run(self, job_id):
+        job = self.get(job_id)
+        if job is None:
+            return
+
+        self._update(job_id, status='running')
+        try:
+            pipeline = SentimentPipeline(self.sentiment_analyzer, apply_preprocessing=False,
+                                         chunk_size=self.chunk_size)
+            # Sized from the row estimate; the store grows if the estimate was too low
+            result_store = MemmapResultStore.create(self._result_store_path(job), max(job['rows_total'] or 0, 1))
+            pipeline.run(
+                job['input_path'],
+                job['text_column'],
+                output_path=job['output_path'],
+                progress_callback=lambda rows: self._update(job_id, rows_done=rows),
+                collect=False,
+                result_store=result_store
+            )
+            self._update(job_id, status='finished', rows_done=pipeline.summary.total,
+                         rows_total=pipeline.summary.total)
+        except Exception as e:
+            self._update(job_id, status='failed', error=str(e))
@@ -0,0 +1,245 @@
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+from wordcloud import STOPWORDS
+from .sentiment_labels import SENTIMENT_LABELS, sentiment_codes
+
+# Sentiment groups accepted wherever a sentiment filter is expected
+SENTIMENT_GROUPS = {
+    'Any Negative': ['Very Negative', 'Negative'],
+    'Any Positive': ['Positive', 'Very Positive'],
+}
+
+
+class KeywordExtractor:
+    def __init__(self, ngram_range=(1, 2), stopwords=None, min_df=2, max_terms=100000):
+        """
+        Corpus-level keyword engine over sparse n-gram count matrices.
+
+        Each chunk of texts is vectorized in one call and its term and document
+        counts are added, per sentiment class, to corpus-wide arrays. Keywords can
+        then be ranked by raw count, TF-IDF, or class-contrastive log-odds (terms
+        over-represented in e.g. negative vs positive feedback) for the whole corpus
+        or any sentiment subset, without re-reading the texts.
+
+        Memory stays bounded: once the vocabulary grows past twice ``max_terms``, it
+        is pruned to the ``max_terms`` terms found in the most documents. Pruned
+        terms lose their counts and start again from zero if they reappear, so
+        counts of rare terms are lower bounds while frequent keywords are exact.
+
+        Args:
+            ngram_range (tuple): Smallest and largest word n-gram
+            stopwords (set): Words to ignore (defaults to the word cloud stopwords)
+            min_df (int): Minimum number of documents a keyword must appear in
+            max_terms (int): Terms kept after pruning (None keeps every term)
+        """
+        self.ngram_range = tuple(ngram_range)
+        self.stopwords = sorted(STOPWORDS if stopwords is None else stopwords)
+        self.min_df = min_df
+        self.max_terms = max_terms
+        self.pruned_terms = 0
+        self.labels = list(SENTIMENT_LABELS)
+
+        self.vocabulary = {}
+        self.terms = []
+        # One row per sentiment label plus a final row for texts without a label
+        n_rows = len(self.labels) + 1
+        self.term_counts = np.zeros((n_rows, 0), dtype=np.int64)
+        self.doc_counts = np.zeros((n_rows, 0), dtype=np.int64)
+        self.documents = np.zeros(n_rows, dtype=np.int64)
+
+    def _vectorizer(self):
+        return CountVectorizer(
+            ngram_range=self.ngram_range,
+            stop_words=self.stopwords,
+            token_pattern=r"(?u)\b\w[\w']+\b",
+            lowercase=True
+        )
+
+    def _global_indices(self, feature_names):
+        """Map chunk features to corpus vocabulary indices, growing the arrays if needed."""
+        indices = np.empty(len(feature_names), dtype=np.int64)
+        for i, term in enumerate(feature_names):
+            index = self.vocabulary.get(term)
+            if index is None:
+                index = self.vocabulary[term] = len(self.terms)
+                self.terms.append(term)
+            indices[i] = index
+
+        capacity = self.term_counts.shape[1]
+        missing = len(self.terms) - capacity
+        if missing > 0:
+            # Grow geometrically so appending chunks stays amortized O(vocabulary),
+            # but not past the size at which the vocabulary is pruned
+            grow = max(capacity, 1)
+            if self.max_terms is not None:
+                grow = min(grow, 2 * self.max_terms - capacity)
+            grow = max(grow, missing)
+            padding = np.zeros((self.term_counts.shape[0], grow), dtype=np.int64)
+            self.term_counts = np.hstack([self.term_counts, padding])
+            self.doc_counts = np.hstack([self.doc_counts, padding])
+        return indices
+
+    def update(self, texts, sentiments=None):
+        """
+        Add one chunk of texts to the counts.
+
+        Args:
+            texts (iterable): Texts of the chunk
+            sentiments (iterable): Sentiment label of each text (optional)
+
+        Returns:
+            KeywordExtractor: self, for chaining
+        """
+        texts = pd.Series(list(texts), dtype=object)
+        valid = texts.notna().to_numpy()
+        if sentiments is None:
+            rows = np.full(len(texts), len(self.labels), dtype=np.int64)
+        else:
+            rows = sentiment_codes(list(sentiments)).astype(np.int64)
+            rows[rows < 0] = len(self.labels)
+
+        texts, rows = texts[valid].astype(str), rows[valid]
+        if texts.empty:
+            return self
+
+        vectorizer = self._vectorizer()
+        try:
+            matrix = vectorizer.fit_transform(texts).tocsr()
+        except ValueError:
+            # Chunk contains only stopwords or no tokens at all
+            np.add.at(self.documents, rows, 1)
+            return self
+
+        indices = self._global_indices(vectorizer.get_feature_names_out())
+        np.add.at(self.documents, rows, 1)
+        for row in np.unique(rows):
+            subset = matrix[rows == row]
+            self.term_counts[row, indices] += np.asarray(subset.sum(axis=0)).ravel()
+            self.doc_counts[row, indices] += np.asarray((subset > 0).sum(axis=0)).ravel()
+
+        if self.max_terms is not None and len(self.terms) > 2 * self.max_terms:
+            self._prune()
+        return self
+
+    def _prune(self):
+        """Keep the ``max_terms`` terms found in the most documents."""
+        n_terms = len(self.terms)
+        documents = self.doc_counts[:, :n_terms].sum(axis=0)
+        keep = np.sort(np.argpartition(-documents, self.max_terms - 1)[:self.max_terms])
+
+        self.terms = [self.terms[i] for i in keep]
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        # Fancy indexing copies, so the larger arrays are released
+        self.term_counts = self.term_counts[:, keep]
+        self.doc_counts = self.doc_counts[:, keep]
+        self.pruned_terms += n_terms - len(keep)
+
+    def update_dataframe(self, df, text_column, sentiment_column='sentiment', chunk_size=10000):
+        """
+        Count keywords of a DataFrame column in fixed-size chunks.
+
+        Args:
+            df (pd.DataFrame): DataFrame with text data
+            text_column (str): Name of the text column
+            sentiment_column (str): Name of the sentiment column; counts are kept per
+                class when it exists
+            chunk_size (int): Rows vectorized at a time
+
+        Returns:
+            KeywordExtractor: self, for chaining
+        """
+        has_sentiment = sentiment_column in df.columns
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start+chunk_size]
+            self.update(chunk[text_column], chunk[sentiment_column] if has_sentiment else None)
+        return self
+
+    def _rows(self, sentiment):
+        """Array rows for a label, a group name from SENTIMENT_GROUPS, a list of labels, or None (all)."""
+        if sentiment is None:
+            return list(range(len(self.labels) + 1))
+        labels = SENTIMENT_GROUPS.get(sentiment, sentiment)
+        if isinstance(labels, str):
+            labels = [labels]
+        return [self.labels.index(label) for label in labels]
+
+    def _scores(self, method, rows, contrast_rows):
+        n_terms = len(self.terms)
+        counts = self.term_counts[rows, :n_terms].sum(axis=0)
+        all_doc_counts = self.doc_counts[:, :n_terms].sum(axis=0)
+
+        if method == 'count':
+            return counts.astype(np.float64)
+
+        if method == 'tfidf':
+            # Smoothed IDF over the whole corpus, as in scikit-learn's TfidfTransformer
+            idf = np.log((1 + self.documents.sum()) / (1 + all_doc_counts)) + 1
+            return counts * idf
+
+        if method == 'contrast':
+            # Log-odds ratio with an informative Dirichlet prior (Monroe et al., 2008),
+            # z-scored so rare terms do not dominate
+            other = self.term_counts[contrast_rows, :n_terms].sum(axis=0)
+            prior = self.term_counts[:, :n_terms].sum(axis=0).astype(np.float64)
+            prior_scale = prior.sum()
+            prior = prior / prior_scale * min(prior_scale, 10000)
+            alpha = prior.sum()
+
+            n_target, n_other = counts.sum(), other.sum()
+            log_odds_target = np.log((counts + prior) / np.maximum(n_target + alpha - counts - prior, 1e-9))
+            log_odds_other = np.log((other + prior) / np.maximum(n_other + alpha - other - prior, 1e-9))
+            variance = 1 / (counts + prior) + 1 / (other + prior)
+            return (log_odds_target - log_odds_other) / np.sqrt(variance)
+
+        raise ValueError(f"Unknown keyword scoring method: {method}")
+
+    def top_keywords(self, top_n=20, sentiment=None, method='count', contrast_with=None):
+        """
+        Rank keywords of the corpus or of a sentiment subset.
+
+        Args:
+            top_n (int): Number of keywords to return
+            sentiment (str|list): Label, group name ('Any Negative', 'Any Positive') or list of
+                labels to restrict to; None uses the whole corpus
+            method (str): 'count', 'tfidf' or 'contrast'
+            contrast_with (str|list): Labels to contrast against for 'contrast'
+                (defaults to all other labels)
+
+        Returns:
+            pd.DataFrame: Columns keyword, score, count and documents, best first
+        """
+        columns = ['keyword', 'score', 'count', 'documents']
+        if not self.terms:
+            return pd.DataFrame(columns=columns)
+
+        rows = self._rows(sentiment)
+        if method == 'contrast':
+            if sentiment is None:
+                raise ValueError("Contrastive scoring needs a sentiment to contrast")
+            contrast_rows = self._rows(contrast_with) if contrast_with else [
+                row for row in range(len(self.labels)) if row not in rows
+            ]
+        else:
+            contrast_rows = None
+
+        n_terms = len(self.terms)
+        counts = self.term_counts[rows, :n_terms].sum(axis=0)
+        documents = self.doc_counts[rows, :n_terms].sum(axis=0)
+        scores = self._scores(method, rows, contrast_rows)
+
+        candidates = np.flatnonzero((documents >= self.min_df) & (counts > 0))
+        if candidates.size == 0:
+            return pd.DataFrame(columns=columns)
+
+        # Partial selection: only the top_n candidates are fully sorted
+        k = min(top_n, candidates.size)
+        best = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        best = best[np.argsort(-scores[best], kind='stable')]
+
+        return pd.DataFrame({
+            'keyword': [self.terms[i] for i in best],
+            'score': np.round(scores[best], 3),
+            'count': counts[best],
+            'documents': documents[best]
+        }, columns=columns)
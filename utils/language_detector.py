@@ -0,0 +1,151 @@
+import bisect
+import re
+from collections import Counter
+import nltk
+from nltk.corpus import stopwords
+
+# Letter ranges of the scripts we distinguish; anything else is counted as 'Other'
+_SCRIPT_RANGES = [
+    (0x0041, 0x024F, 'Latin'),
+    (0x0370, 0x03FF, 'Greek'),
+    (0x0400, 0x052F, 'Cyrillic'),
+    (0x0590, 0x05FF, 'Hebrew'),
+    (0x0600, 0x06FF, 'Arabic'),
+    (0x0900, 0x097F, 'Devanagari'),
+    (0x0E00, 0x0E7F, 'Thai'),
+    (0x1E00, 0x1EFF, 'Latin'),
+    (0x3040, 0x309F, 'Hiragana'),
+    (0x30A0, 0x30FF, 'Katakana'),
+    (0x4E00, 0x9FFF, 'Han'),
+    (0xAC00, 0xD7AF, 'Hangul'),
+]
+_SCRIPT_STARTS = [start for start, _, _ in _SCRIPT_RANGES]
+
+# Non-Latin scripts are mapped to the most common language written in them
+_SCRIPT_LANGUAGES = {
+    'Greek': 'el',
+    'Cyrillic': 'ru',
+    'Hebrew': 'he',
+    'Arabic': 'ar',
+    'Devanagari': 'hi',
+    'Thai': 'th',
+    'Hiragana': 'ja',
+    'Katakana': 'ja',
+    'Han': 'zh',
+    'Hangul': 'ko',
+}
+
+# NLTK stopword lists used to tell Latin-script languages apart, in tie-break order
+DEFAULT_LANGUAGES = {
+    'english': 'en',
+    'dutch': 'nl',
+    'german': 'de',
+    'french': 'fr',
+    'italian': 'it',
+    'spanish': 'es',
+    'portuguese': 'pt',
+}
+
+UNKNOWN_LANGUAGE = 'und'
+
+_WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+
+class LanguageDetector:
+    def __init__(self, languages=None, default_latin='en', min_hits=1):
+        """
+        Lightweight local language identification.
+
+        The dominant script of a text decides its language for non-Latin scripts.
+        Latin-script texts are scored by how many of their words appear in each
+        language's NLTK stopword list. This needs no extra model or download beyond
+        the stopword corpus and is cheap enough to run on every row.
+
+        Args:
+            languages (dict): Mapping of NLTK stopword list name to language code
+            default_latin (str): Code for Latin-script texts without stopword evidence
+                (e.g. "thanks!"); None marks them as unknown
+            min_hits (int): Stopword matches needed to assign a Latin-script language
+        """
+        self.languages = dict(languages or DEFAULT_LANGUAGES)
+        self.default_latin = default_latin or UNKNOWN_LANGUAGE
+        self.min_hits = min_hits
+
+        try:
+            nltk.data.find('corpora/stopwords')
+        except LookupError:
+            nltk.download('stopwords', quiet=True)
+
+        # Word -> languages whose stopword list contains it
+        self._stopword_languages = {}
+        for name, code in self.languages.items():
+            for word in stopwords.words(name):
+                self._stopword_languages.setdefault(word, []).append(code)
+        self._priority = {code: i for i, code in enumerate(self.languages.values())}
+
+    def _script(self, char):
+        index = bisect.bisect_right(_SCRIPT_STARTS, ord(char)) - 1
+        if index >= 0:
+            start, end, script = _SCRIPT_RANGES[index]
+            if start <= ord(char) <= end:
+                return script
+        return 'Other'
+
+    def dominant_script(self, text):
+        """
+        Get the script most of a text's letters are written in.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            str: Script name, or None if the text has no letters
+        """
+        scripts = Counter(self._script(char) for char in text if char.isalpha())
+        if not scripts:
+            return None
+
+        # Japanese mixes kana with Han characters
+        if scripts['Han'] and (scripts['Hiragana'] or scripts['Katakana']):
+            return 'Hiragana'
+        return scripts.most_common(1)[0][0]
+
+    def detect(self, text):
+        """
+        Detect the language of a text.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            str: ISO 639-1 language code, or 'und' if it cannot be determined
+        """
+        if not isinstance(text, str):
+            return UNKNOWN_LANGUAGE
+
+        script = self.dominant_script(text)
+        if script is None or script == 'Other':
+            return UNKNOWN_LANGUAGE
+        if script != 'Latin':
+            return _SCRIPT_LANGUAGES[script]
+
+        hits = Counter()
+        for word in _WORD_PATTERN.findall(text.lower()):
+            hits.update(self._stopword_languages.get(word, ()))
+        if not hits:
+            return self.default_latin
+
+        code, count = max(hits.items(), key=lambda item: (item[1], -self._priority[item[0]]))
+        return code if count >= self.min_hits else self.default_latin
+
+    def detect_many(self, texts):
+        """
+        Detect the language of several texts.
+
+        Args:
+            texts (iterable): Input texts
+
+        Returns:
+            list: Language codes in input order
+        """
+        return [self.detect(text) for text in texts]
@@ -0,0 +1,222 @@
+import re
+import numpy as np
+import pandas as pd
+from textblob import TextBlob
+from .sentiment_labels import SENTIMENT_LABELS
+
+# Short replies TextBlob's lexicon does not score
+PHRASE_POLARITY = {
+    'thanks': 0.8,
+    'thank you': 0.8,
+    'thx': 0.8,
+    'ty': 0.8,
+    'ok': 0.0,
+    'meh': -0.3,
+}
+
+EMOJI_POLARITY = {
+    '😍': 1.0, '🥰': 1.0, '❤️': 0.9, '❤': 0.9, '💯': 0.9, '😀': 0.8, '😁': 0.8,
+    '😃': 0.8, '😊': 0.8, '🙂': 0.6, '👍': 0.8, '👌': 0.7, '🙏': 0.7, '🎉': 0.8,
+    '😡': -1.0, '🤬': -1.0, '😠': -0.9, '👎': -0.8, '💩': -0.9, '😞': -0.7,
+    '😢': -0.7, '😭': -0.8, '🙁': -0.6, '😒': -0.6,
+}
+
+# Words that flip or qualify sentiment in ways a bag-of-words lexicon gets wrong
+HEDGE_WORDS = {
+    'not', 'no', 'never', 'nothing', 'nobody', 'neither', 'nor', 'but', 'however',
+    'although', 'though', 'except', 'unless', 'yet', 'if', 'would', 'could', 'should'
+}
+
+STAR = '⭐'
+
+_WORD_PATTERN = re.compile(r"[a-z']+")
+
+
+class LexiconPreFilter:
+    tier_name = 'lexicon'
+
+    def __init__(self, threshold=0.6, max_words=12):
+        """
+        Cheap first tier that labels obviously positive or negative rows without BERT.
+
+        Short texts are scored from star emoji, a small emoji and phrase lexicon and
+        TextBlob's polarity. A row is only labelled when the score is at least
+        ``threshold`` and the text has no negation or contrast words; everything else
+        is left for the model. Neutral is never assigned by this tier.
+
+        The confidence of a lexicon label is the absolute polarity in [0, 1], not a
+        model probability; pipeline output marks these rows with ``sentiment_tier``.
+
+        Args:
+            threshold (float): Minimum lexicon confidence for a row to skip the model
+            max_words (int): Longer texts always go to the model
+        """
+        self.threshold = threshold
+        self.max_words = max_words
+
+    def polarity(self, text):
+        """
+        Score a text with the lexicons.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            tuple: (label, confidence), or None if the text is out of scope for this tier
+        """
+        if pd.isna(text) or not isinstance(text, str) or not text.strip():
+            return None
+
+        # "⭐⭐⭐⭐" reads as a rating, not as generic positivity: 1 and 5 stars score
+        # a polarity of 1, 2 and 4 stars 0.5, and 3 stars are left to the model
+        stars = text.count(STAR)
+        if 1 <= stars <= len(SENTIMENT_LABELS) and not text.replace(STAR, '').strip(' !.'):
+            polarity = (stars - 3) / 2
+            if polarity == 0:
+                return None
+            return SENTIMENT_LABELS[stars - 1], abs(polarity)
+
+        words = _WORD_PATTERN.findall(text.lower())
+        if len(words) > self.max_words or HEDGE_WORDS.intersection(words):
+            return None
+
+        scores = [score for emoji, score in EMOJI_POLARITY.items() if emoji in text]
+        phrase = ' '.join(words)
+        if phrase in PHRASE_POLARITY:
+            scores.append(PHRASE_POLARITY[phrase])
+        elif words:
+            blob_polarity = TextBlob(text).sentiment.polarity
+            if blob_polarity:
+                scores.append(blob_polarity)
+
+        # Mixed signals are left to the model
+        if not scores or (max(scores) > 0 and min(scores) < 0):
+            return None
+
+        score = sum(scores) / len(scores)
+        if score >= 0.75:
+            label = "Very Positive"
+        elif score > 0:
+            label = "Positive"
+        elif score <= -0.75:
+            label = "Very Negative"
+        elif score < 0:
+            label = "Negative"
+        else:
+            return None
+
+        return label, round(min(abs(score), 1.0), 3)
+
+    def score(self, text, threshold=None):
+        """
+        Label a text if the lexicon is confident enough.
+
+        Args:
+            text (str): Input text
+            threshold (float): Override for the instance threshold
+
+        Returns:
+            tuple: (label, confidence), or None if the row should go to the model
+        """
+        threshold = self.threshold if threshold is None else threshold
+        result = self.polarity(text)
+        if result is None or result[1] < threshold:
+            return None
+        return result
+
+    def score_many(self, texts, threshold=None):
+        """
+        Label several texts.
+
+        Args:
+            texts (iterable): Input texts
+            threshold (float): Override for the instance threshold
+
+        Returns:
+            list: (label, confidence) or None per text, in input order
+        """
+        return [self.score(text, threshold) for text in texts]
+
+    def agreement_report(self, texts, sentiment_analyzer=None, model_results=None,
+                         thresholds=(0.5, 0.6, 0.7, 0.8, 0.9)):
+        """
+        Compare lexicon labels with a BERT-only run to choose a threshold.
+
+        Args:
+            texts (list): Sample of texts
+            sentiment_analyzer (SentimentAnalyzer): Analyzer for the reference run
+            model_results (list): Precomputed (label, confidence) per text, instead of
+                running ``sentiment_analyzer``
+            thresholds (tuple): Thresholds to evaluate
+
+        Returns:
+            dict: Per-threshold coverage and agreement with the model
+        """
+        texts = list(texts)
+        if model_results is None:
+            model_results = sentiment_analyzer.analyze_batch(texts, show_progress=False)
+
+        lexicon_results = [self.polarity(text) for text in texts]
+        star = {label: i for i, label in enumerate(SENTIMENT_LABELS)}
+
+        scenarios = []
+        for threshold in thresholds:
+            pairs = [
+                (lexicon[0], model[0])
+                for lexicon, model in zip(lexicon_results, model_results)
+                if lexicon is not None and lexicon[1] >= threshold
+            ]
+            labelled = len(pairs)
+            scenarios.append({
+                'threshold': threshold,
+                'rows_labelled': labelled,
+                'coverage': round(labelled / len(texts), 4) if texts else 0.0,
+                'exact_agreement': round(sum(a == b for a, b in pairs) / labelled, 4) if labelled else None,
+                'within_one_star': round(sum(abs(star[a] - star[b]) <= 1 for a, b in pairs) / labelled, 4) if labelled else None,
+                'same_polarity': round(sum(np.sign(star[a] - 2) == np.sign(star[b] - 2) for a, b in pairs) / labelled, 4) if labelled else None
+            })
+
+        return {'rows': len(texts), 'scenarios': scenarios}
+
+    def format_agreement_report(self, report):
+        """
+        Render an agreement report as human-readable text.
+
+        Args:
+            report (dict): Output of ``agreement_report``
+
+        Returns:
+            str: Formatted report
+        """
+        def pct(value):
+            return f"{value*100:>6.1f}%" if value is not None else "    n/a"
+
+        lines = [
+            "Lexicon pre-filter agreement with BERT",
+            f"  Rows sampled: {report['rows']}",
+            "",
+            "  Threshold | Skips model | Exact | Within 1 star | Same polarity"
+        ]
+        for scenario in report['scenarios']:
+            lines.append(
+                f"  {scenario['threshold']:>9} | {pct(scenario['coverage']):>11} | {pct(scenario['exact_agreement'])} | "
+                f"{pct(scenario['within_one_star']):>13} | {pct(scenario['same_polarity']):>13}"
+            )
+
+        return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import sys
+    from sentiment_analyzer_2 import SentimentAnalyzer
+
+    if len(sys.argv) < 3:
+        print("Usage: python -m utils.lexicon_prefilter <file.csv> <text_column> [sample_size]")
+        sys.exit(1)
+
+    sample_size = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    sample = pd.read_csv(sys.argv[1], usecols=[sys.argv[2]], nrows=sample_size)[sys.argv[2]].tolist()
+
+    prefilter = LexiconPreFilter()
+    report = prefilter.agreement_report(sample, SentimentAnalyzer(warmup=False))
+    print(prefilter.format_agreement_report(report))
@@ -0,0 +1,208 @@
+import math
+import threading
+import time
+import numpy as np
+from .sentiment_labels import SENTIMENT_LABELS
+
+
+class LatencySketch:
+    def __init__(self, relative_accuracy=0.01, min_value=1e-5, max_value=1e3):
+        """
+        Fixed-size streaming quantile sketch for positive values such as latencies.
+
+        Values are counted in logarithmically spaced bins, so every quantile is within
+        ``relative_accuracy`` of an observed value regardless of how many values were
+        added. Values outside [min_value, max_value] are clamped to the end bins.
+        Sketches with the same parameters share bin edges, so their count arrays can
+        simply be added.
+
+        Args:
+            relative_accuracy (float): Relative error of reported quantiles
+            min_value (float): Smallest distinguishable value
+            max_value (float): Largest distinguishable value
+        """
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.n_bins = int(math.ceil(math.log(max_value / min_value) / self.log_gamma)) + 1
+        self.counts = np.zeros(self.n_bins, dtype=np.int64)
+
+    def bins(self, values):
+        """
+        Bin index of each value.
+
+        Args:
+            values (array-like): Positive values
+
+        Returns:
+            np.ndarray: Bin indices in [0, n_bins)
+        """
+        values = np.maximum(np.asarray(values, dtype=np.float64), self.min_value)
+        bins = np.ceil(np.log(values / self.min_value) / self.log_gamma).astype(np.int64)
+        return np.clip(bins, 0, self.n_bins - 1)
+
+    def add(self, values):
+        """Add one value or an array of values."""
+        np.add.at(self.counts, self.bins(np.atleast_1d(values)), 1)
+
+    def quantiles(self, qs, counts=None):
+        """
+        Estimate quantiles.
+
+        Args:
+            qs (list): Quantiles in [0, 1]
+            counts (np.ndarray): Bin counts to use instead of the sketch's own, e.g. the
+                sum of several sketches
+
+        Returns:
+            list: Estimated value per quantile, or None per quantile if the sketch is empty
+        """
+        counts = self.counts if counts is None else counts
+        total = counts.sum()
+        if total == 0:
+            return [None] * len(qs)
+
+        cumulative = np.cumsum(counts)
+        bins = np.searchsorted(cumulative, [math.floor(q * (total - 1)) + 1 for q in qs])
+        # Value with the same relative error to both edges of its bin
+        return [2 * self.min_value * self.gamma ** b / (self.gamma + 1) if b else self.min_value
+                for b in np.minimum(bins, self.n_bins - 1).tolist()]
+
+
+class RollingMonitor:
+    SOURCES = ('batch', 'interactive', 'prefilter')
+
+    def __init__(self, window_seconds=300, bucket_seconds=10, low_threshold=0.5, relative_accuracy=0.01):
+        """
+        Rolling model and throughput metrics in fixed memory.
+
+        Time is divided into buckets of ``bucket_seconds`` held in a ring buffer that
+        covers ``window_seconds``. Each bucket keeps per-label prediction counts,
+        confidence sums, low-confidence counts, row counts and a latency sketch per
+        source, and is cleared when the ring wraps around to it. A snapshot adds up
+        the buckets inside the window, so its cost does not depend on how many rows
+        were scored. Rows labelled without the model, by the lexicon tier or the
+        duplicate cache, are recorded under the 'prefilter' source, so enabling a
+        prefilter does not show up as a shift in distribution or throughput.
+
+        Args:
+            window_seconds (float): Length of the rolling window
+            bucket_seconds (float): Time resolution of the window
+            low_threshold (float): Confidence below which a prediction counts as low,
+                as in SentimentSummary
+            relative_accuracy (float): Relative error of latency quantiles
+        """
+        self.bucket_seconds = bucket_seconds
+        self.n_buckets = max(int(math.ceil(window_seconds / bucket_seconds)), 1)
+        self.window_seconds = self.n_buckets * bucket_seconds
+        self.low_threshold = low_threshold
+        self.sketch = LatencySketch(relative_accuracy)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all metrics, e.g. after warm-up."""
+        n_labels = len(SENTIMENT_LABELS)
+        n_sources = len(self.SOURCES)
+        with self._lock:
+            self.started_at = time.time()
+            self.bucket_ids = np.full(self.n_buckets, -1, dtype=np.int64)
+            self.label_counts = np.zeros((self.n_buckets, n_labels), dtype=np.int64)
+            self.confidence_sums = np.zeros(self.n_buckets, dtype=np.float64)
+            self.low_counts = np.zeros(self.n_buckets, dtype=np.int64)
+            self.rows = np.zeros((self.n_buckets, n_sources), dtype=np.int64)
+            self.calls = np.zeros((self.n_buckets, n_sources), dtype=np.int64)
+            self.latency_counts = np.zeros((self.n_buckets, n_sources, self.sketch.n_bins), dtype=np.int64)
+            self.total_rows = 0
+
+    def _slot(self, now):
+        """Ring buffer slot of the current bucket, cleared if it holds an older bucket."""
+        bucket_id = int(now // self.bucket_seconds)
+        slot = bucket_id % self.n_buckets
+        if self.bucket_ids[slot] != bucket_id:
+            self.bucket_ids[slot] = bucket_id
+            self.label_counts[slot] = 0
+            self.confidence_sums[slot] = 0.0
+            self.low_counts[slot] = 0
+            self.rows[slot] = 0
+            self.calls[slot] = 0
+            self.latency_counts[slot] = 0
+        return slot
+
+    def record(self, stars, confidences, seconds, source='batch'):
+        """
+        Record one model call, or one chunk of prefiltered rows.
+
+        Args:
+            stars (array-like): Star rating 1-5 of each prediction
+            confidences (array-like): Confidence of each prediction
+            seconds (float): Wall time of the call
+            source (str): 'batch', 'interactive' or 'prefilter'
+        """
+        stars = np.atleast_1d(np.asarray(stars, dtype=np.int64))
+        confidences = np.atleast_1d(np.asarray(confidences, dtype=np.float64))
+        source_index = self.SOURCES.index(source)
+        label_counts = np.bincount(stars - 1, minlength=len(SENTIMENT_LABELS))
+        latency_bin = self.sketch.bins([seconds])[0]
+
+        with self._lock:
+            slot = self._slot(time.time())
+            self.label_counts[slot] += label_counts
+            self.confidence_sums[slot] += confidences.sum()
+            self.low_counts[slot] += int((confidences < self.low_threshold).sum())
+            self.rows[slot, source_index] += len(stars)
+            self.calls[slot, source_index] += 1
+            self.latency_counts[slot, source_index, latency_bin] += 1
+            self.total_rows += len(stars)
+
+    def snapshot(self):
+        """
+        Metrics over the rolling window.
+
+        Returns:
+            dict: JSON-serializable metrics: row counts and rows per second, sentiment
+                distribution, mean confidence, low-confidence rate (all over every
+                source) and p50/p90/p99 latency in milliseconds per source
+        """
+        now = time.time()
+        with self._lock:
+            current = int(now // self.bucket_seconds)
+            in_window = (self.bucket_ids >= 0) & (self.bucket_ids > current - self.n_buckets)
+            label_counts = self.label_counts[in_window].sum(axis=0)
+            confidence_sum = float(self.confidence_sums[in_window].sum())
+            low_count = int(self.low_counts[in_window].sum())
+            rows = self.rows[in_window].sum(axis=0)
+            calls = self.calls[in_window].sum(axis=0)
+            latency_counts = self.latency_counts[in_window].sum(axis=0)
+            total_rows = self.total_rows
+            started_at = self.started_at
+
+        # The window is shorter than configured until the service has run that long
+        covered = max(min(self.window_seconds, now - started_at), 1e-9)
+        predictions = int(label_counts.sum())
+
+        latency = {}
+        for i, source in enumerate(self.SOURCES):
+            p50, p90, p99 = self.sketch.quantiles([0.5, 0.9, 0.99], latency_counts[i])
+            latency[source] = {
+                'calls': int(calls[i]),
+                'rows': int(rows[i]),
+                'p50_ms': round(p50 * 1000, 2) if p50 is not None else None,
+                'p90_ms': round(p90 * 1000, 2) if p90 is not None else None,
+                'p99_ms': round(p99 * 1000, 2) if p99 is not None else None
+            }
+
+        return {
+            'window_seconds': round(covered, 1),
+            'rows': predictions,
+            'rows_per_second': round(predictions / covered, 2),
+            'sentiment_distribution': {
+                label: round(int(count) / predictions, 4) if predictions else 0.0
+                for label, count in zip(SENTIMENT_LABELS, label_counts)
+            },
+            'mean_confidence': round(confidence_sum / predictions, 3) if predictions else None,
+            'low_confidence_rate': round(low_count / predictions, 4) if predictions else None,
+            'latency': latency,
+            'total_rows': int(total_rows),
+            'uptime_seconds': round(now - started_at, 1)
+        }
@@ -0,0 +1,163 @@
+import numpy as np
+
+
+class PaddingProfiler:
+    def __init__(self, max_length=512):
+        """
+        Collect per-batch padding and truncation statistics.
+
+        Args:
+            max_length (int): Tokenizer truncation limit used by the analyzer
+        """
+        self.max_length = max_length
+        self.batches = []
+        self._lengths = []
+
+    def record_batch(self, lengths, padded_length, elapsed, computed_tokens=None, original_lengths=None):
+        """
+        Record statistics for one processed batch.
+
+        Args:
+            lengths (list): Real (post-truncation) token count of every text in the batch
+            padded_length (int): Sequence length of the padded batch tensor
+            elapsed (float): Wall-clock seconds spent on the batch
+            computed_tokens (int): Tokens actually fed to the model, if the batch was
+                not run as one padded tensor (defaults to the padded size)
+            original_lengths (list): Token count of every text before truncation; texts
+                longer than ``max_length`` count as truncated (defaults to ``lengths``,
+                so no text counts as truncated)
+        """
+        lengths = np.asarray(lengths, dtype=np.int64)
+        if lengths.size == 0:
+            return
+
+        real_tokens = int(lengths.sum())
+        padded_tokens = int(lengths.size * padded_length)
+        if computed_tokens is None:
+            computed_tokens = padded_tokens
+        if original_lengths is None:
+            original_lengths = lengths
+
+        self.batches.append({
+            'batch_size': int(lengths.size),
+            'real_tokens': real_tokens,
+            'padded_tokens': padded_tokens,
+            'padded_length': int(padded_length),
+            'computed_tokens': int(computed_tokens),
+            'truncated': int((np.asarray(original_lengths) > self.max_length).sum()),
+            'elapsed': float(elapsed)
+        })
+        self._lengths.append(lengths)
+
+    @property
+    def lengths(self):
+        """All recorded sequence lengths as a single array."""
+        if not self._lengths:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(self._lengths)
+
+    def _simulate(self, lengths, batch_size, bucketing):
+        """Padded token count when ``lengths`` are batched with the given setting."""
+        if bucketing:
+            lengths = np.sort(lengths)
+
+        padded = 0
+        for i in range(0, lengths.size, batch_size):
+            batch = lengths[i:i+batch_size]
+            padded += int(batch.size * batch.max())
+
+        return padded
+
+    def get_report(self, batch_sizes=(8, 16, 32, 64, 128)):
+        """
+        Summarize the run and estimate throughput for alternative settings.
+
+        Throughput estimates assume compute time scales with the number of tokens
+        fed to the model, using the tokens-per-second rate measured during the run.
+
+        Args:
+            batch_sizes (tuple): Batch sizes to simulate
+
+        Returns:
+            dict: Padding efficiency report
+        """
+        if not self.batches:
+            return {}
+
+        lengths = self.lengths
+        real_tokens = sum(b['real_tokens'] for b in self.batches)
+        padded_tokens = sum(b['padded_tokens'] for b in self.batches)
+        computed_tokens = sum(b['computed_tokens'] for b in self.batches)
+        total_time = sum(b['elapsed'] for b in self.batches)
+        tokens_per_second = computed_tokens / total_time if total_time > 0 else 0.0
+
+        scenarios = []
+        for batch_size in batch_sizes:
+            for bucketing in (False, True):
+                simulated = self._simulate(lengths, batch_size, bucketing)
+                estimated_time = simulated / tokens_per_second if tokens_per_second else None
+                scenarios.append({
+                    'batch_size': batch_size,
+                    'length_bucketing': bucketing,
+                    'padded_tokens': simulated,
+                    'padding_ratio': round(1 - real_tokens / simulated, 4) if simulated else 0.0,
+                    'estimated_seconds': round(estimated_time, 3) if estimated_time is not None else None,
+                    'estimated_rows_per_second': round(lengths.size / estimated_time, 1) if estimated_time else None
+                })
+
+        scenarios.sort(key=lambda s: s['padded_tokens'])
+
+        return {
+            'batches': len(self.batches),
+            'rows': int(lengths.size),
+            'real_tokens': real_tokens,
+            'padded_tokens': padded_tokens,
+            'padding_ratio': round(1 - real_tokens / padded_tokens, 4) if padded_tokens else 0.0,
+            'computed_tokens': computed_tokens,
+            'computed_padding_ratio': round(1 - real_tokens / computed_tokens, 4) if computed_tokens else 0.0,
+            'truncated_rows': sum(b['truncated'] for b in self.batches),
+            'elapsed_seconds': round(total_time, 3),
+            'rows_per_second': round(lengths.size / total_time, 1) if total_time > 0 else None,
+            'length_percentiles': {
+                f'p{q}': int(np.percentile(lengths, q)) for q in (50, 90, 99)
+            },
+            'length_max': int(lengths.max()),
+            'scenarios': scenarios
+        }
+
+    def format_report(self, batch_sizes=(8, 16, 32, 64, 128)):
+        """
+        Render the report as human-readable text.
+
+        Args:
+            batch_sizes (tuple): Batch sizes to simulate
+
+        Returns:
+            str: Formatted report
+        """
+        report = self.get_report(batch_sizes)
+        if not report:
+            return "No batches recorded."
+
+        lines = [
+            "Padding efficiency report",
+            f"  Rows: {report['rows']} in {report['batches']} batches",
+            f"  Real tokens: {report['real_tokens']}  Padded tokens: {report['padded_tokens']}  "
+            f"Computed tokens: {report['computed_tokens']}",
+            f"  Compute spent on padding: {report['computed_padding_ratio']*100:.1f}%",
+            f"  Truncated rows (> {self.max_length} tokens): {report['truncated_rows']}",
+            f"  Sequence length p50/p90/p99/max: "
+            f"{report['length_percentiles']['p50']}/{report['length_percentiles']['p90']}/"
+            f"{report['length_percentiles']['p99']}/{report['length_max']}",
+            f"  Measured throughput: {report['rows_per_second']} rows/s",
+            "",
+            "  Batch size | Bucketing | Padding | Est. rows/s"
+        ]
+
+        for scenario in report['scenarios']:
+            lines.append(
+                f"  {scenario['batch_size']:>10} | {'yes' if scenario['length_bucketing'] else 'no':>9} | "
+                f"{scenario['padding_ratio']*100:>6.1f}% | {scenario['estimated_rows_per_second']}"
+            )
+
+        return '\n'.join(lines)
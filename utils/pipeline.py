@@ -0,0 +1,358 @@
+import gzip
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+from .ingestion import iter_chunks
+from .pretokenizer import BatchPreTokenizer
+from .sentiment_summary import SentimentSummary
+from .sentiment_labels import SentimentLabel, stars_to_categorical, sentiment_codes
+
+_DONE = object()
+
+
+class PipelineCancelled(Exception):
+    """Raised inside a stage when another stage has failed."""
+
+
+class SentimentPipeline:
+    def __init__(self, sentiment_analyzer, text_preprocessor=None, apply_preprocessing=True,
+                 chunk_size=1000, queue_size=4, sort_by_length=True, language_detector=None,
+                 prefilter=None, collect_embeddings=False):
+        """
+        Staged CSV pipeline: read -> preprocess -> tokenize -> infer -> write.
+
+        Reader, preprocessor, tokenizer and model each run on their own thread and the
+        writer runs on the calling thread. Stages are connected by bounded queues, so
+        a slow stage applies backpressure instead of letting chunks pile up in memory.
+        Python preprocessing, Rust tokenization and the torch forward pass overlap, so
+        total time approaches the slowest stage.
+
+        Args:
+            sentiment_analyzer (SentimentAnalyzer): Analyzer providing tokenizer and model
+            text_preprocessor (TextPreprocessor): Preprocessor, required if apply_preprocessing
+            apply_preprocessing (bool): Whether to clean text before analysis
+            chunk_size (int): Rows read and passed between stages at a time
+            queue_size (int): Maximum number of chunks waiting between two stages
+            sort_by_length (bool): Bucket texts of similar token length within a chunk
+            language_detector (LanguageDetector): If given, rows get a ``detected_language``
+                column, are cleaned with their language's preprocessing profile and are
+                batched together with rows of the same language (optional)
+            prefilter (LexiconPreFilter): Cheap first tier; rows it labels confidently skip
+                tokenization and the model, and a ``sentiment_tier`` column records
+                which tier labelled each row. Confidences of prefiltered rows are the
+                tier's own score (absolute lexicon polarity), not model probabilities.
+                A DuplicateResultCache works the same way for texts clustered in
+                earlier runs, and a list of tiers is tried in order (optional)
+            collect_embeddings (bool): Keep the sentence embeddings of the model's forward
+                pass; after a run with ``collect``, ``embeddings`` holds a float16 array
+                aligned with the returned rows (zero rows for rows the model skipped)
+
+        After a run, ``summary`` holds a SentimentSummary accumulated chunk by chunk,
+        so statistics are available even when results are not collected.
+        """
+        self.sentiment_analyzer = sentiment_analyzer
+        self.text_preprocessor = text_preprocessor
+        self.apply_preprocessing = apply_preprocessing
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.language_detector = language_detector
+        self.prefilter = prefilter
+        if prefilter is None:
+            self.prefilters = []
+        elif isinstance(prefilter, (list, tuple)):
+            self.prefilters = list(prefilter)
+        else:
+            self.prefilters = [prefilter]
+        self.collect_embeddings = collect_embeddings
+        self.pretokenizer = BatchPreTokenizer(
+            sentiment_analyzer.tokenizer,
+            batch_size=sentiment_analyzer.batch_size,
+            max_length=512,
+            sort_by_length=sort_by_length,
+            background=False,
+            lock=sentiment_analyzer.tokenizer_lock
+        )
+        self.summary = None
+        self.embeddings = None
+
+    def run(self, input_path, text_column, output_path=None, progress_callback=None, collect=True,
+            result_store=None, collect_columns=None):
+        """
+        Run the pipeline over an input file.
+
+        Args:
+            input_path (str): Path of the input file: CSV (optionally .gz or .zst
+                compressed), XLSX or JSON Lines
+            text_column (str): Name of the column containing text
+            output_path (str): CSV file results are appended to as chunks complete, gzip-compressed
+                if it ends in .gz (optional)
+            progress_callback (callable): Called with the number of rows written so far
+            collect (bool): Whether to return the results as a DataFrame
+            result_store (MemmapResultStore): Store receiving each row's star and
+                confidence, keyed by the chunk index, i.e. the input row number (optional)
+            collect_columns (list): Input columns kept in the returned DataFrame, while
+                the output file keeps every input column (optional, defaults to all)
+
+        Returns:
+            pd.DataFrame: Annotated rows if ``collect`` is True, otherwise None
+        """
+        reader = iter_chunks(input_path, chunk_size=self.chunk_size)
+        return self.run_chunks(reader, text_column, output_path, progress_callback, collect, result_store,
+                               collect_columns)
+
+    def run_chunks(self, chunks, text_column, output_path=None, progress_callback=None, collect=True,
+                   result_store=None, collect_columns=None):
+        """
+        Run the pipeline over an iterable of DataFrame chunks.
+
+        Args:
+            chunks (iterable): DataFrame chunks, e.g. from ``ingestion.iter_chunks``
+            text_column (str): Name of the column containing text
+            output_path (str): CSV file results are appended to as chunks complete, gzip-compressed
+                if it ends in .gz (optional)
+            progress_callback (callable): Called with the number of rows written so far
+            collect (bool): Whether to return the results as a DataFrame
+            result_store (MemmapResultStore): Store receiving each row's star and
+                confidence, keyed by the chunk index, i.e. the input row number (optional)
+            collect_columns (list): Input columns kept in the returned DataFrame; columns
+                added by the pipeline are always kept (optional, defaults to all)
+
+        Returns:
+            pd.DataFrame: Annotated rows if ``collect`` is True, otherwise None
+        """
+        analysis_column = f'{text_column}_cleaned' if self.apply_preprocessing else text_column
+        if collect_columns is not None:
+            collect_columns = set(collect_columns) | {
+                text_column, analysis_column, 'detected_language', 'sentiment', 'confidence', 'sentiment_tier'
+            }
+        stop = threading.Event()
+        errors = []
+
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(4)]
+        chunk_iterator = iter(chunks)
+
+        def read():
+            return next(chunk_iterator, _DONE)
+
+        stages = [
+            (read, None, queues[0]),
+            (lambda chunk: self._preprocess(chunk, text_column), queues[0], queues[1]),
+            (lambda chunk: self._tokenize(chunk, text_column, analysis_column), queues[1], queues[2]),
+            (lambda item: self._infer(*item), queues[2], queues[3])
+        ]
+        threads = [
+            threading.Thread(
+                target=self._run_stage,
+                args=(func, in_queue, out_queue, stop, errors),
+                name=f'pipeline-stage-{i}',
+                daemon=True
+            )
+            for i, (func, in_queue, out_queue) in enumerate(stages)
+        ]
+        for thread in threads:
+            thread.start()
+
+        # The writer stays on the calling thread so progress callbacks
+        # (e.g. gr.Progress) are invoked from where they were created
+        self.summary = SentimentSummary()
+        self.embeddings = None
+        results = []
+        embeddings = []
+        rows_written = 0
+        header = True
+        output = self._open_output(output_path) if output_path else None
+        try:
+            while True:
+                item = self._get(queues[3], stop)
+                if item is _DONE:
+                    break
+                chunk, chunk_embeddings = item
+
+                if output is not None:
+                    chunk.to_csv(output, header=header, index=False)
+                    output.flush()
+                    header = False
+                if collect:
+                    if collect_columns is not None:
+                        chunk = chunk[[column for column in chunk.columns if column in collect_columns]]
+                    results.append(chunk)
+                    if chunk_embeddings is not None:
+                        embeddings.append(chunk_embeddings)
+                codes = sentiment_codes(chunk['sentiment'])
+                self.summary.update_codes(codes, chunk['confidence'])
+                if result_store is not None:
+                    # CSV chunks keep the input row number as index, also for rows
+                    # that preprocessing dropped
+                    result_store.write(chunk.index.to_numpy(), codes + 1, chunk['confidence'].to_numpy())
+
+                rows_written += len(chunk)
+                if progress_callback:
+                    progress_callback(rows_written)
+        except PipelineCancelled:
+            pass
+        except Exception as e:
+            errors.append(e)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            if output is not None:
+                output.close()
+            if result_store is not None:
+                result_store.flush()
+
+        if errors:
+            raise errors[0]
+
+        if not collect:
+            return None
+        if self.collect_embeddings:
+            dim = self.sentiment_analyzer.embedding_dim
+            self.embeddings = np.concatenate(embeddings) if embeddings else np.zeros((0, dim), dtype=np.float16)
+        if not results:
+            return pd.DataFrame()
+        return pd.concat(results, ignore_index=True)
+
+    def _open_output(self, output_path):
+        """Open the result file for writing, gzip-compressed if the path ends in .gz."""
+        if output_path.endswith('.gz'):
+            return gzip.open(output_path, 'wt', encoding='utf-8', newline='')
+        return open(output_path, 'w', encoding='utf-8', newline='')
+
+    def _preprocess(self, chunk, text_column):
+        if text_column not in chunk.columns:
+            raise KeyError(f"Column '{text_column}' not found")
+        language_column = None
+        if self.language_detector is not None:
+            chunk = chunk.copy()
+            chunk['detected_language'] = self.language_detector.detect_many(chunk[text_column])
+            language_column = 'detected_language'
+        if not self.apply_preprocessing:
+            return chunk
+        return self.text_preprocessor.preprocess_dataframe(chunk, text_column, apply_preprocessing=True,
+                                                           language_column=language_column)
+
+    def _tokenize(self, chunk, text_column, analysis_column):
+        # The lexicon sees the original text, since cleaning strips emoji and punctuation
+        prefiltered = {}
+        started = time.perf_counter()
+        for prefilter in self.prefilters:
+            pending = [i for i in range(len(chunk)) if i not in prefiltered]
+            if not pending:
+                break
+            tier_name = getattr(prefilter, 'tier_name', 'lexicon')
+            for i, result in zip(pending, prefilter.score_many(chunk[text_column].iloc[pending])):
+                if result is not None:
+                    prefiltered[i] = (*result, tier_name)
+        if prefiltered:
+            # Rows answered without the model still count towards the monitored
+            # distribution and throughput
+            self.sentiment_analyzer.monitor.record(
+                [SentimentLabel.from_label(label) for label, _, _ in prefiltered.values()],
+                [confidence for _, confidence, _ in prefiltered.values()],
+                time.perf_counter() - started,
+                source='prefilter'
+            )
+
+        texts = chunk[analysis_column].astype(str).tolist()
+        valid_indices = [
+            i for i, text in enumerate(texts)
+            if i not in prefiltered and self.sentiment_analyzer.is_valid_text(text)
+        ]
+        valid_texts = [texts[i] for i in valid_indices]
+        if not valid_indices:
+            batches = []
+        elif 'detected_language' in chunk.columns:
+            batches = self._encode_by_language(valid_texts, chunk['detected_language'].iloc[valid_indices].tolist())
+        else:
+            batches = self.pretokenizer.encode_chunk(valid_texts)
+        return chunk, valid_indices, batches, prefiltered
+
+    def _encode_by_language(self, texts, languages):
+        """Encode texts so every batch holds a single language."""
+        groups = {}
+        for position, language in enumerate(languages):
+            groups.setdefault(language, []).append(position)
+
+        batches = []
+        for positions in groups.values():
+            for group_positions, encoding in self.pretokenizer.encode_chunk([texts[p] for p in positions]):
+                batches.append(([positions[p] for p in group_positions], encoding))
+        return batches
+
+    def _infer(self, chunk, valid_indices, batches, prefiltered):
+        # Labels stay int8 star ratings until the chunk gets its categorical column
+        stars = np.full(len(chunk), SentimentLabel.NEUTRAL, dtype=np.int8)
+        confidences = np.zeros(len(chunk), dtype=np.float64)
+        for i, (sentiment, confidence, _) in prefiltered.items():
+            stars[i] = SentimentLabel.from_label(sentiment)
+            confidences[i] = confidence
+
+        embeddings = None
+        if self.collect_embeddings:
+            embeddings = np.zeros((len(chunk), self.sentiment_analyzer.embedding_dim), dtype=np.float16)
+
+        valid_indices = np.asarray(valid_indices, dtype=np.int64)
+        for positions, encoding in batches:
+            rows = valid_indices[positions]
+            if self.collect_embeddings:
+                batch_stars, batch_confidences, embeddings[rows] = self.sentiment_analyzer.predict_encoded_stars(
+                    encoding, return_embeddings=True
+                )
+            else:
+                batch_stars, batch_confidences = self.sentiment_analyzer.predict_encoded_stars(encoding)
+            stars[rows] = batch_stars
+            confidences[rows] = batch_confidences
+
+        chunk = chunk.copy()
+        chunk['sentiment'] = stars_to_categorical(stars)
+        chunk['confidence'] = confidences
+        if self.prefilters:
+            tiers = ['empty'] * len(chunk)
+            for i in valid_indices:
+                tiers[i] = 'model'
+            for i, (_, _, tier_name) in prefiltered.items():
+                tiers[i] = tier_name
+            chunk['sentiment_tier'] = tiers
+        return chunk, embeddings
+
+    def _run_stage(self, func, in_queue, out_queue, stop, errors):
+        """Pull items from ``in_queue`` (or call ``func`` as a source) until done."""
+        try:
+            while not stop.is_set():
+                if in_queue is None:
+                    item = func()
+                else:
+                    item = self._get(in_queue, stop)
+                    if item is not _DONE:
+                        item = func(item)
+
+                self._put(out_queue, item, stop)
+                if item is _DONE:
+                    return
+        except PipelineCancelled:
+            pass
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+
+    def _put(self, out_queue, item, stop):
+        while True:
+            if stop.is_set():
+                raise PipelineCancelled()
+            try:
+                out_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, in_queue, stop):
+        while True:
+            if stop.is_set():
+                raise PipelineCancelled()
+            try:
+                return in_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
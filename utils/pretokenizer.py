@@ -0,0 +1,136 @@
+import queue
+import threading
+import torch
+
+_DONE = object()
+
+
+class BatchPreTokenizer:
+    def __init__(self, tokenizer, batch_size=32, max_length=512, chunk_size=None,
+                 sort_by_length=False, background=True, prefetch=2, lock=None):
+        """
+        Encode texts chunk-wise and yield padded model batches.
+
+        Each chunk of texts is encoded with a single tokenizer call. Batches are then
+        padded only to their own longest sequence, optionally after sorting the chunk
+        by token length so similar lengths share a batch.
+
+        Args:
+            tokenizer: Hugging Face tokenizer
+            batch_size (int): Number of texts per model batch
+            max_length (int): Truncation limit in tokens
+            chunk_size (int): Texts encoded per tokenizer call (defaults to 8 batches)
+            sort_by_length (bool): Bucket texts of similar length within a chunk
+            background (bool): Encode the next chunk in a background thread while the
+                caller runs the model on the current batches
+            prefetch (int): Maximum number of encoded batches waiting in the queue
+            lock (threading.Lock): Lock guarding the tokenizer if it is shared between threads
+        """
+        self.tokenizer = tokenizer
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.chunk_size = chunk_size or batch_size * 8
+        self.sort_by_length = sort_by_length
+        self.background = background
+        self.prefetch = prefetch
+        self.lock = lock or threading.Lock()
+
+    def encode_chunk(self, texts):
+        """
+        Encode a chunk of texts in one call and split it into padded batches.
+
+        Args:
+            texts (list): Texts to encode
+
+        Returns:
+            list: List of tuples (positions, encoding) where positions index into ``texts``
+        """
+        with self.lock:
+            encoded = self.tokenizer(
+                list(texts),
+                truncation=True,
+                max_length=self.max_length,
+                return_attention_mask=False,
+                return_token_type_ids=False
+            )['input_ids']
+
+        order = list(range(len(encoded)))
+        if self.sort_by_length:
+            order.sort(key=lambda i: len(encoded[i]))
+
+        batches = []
+        for start in range(0, len(order), self.batch_size):
+            positions = order[start:start+self.batch_size]
+            batches.append((positions, self._pad([encoded[i] for i in positions])))
+
+        return batches
+
+    def _pad(self, sequences):
+        """Pad token id sequences into model input tensors."""
+        padded_length = max(len(ids) for ids in sequences)
+        pad_id = self.tokenizer.pad_token_id or 0
+
+        input_ids = torch.full((len(sequences), padded_length), pad_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(sequences), padded_length), dtype=torch.long)
+        for row, ids in enumerate(sequences):
+            input_ids[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[row, :len(ids)] = 1
+
+        return {
+            'input_ids': input_ids,
+            'attention_mask': attention_mask,
+            'token_type_ids': torch.zeros_like(input_ids)
+        }
+
+    def _iter_sync(self, texts):
+        for chunk_start in range(0, len(texts), self.chunk_size):
+            chunk = texts[chunk_start:chunk_start+self.chunk_size]
+            for positions, encoding in self.encode_chunk(chunk):
+                yield [chunk_start + p for p in positions], encoding
+
+    def iter_batches(self, texts):
+        """
+        Yield padded batches for ``texts``.
+
+        Args:
+            texts (list): Texts to encode
+
+        Yields:
+            tuple: (indices into ``texts``, encoding dict of tensors)
+        """
+        if not self.background:
+            yield from self._iter_sync(texts)
+            return
+
+        batches = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for batch in self._iter_sync(texts):
+                    if stop.is_set():
+                        return
+                    batches.put(batch)
+                batches.put(_DONE)
+            except Exception as e:
+                batches.put(e)
+
+        worker = threading.Thread(target=produce, name='pretokenizer', daemon=True)
+        worker.start()
+
+        try:
+            while True:
+                item = batches.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Unblock the producer if the consumer stopped early
+            stop.set()
+            while worker.is_alive():
+                try:
+                    batches.get_nowait()
+                except queue.Empty:
+                    worker.join(timeout=0.1)
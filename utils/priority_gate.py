@@ -0,0 +1,39 @@
+import threading
+from contextlib import contextmanager
+
+
+class InferencePriorityGate:
+    def __init__(self, max_wait=2.0):
+        """
+        Let interactive requests jump ahead of batch work on a shared model.
+
+        Batch loops call ``yield_to_interactive`` between model batches and pause while
+        any interactive request is running, so single-text latency does not depend on
+        how many large files are being processed.
+
+        Args:
+            max_wait (float): Longest a batch step waits in seconds, so a steady stream
+                of interactive requests cannot starve batch jobs
+        """
+        self.max_wait = max_wait
+        self._active = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def interactive(self):
+        """Context manager marking an interactive request as running."""
+        with self._condition:
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                if self._active == 0:
+                    self._condition.notify_all()
+
+    def yield_to_interactive(self):
+        """Block while interactive requests are running (at most ``max_wait`` seconds)."""
+        with self._condition:
+            if self._active:
+                self._condition.wait_for(lambda: self._active == 0, timeout=self.max_wait)
@@ -0,0 +1,246 @@
+import struct
+import numpy as np
+from .sentiment_labels import SENTIMENT_LABELS, stars_to_categorical
+from .sentiment_summary import SentimentSummary
+
+RESULT_DTYPE = np.dtype([
+    ('row_id', '<i8'),
+    ('star', 'i1'),
+    ('confidence', '<f4'),
+])
+
+RESULT_DTYPE_WITH_PROBABILITIES = np.dtype([
+    ('row_id', '<i8'),
+    ('star', 'i1'),
+    ('confidence', '<f4'),
+    ('probabilities', '<f4', (len(SENTIMENT_LABELS),)),
+])
+
+# Bytes reserved for the .npy header, so a larger row count fits without moving the data
+HEADER_SIZE = 256
+
+
+def _write_header(f, dtype, n_rows, size=HEADER_SIZE):
+    """
+    Write a ``.npy`` version 1.0 header for a 1-D array, padded to ``size`` bytes.
+
+    Args:
+        f (file): File opened for binary writing
+        dtype (np.dtype): Record dtype
+        n_rows (int): Number of records
+        size (int): Total header size, i.e. the offset of the data
+
+    Raises:
+        ValueError: If the header does not fit in ``size`` bytes
+    """
+    prefix = np.lib.format.magic(1, 0)
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+        np.lib.format.dtype_to_descr(dtype), n_rows)
+    padding = size - len(prefix) - 2 - len(header) - 1
+    if padding < 0:
+        raise ValueError(f"A header for {n_rows} rows does not fit in {size} bytes")
+    header = (header + ' ' * padding + '\n').encode('latin1')
+    f.seek(0)
+    f.write(prefix + struct.pack('<H', len(header)) + header)
+
+
+class MemmapResultStore:
+    def __init__(self, array, path):
+        """
+        Fixed-width sentiment results in a memory-mapped ``.npy`` file.
+
+        Each record holds the source row id, the star rating (1-5, 0 while unset),
+        the confidence and optionally the 5-class probabilities, in 13 or 33 bytes
+        per row. Results are written in place as batches complete and read back
+        through views of the mapped file, so aggregations never build Python
+        objects per row. Use ``create`` or ``open`` rather than the constructor.
+
+        Args:
+            array (np.memmap): Structured array mapped from ``path``
+            path (str): Path of the ``.npy`` file
+        """
+        self.array = array
+        self.path = path
+
+    @classmethod
+    def create(cls, path, n_rows, with_probabilities=False):
+        """
+        Create a store for ``n_rows`` results.
+
+        Args:
+            path (str): Path of the ``.npy`` file to create
+            n_rows (int): Initial capacity in rows; unset rows are ignored and the store
+                grows when rows beyond it are written
+            with_probabilities (bool): Whether to keep the 5-class probabilities
+
+        Returns:
+            MemmapResultStore: Writable store
+        """
+        dtype = RESULT_DTYPE_WITH_PROBABILITIES if with_probabilities else RESULT_DTYPE
+        with open(path, 'wb') as f:
+            _write_header(f, dtype, n_rows)
+            f.truncate(HEADER_SIZE + n_rows * dtype.itemsize)
+        array = np.memmap(path, dtype=dtype, mode='r+', offset=HEADER_SIZE, shape=(n_rows,))
+        array['row_id'] = -1
+        array['confidence'] = np.nan
+        return cls(array, path)
+
+    @classmethod
+    def open(cls, path, writable=False):
+        """
+        Open an existing store.
+
+        Args:
+            path (str): Path of the ``.npy`` file
+            writable (bool): Open for writing instead of read-only
+
+        Returns:
+            MemmapResultStore: Store backed by the file
+        """
+        return cls(np.load(path, mmap_mode='r+' if writable else 'r'), path)
+
+    def __len__(self):
+        return len(self.array)
+
+    @property
+    def with_probabilities(self):
+        """Whether the store keeps 5-class probabilities."""
+        return 'probabilities' in self.array.dtype.names
+
+    @property
+    def row_ids(self):
+        """Source row id of every record (view, -1 for unset records)."""
+        return self.array['row_id']
+
+    @property
+    def stars(self):
+        """Star rating of every record (view, 0 for unset records)."""
+        return self.array['star']
+
+    @property
+    def confidences(self):
+        """Confidence of every record (view, NaN for unset records)."""
+        return self.array['confidence']
+
+    @property
+    def probabilities(self):
+        """5-class probabilities of every record (view), or None if not stored."""
+        return self.array['probabilities'] if self.with_probabilities else None
+
+    def write(self, rows, stars, confidences, probabilities=None):
+        """
+        Write results for some rows.
+
+        Args:
+            rows (array-like): Source row ids, also used as record positions; the
+                store grows if a row id is beyond its capacity
+            stars (array-like): Star ratings 1-5
+            confidences (array-like): Confidence scores
+            probabilities (array-like): Probabilities of shape (len(rows), 5) (optional)
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) and rows.max() >= len(self.array):
+            self._grow(int(rows.max()) + 1)
+        self.array['row_id'][rows] = rows
+        self.array['star'][rows] = stars
+        self.array['confidence'][rows] = confidences
+        if probabilities is not None and self.with_probabilities:
+            self.array['probabilities'][rows] = probabilities
+
+    def _grow(self, min_rows):
+        """
+        Enlarge the store to hold at least ``min_rows`` records.
+
+        The capacity at least doubles, so a store sized from a low row estimate is
+        resized a logarithmic number of times. The file is extended in place: the
+        store's mapping is released, the row count in the header is rewritten, the
+        file is lengthened and mapped again. Views taken before growing keep showing
+        the old records; on Windows a mapped file cannot be resized, so they must not
+        be held across a ``write`` that grows the store.
+
+        Args:
+            min_rows (int): Required capacity
+        """
+        dtype = self.array.dtype
+        offset = self.array.offset
+        old_rows = len(self.array)
+        n_rows = max(min_rows, 2 * old_rows)
+
+        self.array.flush()
+        self.array = None
+        with open(self.path, 'r+b') as f:
+            _write_header(f, dtype, n_rows, offset)
+            f.truncate(offset + n_rows * dtype.itemsize)
+
+        self.array = np.memmap(self.path, dtype=dtype, mode='r+', offset=offset, shape=(n_rows,))
+        self.array['row_id'][old_rows:] = -1
+        self.array['confidence'][old_rows:] = np.nan
+
+    def flush(self):
+        """Write pending changes to disk."""
+        if isinstance(self.array, np.memmap):
+            self.array.flush()
+
+    def sentiment_counts(self):
+        """
+        Count results per label without building a DataFrame.
+
+        Returns:
+            dict: Mapping of label to count, most common first
+        """
+        counts = np.bincount(self.stars, minlength=len(SENTIMENT_LABELS) + 1)[1:]
+        return dict(sorted(
+            ((label, int(count)) for label, count in zip(SENTIMENT_LABELS, counts) if count > 0),
+            key=lambda item: item[1],
+            reverse=True
+        ))
+
+    def summary(self, chunk_size=1_000_000, **kwargs):
+        """
+        Aggregate the store into a SentimentSummary.
+
+        The summary can be passed to ``SentimentAnalyzer.get_sentiment_distribution``,
+        ``get_confidence_stats`` and the VisualizationGenerator charts as ``summary=``.
+
+        Args:
+            chunk_size (int): Records aggregated at a time, bounding temporary memory
+            **kwargs: Passed to the SentimentSummary constructor
+
+        Returns:
+            SentimentSummary: Summary of all set records
+        """
+        summary = SentimentSummary(**kwargs)
+        for start in range(0, len(self.array), chunk_size):
+            chunk = self.array[start:start+chunk_size]
+            summary.update_codes(chunk['star'].astype(np.int64) - 1, chunk['confidence'])
+        return summary
+
+    def sentiment_categorical(self):
+        """
+        Sentiment labels of every record as a categorical (unset records are missing).
+
+        Returns:
+            pd.Categorical: Labels with SENTIMENT_DTYPE, backed by int8 codes
+        """
+        return stars_to_categorical(self.stars)
+
+    def join(self, df, sentiment_column='sentiment', confidence_column='confidence'):
+        """
+        Attach results to the source rows they were computed from.
+
+        Args:
+            df (pd.DataFrame): Source rows, in the order their row ids refer to
+            sentiment_column (str): Name of the sentiment column to add
+            confidence_column (str): Name of the confidence column to add
+
+        Returns:
+            pd.DataFrame: Copy of ``df`` with sentiment and confidence columns
+        """
+        if len(df) > len(self.array):
+            raise ValueError(f"Store holds {len(self.array)} rows, DataFrame has {len(df)}")
+
+        records = self.array[:len(df)]
+        result = df.copy()
+        result[sentiment_column] = stars_to_categorical(records['star'])
+        result[confidence_column] = records['confidence']
+        return result
@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+import socket
+import time
+import torch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_PATH = os.environ.get(
+    'SENTIMENT_RUNTIME_PROFILE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'sentiment_analysis', 'runtime_profile.json')
+)
+
+_SAMPLE_SENTENCES = [
+    "The delivery was fast and the product works exactly as described.",
+    "Customer support never answered my emails, very disappointing.",
+    "It is okay for the price but the battery could last longer.",
+    "Absolutely love it, would buy again without a second thought!",
+    "The packaging was damaged and two items were missing from the order."
+]
+
+
+def synthetic_texts(count=64):
+    """Build synthetic texts covering short, medium and long inputs."""
+    texts = []
+    for i in range(count):
+        repeats = (1, 3, 8)[i % 3]
+        sentence = _SAMPLE_SENTENCES[i % len(_SAMPLE_SENTENCES)]
+        texts.append(' '.join([sentence] * repeats))
+    return texts
+
+
+def _default_thread_counts():
+    """Candidate thread counts: powers of two up to the core count, plus the core count."""
+    cpu_count = os.cpu_count() or 1
+    counts = []
+    n = 1
+    while n < cpu_count:
+        counts.append(n)
+        n *= 2
+    counts.append(cpu_count)
+    return counts
+
+
+def load_runtime_profile(path=None):
+    """
+    Load a runtime profile saved by ``calibrate_runtime``.
+
+    Profiles calibrated on a host with a different core count are ignored.
+
+    Args:
+        path (str): Profile file path (defaults to DEFAULT_PROFILE_PATH)
+
+    Returns:
+        dict: Profile settings, or None if no usable profile exists
+    """
+    path = path or DEFAULT_PROFILE_PATH
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable runtime profile %s: %s", path, e)
+        return None
+
+    if profile.get('cpu_count') != os.cpu_count():
+        logger.warning("Ignoring runtime profile %s: calibrated for %s cores, this host has %s",
+                       path, profile.get('cpu_count'), os.cpu_count())
+        return None
+
+    return profile
+
+
+def save_runtime_profile(profile, path=None):
+    """
+    Save a runtime profile as JSON.
+
+    Args:
+        profile (dict): Profile settings
+        path (str): Profile file path (defaults to DEFAULT_PROFILE_PATH)
+
+    Returns:
+        str: Path the profile was written to
+    """
+    path = path or DEFAULT_PROFILE_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+
+    return path
+
+
+def apply_runtime_profile(profile):
+    """
+    Apply the torch settings of a runtime profile to the current process.
+
+    Args:
+        profile (dict): Profile settings
+    """
+    if profile and profile.get('num_threads'):
+        torch.set_num_threads(int(profile['num_threads']))
+
+
+def calibrate_runtime(analyzer, thread_counts=None, batch_sizes=(8, 16, 32, 64),
+                      sample_texts=None, repeats=2, path=None, save=True):
+    """
+    Sweep thread counts and batch sizes on this host and pick the fastest pair.
+
+    Args:
+        analyzer (SentimentAnalyzer): Loaded analyzer to benchmark
+        thread_counts (list): Thread counts to try (defaults to powers of two up to the core count)
+        batch_sizes (tuple): Batch sizes to try
+        sample_texts (list): Texts to benchmark with (defaults to synthetic samples)
+        repeats (int): Timed runs per configuration; the best run is kept
+        path (str): Where to save the profile (defaults to DEFAULT_PROFILE_PATH)
+        save (bool): Whether to write the profile to disk
+
+    Returns:
+        dict: The selected profile, including every measurement taken
+    """
+    thread_counts = thread_counts or _default_thread_counts()
+    sample_texts = sample_texts or synthetic_texts()
+    original_threads = torch.get_num_threads()
+
+    measurements = []
+    try:
+        for num_threads in thread_counts:
+            torch.set_num_threads(num_threads)
+
+            # Untimed pass so allocator and kernel setup are not measured
+            analyzer.analyze_batch(sample_texts[:max(batch_sizes)], batch_size=max(batch_sizes),
+                                   show_progress=False)
+
+            for batch_size in batch_sizes:
+                best = None
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    analyzer.analyze_batch(sample_texts, batch_size=batch_size, show_progress=False)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+
+                measurements.append({
+                    'num_threads': num_threads,
+                    'batch_size': batch_size,
+                    'rows_per_second': round(len(sample_texts) / best, 2)
+                })
+    finally:
+        torch.set_num_threads(original_threads)
+
+    fastest = max(measurements, key=lambda m: m['rows_per_second'])
+    profile = {
+        'num_threads': fastest['num_threads'],
+        'batch_size': fastest['batch_size'],
+        'rows_per_second': fastest['rows_per_second'],
+        'cpu_count': os.cpu_count(),
+        'hostname': socket.gethostname(),
+        'torch_version': torch.__version__,
+        'calibrated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'measurements': measurements
+    }
+
+    if save:
+        save_runtime_profile(profile, path)
+
+    return profile
+
+
+if __name__ == '__main__':
+    from sentiment_analyzer_2 import SentimentAnalyzer
+
+    print("Calibrating runtime profile for this host...")
+    profile = calibrate_runtime(SentimentAnalyzer(runtime_profile=False, warmup=False))
+    print(f"Selected {profile['num_threads']} threads, batch size {profile['batch_size']} "
+          f"({profile['rows_per_second']} rows/s)")
+    print(f"Saved to {DEFAULT_PROFILE_PATH}")
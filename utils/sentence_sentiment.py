@@ -0,0 +1,161 @@
+import contextlib
+import nltk
+import numpy as np
+import pandas as pd
+from nltk.tokenize import sent_tokenize
+from .pretokenizer import BatchPreTokenizer
+from .sentiment_labels import SENTIMENT_LABELS, stars_to_categorical
+
+
+class SentenceSentimentAnalyzer:
+    def __init__(self, sentiment_analyzer, max_sentence_tokens=128, language='english'):
+        """
+        Sentence-level sentiment with aggregated document scores.
+
+        Documents are split into sentences with NLTK punkt. The sentences of many
+        documents are deduplicated and scored together in length-sorted batches, so
+        short sentences share small tensors instead of every document paying for a
+        long, truncated sequence. Each document's score is the token-weighted mean of
+        its sentences' class probabilities.
+
+        Args:
+            sentiment_analyzer (SentimentAnalyzer): Analyzer providing tokenizer and model
+            max_sentence_tokens (int): Truncation limit per sentence
+            language (str): Punkt model used for splitting
+        """
+        self.sentiment_analyzer = sentiment_analyzer
+        self.language = language
+        self._download_punkt()
+        self.pretokenizer = BatchPreTokenizer(
+            sentiment_analyzer.tokenizer,
+            batch_size=sentiment_analyzer.batch_size,
+            max_length=max_sentence_tokens,
+            sort_by_length=True,
+            background=False,
+            lock=sentiment_analyzer.tokenizer_lock
+        )
+
+    def _download_punkt(self):
+        """Download punkt if not already present (newer NLTK releases use punkt_tab)."""
+        for resource, package in (('tokenizers/punkt', 'punkt'), ('tokenizers/punkt_tab', 'punkt_tab')):
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                nltk.download(package, quiet=True)
+
+    def split_sentences(self, text):
+        """
+        Split a document into sentences.
+
+        Args:
+            text (str): Input document
+
+        Returns:
+            list: Non-empty sentences, or [] for empty or missing text
+        """
+        if not self.sentiment_analyzer.is_valid_text(text):
+            return []
+        return [sentence.strip() for sentence in sent_tokenize(text, language=self.language) if sentence.strip()]
+
+    def _score_sentences(self, sentences, interactive=False):
+        """Class probabilities and token counts of unique sentences."""
+        probabilities = np.zeros((len(sentences), len(SENTIMENT_LABELS)), dtype=np.float32)
+        token_counts = np.zeros(len(sentences), dtype=np.int64)
+        source = 'interactive' if interactive else 'batch'
+        gate = self.sentiment_analyzer.priority_gate.interactive() if interactive else contextlib.nullcontext()
+        with gate:
+            for positions, encoding in self.pretokenizer.encode_chunk(sentences):
+                _, _, batch_probabilities = self.sentiment_analyzer.predict_encoded_stars(
+                    encoding, return_probabilities=True, source=source
+                )
+                probabilities[positions] = batch_probabilities
+                token_counts[positions] = encoding['attention_mask'].sum(dim=1).numpy()
+        return probabilities, token_counts
+
+    def analyze(self, texts, row_ids=None, interactive=False):
+        """
+        Score every sentence of several documents and aggregate per document.
+
+        Args:
+            texts (list): Documents
+            row_ids (list): Id of each document in the output (defaults to positions)
+            interactive (bool): Score in the interactive lane, ahead of batch work,
+                e.g. for a single text a user is waiting on
+
+        Returns:
+            tuple: (sentences DataFrame with row_id, sentence_index, sentence, sentiment
+                and confidence; documents DataFrame with row_id, sentiment, confidence,
+                star_score and sentences)
+        """
+        texts = list(texts)
+        row_ids = list(range(len(texts))) if row_ids is None else list(row_ids)
+
+        unique_sentences = {}
+        sentence_rows = []
+        for document, text in enumerate(texts):
+            for index, sentence in enumerate(self.split_sentences(text)):
+                sentence_rows.append((document, index, sentence, unique_sentences.setdefault(sentence, len(unique_sentences))))
+
+        probabilities, token_counts = self._score_sentences(list(unique_sentences), interactive) if unique_sentences else (
+            np.zeros((0, len(SENTIMENT_LABELS)), dtype=np.float32), np.zeros(0, dtype=np.int64)
+        )
+
+        unique_index = np.array([row[3] for row in sentence_rows], dtype=np.int64)
+        documents = np.array([row[0] for row in sentence_rows], dtype=np.int64)
+        sentence_probabilities = probabilities[unique_index]
+
+        sentences = pd.DataFrame({
+            'row_id': [row_ids[row[0]] for row in sentence_rows],
+            'sentence_index': [row[1] for row in sentence_rows],
+            'sentence': [row[2] for row in sentence_rows],
+            'sentiment': stars_to_categorical(sentence_probabilities.argmax(axis=1) + 1),
+            'confidence': np.round(sentence_probabilities.max(axis=1).astype(np.float64), 3)
+        }, columns=['row_id', 'sentence_index', 'sentence', 'sentiment', 'confidence'])
+
+        # Token-weighted mean of sentence probabilities per document
+        weights = token_counts[unique_index].astype(np.float64)
+        document_probabilities = np.zeros((len(texts), len(SENTIMENT_LABELS)))
+        np.add.at(document_probabilities, documents, sentence_probabilities * weights[:, None])
+        weight_sums = np.bincount(documents, weights=weights, minlength=len(texts))
+        sentence_counts = np.bincount(documents, minlength=len(texts))
+
+        has_sentences = weight_sums > 0
+        document_probabilities[has_sentences] /= weight_sums[has_sentences, None]
+
+        # Documents without sentences get the analyzers' empty-text result
+        stars = np.where(has_sentences, document_probabilities.argmax(axis=1) + 1, 3)
+        confidences = np.where(has_sentences, document_probabilities.max(axis=1), 0.0)
+        star_scores = np.where(has_sentences, document_probabilities @ np.arange(1, len(SENTIMENT_LABELS) + 1), np.nan)
+
+        documents_df = pd.DataFrame({
+            'row_id': row_ids,
+            'sentiment': stars_to_categorical(stars),
+            'confidence': np.round(confidences, 3),
+            'star_score': np.round(star_scores, 2),
+            'sentences': sentence_counts
+        })
+
+        return sentences, documents_df
+
+    def analyze_dataframe(self, df, text_column, chunk_size=500):
+        """
+        Sentence-level analysis of a DataFrame column.
+
+        Args:
+            df (pd.DataFrame): Input DataFrame
+            text_column (str): Name of the column containing text
+            chunk_size (int): Documents whose sentences are scored together
+
+        Returns:
+            tuple: (sentences DataFrame, documents DataFrame) keyed by the DataFrame index
+        """
+        sentence_parts, document_parts = [], []
+        for start in range(0, len(df), chunk_size):
+            chunk = df[text_column].iloc[start:start+chunk_size]
+            sentences, documents = self.analyze(chunk.tolist(), row_ids=chunk.index)
+            sentence_parts.append(sentences)
+            document_parts.append(documents)
+
+        if not sentence_parts:
+            return self.analyze([])
+        return pd.concat(sentence_parts, ignore_index=True), pd.concat(document_parts, ignore_index=True)
@@ -0,0 +1,94 @@
+from enum import IntEnum
+import numpy as np
+import pandas as pd
+
+SENTIMENT_LABELS = ['Very Negative', 'Negative', 'Neutral', 'Positive', 'Very Positive']
+
+# Fixed, ordered categories so every column, chart and groupby uses the same order
+SENTIMENT_DTYPE = pd.CategoricalDtype(SENTIMENT_LABELS, ordered=True)
+
+
+class SentimentLabel(IntEnum):
+    """Sentiment classes with their star rating as value."""
+
+    VERY_NEGATIVE = 1
+    NEGATIVE = 2
+    NEUTRAL = 3
+    POSITIVE = 4
+    VERY_POSITIVE = 5
+
+    @property
+    def label(self):
+        """Display name, e.g. "Very Positive"."""
+        return SENTIMENT_LABELS[self.value - 1]
+
+    @classmethod
+    def from_label(cls, label):
+        """
+        Get the member for a display name.
+
+        Args:
+            label (str): Display name, e.g. "Very Positive"
+
+        Returns:
+            SentimentLabel: Matching member
+        """
+        return cls(SENTIMENT_LABELS.index(label) + 1)
+
+
+def stars_to_categorical(stars):
+    """
+    Build a sentiment column from star ratings without creating label strings.
+
+    Args:
+        stars (array-like): Star ratings 1-5; anything else becomes missing
+
+    Returns:
+        pd.Categorical: Sentiment labels with SENTIMENT_DTYPE
+    """
+    codes = np.asarray(stars, dtype=np.int8) - 1
+    codes[(codes < 0) | (codes >= len(SENTIMENT_LABELS))] = -1
+    return pd.Categorical.from_codes(codes, dtype=SENTIMENT_DTYPE)
+
+
+def to_sentiment_categorical(values):
+    """
+    Convert sentiment labels to the compact categorical representation.
+
+    Args:
+        values (array-like): Label strings or an existing categorical
+
+    Returns:
+        pd.Categorical: Sentiment labels with SENTIMENT_DTYPE; unknown labels become missing
+    """
+    if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype) and values.dtype == SENTIMENT_DTYPE:
+        return pd.Categorical(values)
+    return pd.Categorical(np.asarray(values, dtype=object), dtype=SENTIMENT_DTYPE)
+
+
+def sentiment_codes(values):
+    """
+    Get zero-based class codes (0 = Very Negative) of sentiment labels.
+
+    Args:
+        values (array-like): Label strings or a sentiment categorical
+
+    Returns:
+        np.ndarray: int8 codes, -1 for missing or unknown labels
+    """
+    return np.asarray(to_sentiment_categorical(values).codes, dtype=np.int8)
+
+
+def sentiment_to_stars(values):
+    """
+    Get star ratings of sentiment labels.
+
+    Args:
+        values (pd.Series): Label strings or a sentiment categorical
+
+    Returns:
+        pd.Series: Star ratings as floats with the same index, NaN for unknown labels
+    """
+    codes = sentiment_codes(values).astype(np.float64)
+    codes[codes < 0] = np.nan
+    return pd.Series(codes + 1, index=getattr(values, 'index', None))
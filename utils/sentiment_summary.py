@@ -0,0 +1,267 @@
+import numpy as np
+from .sentiment_labels import SENTIMENT_LABELS, sentiment_codes
+
+
+class SentimentSummary:
+    def __init__(self, resolution=1000, high_threshold=0.8, low_threshold=0.5):
+        """
+        Aggregate of sentiment counts and confidence statistics.
+
+        Confidences are counted on a grid of ``resolution`` steps per class, which acts
+        as a fixed-size quantile sketch: quantiles are exact for confidences rounded to
+        ``1/resolution`` (the analyzers round to 3 decimals) and within one grid step
+        otherwise. The summary can be built in one pass over a DataFrame or updated
+        chunk by chunk while results stream in.
+
+        Args:
+            resolution (int): Confidence grid steps over [0, 1]
+            high_threshold (float): Confidence above which a prediction counts as high
+            low_threshold (float): Confidence below which a prediction counts as low
+        """
+        self.labels = list(SENTIMENT_LABELS)
+        self.resolution = resolution
+        self.high_threshold = high_threshold
+        self.low_threshold = low_threshold
+
+        n_labels = len(self.labels)
+        self.grid_counts = np.zeros((n_labels, resolution + 1), dtype=np.int64)
+        self.confidence_sum = np.zeros(n_labels, dtype=np.float64)
+        self.confidence_min = np.full(n_labels, np.inf)
+        self.confidence_max = np.full(n_labels, -np.inf)
+        self.high_counts = np.zeros(n_labels, dtype=np.int64)
+        self.low_counts = np.zeros(n_labels, dtype=np.int64)
+
+    @classmethod
+    def from_dataframe(cls, df, sentiment_column='sentiment', confidence_column='confidence', **kwargs):
+        """
+        Build a summary in one vectorized pass over a DataFrame.
+
+        Args:
+            df (pd.DataFrame): DataFrame with sentiment and confidence data
+            sentiment_column (str): Name of the sentiment column
+            confidence_column (str): Name of the confidence column
+            **kwargs: Passed to the constructor
+
+        Returns:
+            SentimentSummary: Summary of the DataFrame
+        """
+        summary = cls(**kwargs)
+        if sentiment_column in df.columns and confidence_column in df.columns:
+            summary.update(df[sentiment_column], df[confidence_column])
+        return summary
+
+    def update(self, sentiments, confidences):
+        """
+        Add a chunk of predictions to the summary.
+
+        Args:
+            sentiments (iterable): Sentiment labels
+            confidences (iterable): Confidence scores in [0, 1]
+
+        Returns:
+            SentimentSummary: self, for chaining
+        """
+        # Sentiment categoricals are read through their codes without touching strings
+        return self.update_codes(sentiment_codes(sentiments), confidences)
+
+    def update_codes(self, codes, confidences):
+        """
+        Add a chunk of predictions given as zero-based class codes.
+
+        Args:
+            codes (array-like): Class codes (0 = Very Negative); negative codes are skipped
+            confidences (array-like): Confidence scores in [0, 1]
+
+        Returns:
+            SentimentSummary: self, for chaining
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        confidences = np.asarray(confidences, dtype=np.float64)
+
+        # Rows with unknown labels or missing confidence are not counted
+        keep = (codes >= 0) & ~np.isnan(confidences)
+        codes, confidences = codes[keep], confidences[keep]
+        if codes.size == 0:
+            return self
+
+        n_labels = len(self.labels)
+        steps = np.clip(np.rint(confidences * self.resolution), 0, self.resolution).astype(np.int64)
+        self.grid_counts += np.bincount(
+            codes * (self.resolution + 1) + steps,
+            minlength=n_labels * (self.resolution + 1)
+        ).reshape(n_labels, self.resolution + 1)
+
+        self.confidence_sum += np.bincount(codes, weights=confidences, minlength=n_labels)
+        self.high_counts += np.bincount(codes[confidences > self.high_threshold], minlength=n_labels)
+        self.low_counts += np.bincount(codes[confidences < self.low_threshold], minlength=n_labels)
+        np.minimum.at(self.confidence_min, codes, confidences)
+        np.maximum.at(self.confidence_max, codes, confidences)
+
+        return self
+
+    def merge(self, other):
+        """
+        Combine another summary with the same settings into this one.
+
+        Args:
+            other (SentimentSummary): Summary to add
+
+        Returns:
+            SentimentSummary: self, for chaining
+        """
+        self.grid_counts += other.grid_counts
+        self.confidence_sum += other.confidence_sum
+        self.high_counts += other.high_counts
+        self.low_counts += other.low_counts
+        np.minimum(self.confidence_min, other.confidence_min, out=self.confidence_min)
+        np.maximum(self.confidence_max, other.confidence_max, out=self.confidence_max)
+        return self
+
+    @property
+    def counts(self):
+        """Number of predictions per label, in label order."""
+        return self.grid_counts.sum(axis=1)
+
+    @property
+    def total(self):
+        """Total number of predictions."""
+        return int(self.grid_counts.sum())
+
+    def label_counts(self, include_empty=False):
+        """
+        Get prediction counts per label, most common first.
+
+        Args:
+            include_empty (bool): Whether to include labels with no predictions
+
+        Returns:
+            dict: Mapping of label to count
+        """
+        counts = {label: int(count) for label, count in zip(self.labels, self.counts)
+                  if include_empty or count > 0}
+        return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+    def quantile(self, q, label=None):
+        """
+        Get a confidence quantile from the grid sketch.
+
+        Args:
+            q (float): Quantile in [0, 1]
+            label (str): Restrict to one label (optional)
+
+        Returns:
+            float: Confidence quantile, or NaN if there is no data
+        """
+        grid = self.grid_counts[self.labels.index(label)] if label else self.grid_counts.sum(axis=0)
+        total = grid.sum()
+        if total == 0:
+            return float('nan')
+
+        # Linear interpolation between order statistics, as in pandas' quantile
+        cumulative = np.cumsum(grid)
+        position = q * (total - 1)
+        lower = int(np.searchsorted(cumulative, np.floor(position), side='right'))
+        upper = int(np.searchsorted(cumulative, np.ceil(position), side='right'))
+        fraction = position - np.floor(position)
+        return (lower + (upper - lower) * fraction) / self.resolution
+
+    def mean(self, label=None):
+        """Mean confidence, overall or for one label."""
+        if label:
+            index = self.labels.index(label)
+            count = self.counts[index]
+            return float(self.confidence_sum[index] / count) if count else float('nan')
+        return float(self.confidence_sum.sum() / self.total) if self.total else float('nan')
+
+    def min(self, label=None):
+        """Minimum confidence, overall or for one label."""
+        value = self.confidence_min[self.labels.index(label)] if label else self.confidence_min.min()
+        return float(value) if np.isfinite(value) else float('nan')
+
+    def max(self, label=None):
+        """Maximum confidence, overall or for one label."""
+        value = self.confidence_max[self.labels.index(label)] if label else self.confidence_max.max()
+        return float(value) if np.isfinite(value) else float('nan')
+
+    def histogram(self, nbins=20):
+        """
+        Confidence histogram over [0, 1], matching ``np.histogram(..., range=(0, 1))``.
+
+        Args:
+            nbins (int): Number of bins
+
+        Returns:
+            tuple: (counts, edges) arrays
+        """
+        steps = np.arange(self.resolution + 1)
+        bins = np.minimum(steps * nbins // self.resolution, nbins - 1)
+        counts = np.bincount(bins, weights=self.grid_counts.sum(axis=0), minlength=nbins).astype(np.int64)
+        return counts, np.linspace(0.0, 1.0, nbins + 1)
+
+    def per_class_stats(self):
+        """
+        Get count and confidence statistics for every label with predictions.
+
+        Returns:
+            dict: Mapping of label to a dict of statistics
+        """
+        return {
+            label: {
+                'count': int(self.counts[i]),
+                'mean_confidence': round(self.mean(label), 3),
+                'median_confidence': round(self.quantile(0.5, label), 3),
+                'min_confidence': round(self.min(label), 3),
+                'max_confidence': round(self.max(label), 3),
+                'high_confidence': int(self.high_counts[i]),
+                'low_confidence': int(self.low_counts[i])
+            }
+            for i, label in enumerate(self.labels) if self.counts[i] > 0
+        }
+
+    def to_distribution(self):
+        """
+        Sentiment distribution in the format of ``SentimentAnalyzer.get_sentiment_distribution``.
+
+        Returns:
+            dict: Mapping of label to "count (pct%)"
+        """
+        total = self.total
+        return {
+            sentiment: f"{count} ({count/total*100:.1f}%)"
+            for sentiment, count in self.label_counts().items()
+        }
+
+    def to_confidence_stats(self):
+        """
+        Confidence statistics in the format of ``SentimentAnalyzer.get_confidence_stats``.
+
+        Returns:
+            dict: Confidence statistics
+        """
+        if self.total == 0:
+            return {}
+
+        return {
+            'Mean Confidence': round(self.mean(), 3),
+            'Median Confidence': round(self.quantile(0.5), 3),
+            'Min Confidence': round(self.min(), 3),
+            'Max Confidence': round(self.max(), 3),
+            f'High Confidence (>{self.high_threshold})': int(self.high_counts.sum()),
+            f'Low Confidence (<{self.low_threshold})': int(self.low_counts.sum())
+        }
+
+    def to_summary_table(self):
+        """
+        Summary statistics in the format of ``VisualizationGenerator.create_summary_stats_table``.
+
+        Returns:
+            dict: Summary statistics
+        """
+        label_counts = self.label_counts()
+        return {
+            'Total Entries': self.total,
+            'Unique Sentiments': len(label_counts),
+            'Most Common Sentiment': next(iter(label_counts), 'N/A'),
+            'Average Confidence': f"{self.mean():.2f}" if self.total else 'N/A',
+            f'High Confidence (>{self.high_threshold})': int(self.high_counts.sum())
+        }
@@ -0,0 +1,254 @@
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+import pandas as pd
+
+
+class SessionResultStore:
+    def __init__(self, memory_budget_mb=512, ttl_seconds=3600, max_sessions=64, spill_dir=None):
+        """
+        Per-session storage of processed results with a shared memory budget.
+
+        Sessions are kept in least-recently-used order. When the in-memory results
+        and the DataFrames in their metadata exceed the budget, the least recently
+        used results are pickled to disk and reloaded on their next access; pickling
+        and reloading run outside the store lock, so they do not block other
+        sessions. Sessions idle for longer than the TTL, and the oldest sessions
+        beyond ``max_sessions``, are dropped entirely, together with their spill file
+        and the folder of their ``download_path`` metadata.
+
+        Args:
+            memory_budget_mb (float): Memory budget for in-memory results, in MB
+            ttl_seconds (float): Idle time after which a session's results are dropped
+            max_sessions (int): Maximum number of sessions kept, in memory or on disk
+            spill_dir (str): Directory for spilled results (defaults to a temp directory)
+        """
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.spill_dir = spill_dir or tempfile.mkdtemp(prefix='sentiment_sessions_')
+        os.makedirs(self.spill_dir, exist_ok=True)
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_session_id():
+        """
+        Create a new random session id.
+
+        Returns:
+            str: Session id
+        """
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def _size_of(data):
+        """Approximate in-memory size of a result's DataFrame in bytes."""
+        if data is None:
+            return 0
+        return int(data.memory_usage(deep=True).sum())
+
+    @classmethod
+    def _metadata_size(cls, metadata):
+        """Approximate in-memory size of the DataFrames among a session's metadata."""
+        return sum(cls._size_of(value) for value in metadata.values() if isinstance(value, pd.DataFrame))
+
+    def put(self, session_id, data, **metadata):
+        """
+        Store the results of a session, replacing any previous results.
+
+        Args:
+            session_id (str): Session id
+            data (pd.DataFrame): Processed results
+            **metadata: Companion values kept in memory (e.g. summary, fingerprint);
+                ``download_path`` names a file in a per-session folder that is
+                deleted when the session is dropped
+        """
+        with self._lock:
+            self._remove(session_id, keep_path=metadata.get('download_path'))
+            self._entries[session_id] = {
+                'data': data,
+                'metadata': metadata,
+                'size': self._size_of(data),
+                'metadata_size': self._metadata_size(metadata),
+                'spill_path': None,
+                'spilling': False,
+                'last_access': time.monotonic()
+            }
+            victims = self._enforce_limits(keep=session_id)
+        self._spill(victims)
+
+    def get(self, session_id):
+        """
+        Fetch the results of a session.
+
+        Args:
+            session_id (str): Session id
+
+        Returns:
+            tuple: (data, metadata dict), or (None, {}) if the session has no results
+        """
+        while True:
+            with self._lock:
+                self._expire()
+                entry = self._entries.get(session_id) if session_id else None
+                if entry is None:
+                    return None, {}
+
+                entry['last_access'] = time.monotonic()
+                self._entries.move_to_end(session_id)
+                data, metadata, spill_path = entry['data'], dict(entry['metadata']), entry['spill_path']
+
+            if data is not None or spill_path is None:
+                break
+
+            # Reload outside the lock; another request may restore or drop the
+            # session meanwhile, in which case the file is gone and we look again
+            try:
+                with open(spill_path, 'rb') as f:
+                    data = pickle.load(f)
+            except FileNotFoundError:
+                continue
+
+            with self._lock:
+                restored = self._entries.get(session_id) is entry and entry['spill_path'] == spill_path
+                if restored:
+                    entry['data'] = data
+                    entry['spill_path'] = None
+            if restored:
+                self._delete_file(spill_path)
+                break
+
+        with self._lock:
+            victims = self._enforce_limits(keep=session_id)
+        self._spill(victims)
+
+        return data, metadata
+
+    def update_metadata(self, session_id, **metadata):
+        """
+        Add companion values to a session's results, e.g. tables derived from them.
+
+        Args:
+            session_id (str): Session id
+            **metadata: Values merged into the session's metadata
+
+        Returns:
+            bool: False if the session has no results (anymore)
+        """
+        with self._lock:
+            entry = self._entries.get(session_id) if session_id else None
+            if entry is None:
+                return False
+            entry['metadata'].update(metadata)
+            entry['metadata_size'] = self._metadata_size(entry['metadata'])
+            victims = self._enforce_limits(keep=session_id)
+        self._spill(victims)
+        return True
+
+    def delete(self, session_id):
+        """
+        Drop the results of a session.
+
+        Args:
+            session_id (str): Session id
+        """
+        with self._lock:
+            self._remove(session_id)
+
+    def memory_usage(self):
+        """
+        Bytes currently held in memory by stored results and their metadata.
+
+        Returns:
+            int: Approximate size in bytes
+        """
+        with self._lock:
+            return self._in_memory()
+
+    def close(self):
+        """Drop all sessions and delete the spill directory."""
+        with self._lock:
+            for session_id in list(self._entries):
+                self._remove(session_id)
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def _in_memory(self):
+        return sum(e['metadata_size'] + (e['size'] if e['data'] is not None else 0)
+                   for e in self._entries.values())
+
+    @staticmethod
+    def _delete_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            # Already gone, or still open elsewhere; close() clears the spill directory
+            pass
+
+    def _remove(self, session_id, keep_path=None):
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return
+        if entry['spill_path']:
+            self._delete_file(entry['spill_path'])
+
+        download_path = entry['metadata'].get('download_path')
+        if not download_path or download_path == keep_path:
+            return
+        folder = os.path.dirname(download_path)
+        if keep_path is None and os.path.basename(folder) == session_id:
+            shutil.rmtree(folder, ignore_errors=True)
+        else:
+            # Replaced results of a continuing session, or a shared folder
+            self._delete_file(download_path)
+
+    def _expire(self):
+        now = time.monotonic()
+        expired = [sid for sid, e in self._entries.items() if now - e['last_access'] > self.ttl_seconds]
+        for session_id in expired:
+            self._remove(session_id)
+
+    def _spill(self, victims):
+        """Pickle results chosen by ``_enforce_limits``; must be called without the lock."""
+        for session_id, entry, data, last_access in victims:
+            path = os.path.join(self.spill_dir, f'{session_id}_{uuid.uuid4().hex}.pkl')
+            with open(path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            with self._lock:
+                entry['spilling'] = False
+                # Keep the results in memory if the session was dropped, replaced or
+                # used while they were being written
+                spilled = (self._entries.get(session_id) is entry and entry['data'] is data
+                           and entry['last_access'] == last_access)
+                if spilled:
+                    entry['data'] = None
+                    entry['spill_path'] = path
+            if not spilled:
+                self._delete_file(path)
+
+    def _enforce_limits(self, keep=None):
+        """Drop expired and excess sessions and choose the results to spill."""
+        self._expire()
+
+        while len(self._entries) > self.max_sessions:
+            self._remove(next(iter(self._entries)))
+
+        victims = []
+        # Results already being written out no longer count against the budget
+        in_memory = self._in_memory() - sum(e['size'] for e in self._entries.values() if e['spilling'])
+        for session_id, entry in self._entries.items():
+            if in_memory <= self.memory_budget:
+                break
+            if session_id == keep or entry['data'] is None or entry['spilling']:
+                continue
+            entry['spilling'] = True
+            victims.append((session_id, entry, entry['data'], entry['last_access']))
+            in_memory -= entry['size']
+        return victims
@@ -0,0 +1,59 @@
+import os
+import time
+import zlib
+
+
+def follow_file(path, is_finished, poll_interval=0.5, block_size=64 * 1024):
+    """
+    Yield the bytes of a file while another thread is still appending to it.
+
+    Args:
+        path (str): File being written
+        is_finished (callable): Returns True once the writer is done
+        poll_interval (float): Seconds to wait when no new data is available
+        block_size (int): Maximum bytes yielded at a time
+
+    Yields:
+        bytes: File contents in order
+    """
+    # The writer may not have created the file yet
+    while not os.path.exists(path):
+        if is_finished():
+            return
+        time.sleep(poll_interval)
+
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if block:
+                yield block
+                continue
+
+            if is_finished():
+                # Pick up anything written between the last read and completion
+                block = f.read()
+                if block:
+                    yield block
+                return
+
+            time.sleep(poll_interval)
+
+
+def gzip_stream(blocks, level=6):
+    """
+    Gzip-compress a stream of byte blocks on the fly.
+
+    Args:
+        blocks (iterable): Uncompressed byte blocks
+        level (int): Compression level (1-9)
+
+    Yields:
+        bytes: Gzip-formatted output
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for block in blocks:
+        # Sync-flush so the client receives each block without waiting for more input
+        compressed = compressor.compress(block) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
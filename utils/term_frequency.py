@@ -0,0 +1,87 @@
+import re
+from collections import Counter, defaultdict
+import pandas as pd
+from wordcloud import STOPWORDS
+
+
+class TermFrequencyCounter:
+    def __init__(self, stopwords=None, min_length=2):
+        """
+        Accumulate term counts chunk by chunk, overall and per sentiment class.
+
+        Args:
+            stopwords (set): Words to ignore (defaults to the word cloud stopwords)
+            min_length (int): Minimum term length in characters
+        """
+        self.stopwords = set(STOPWORDS if stopwords is None else stopwords)
+        self.min_length = min_length
+        self.token_pattern = re.compile(r"\w[\w']+")
+        self.totals = Counter()
+        self.by_sentiment = defaultdict(Counter)
+
+    def _count(self, texts):
+        """Count terms of an iterable of texts."""
+        return Counter(
+            token for token in self.token_pattern.findall(' '.join(texts).lower())
+            if len(token) >= self.min_length and token not in self.stopwords
+        )
+
+    def update(self, texts, sentiments=None):
+        """
+        Add one chunk of texts to the counts.
+
+        Args:
+            texts (iterable): Texts of the chunk
+            sentiments (iterable): Sentiment label of each text (optional)
+        """
+        texts = pd.Series(list(texts), dtype=object)
+
+        if sentiments is None:
+            self.totals.update(self._count(texts.dropna().astype(str)))
+            return
+
+        chunk = pd.DataFrame({'text': texts, 'sentiment': pd.Series(list(sentiments), dtype=object)})
+        chunk = chunk.dropna(subset=['text'])
+        for sentiment, group in chunk.groupby(chunk['sentiment'].astype(str)):
+            counts = self._count(group['text'].astype(str))
+            self.by_sentiment[sentiment].update(counts)
+            self.totals.update(counts)
+
+    def update_dataframe(self, df, text_column, sentiment_column='sentiment', chunk_size=10000):
+        """
+        Count terms of a DataFrame column in fixed-size chunks.
+
+        Args:
+            df (pd.DataFrame): DataFrame with text data
+            text_column (str): Name of the text column
+            sentiment_column (str): Name of the sentiment column; counts are kept per
+                class when it exists
+            chunk_size (int): Rows joined and tokenized at a time
+
+        Returns:
+            TermFrequencyCounter: self, for chaining
+        """
+        has_sentiment = sentiment_column in df.columns
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start+chunk_size]
+            self.update(
+                chunk[text_column],
+                chunk[sentiment_column] if has_sentiment else None
+            )
+        return self
+
+    def frequencies(self, sentiment=None, top_n=None):
+        """
+        Get term frequencies, overall or for one sentiment class.
+
+        Args:
+            sentiment (str): Sentiment class (optional)
+            top_n (int): Only return the most frequent terms (optional)
+
+        Returns:
+            dict: Mapping of term to count
+        """
+        counts = self.by_sentiment.get(sentiment, Counter()) if sentiment else self.totals
+        if top_n:
+            return dict(counts.most_common(top_n))
+        return dict(counts)
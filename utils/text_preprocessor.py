@@ -8,11 +8,22 @@ from textblob import TextBlob
 import pandas as pd
 
 class TextPreprocessor:
-    def __init__(self):
-        """Initialize the text preprocessor with required NLTK data."""
+    def __init__(self, language_profiles=None, default_profile='light'):
+        """
+        Initialize the text preprocessor with required NLTK data.
+        
+        Args:
+            language_profiles (dict): Mapping of language code to preprocessing profile
+                used by ``clean_text_for_language``: 'full' (English stopwords and
+                lemmatization), 'light' (keeps punctuation, non-Latin scripts and emoji)
+                or 'none'
+            default_profile (str): Profile for languages not in ``language_profiles``
+        """
         self._download_nltk_data()
         self.lemmatizer = WordNetLemmatizer()
         self.stop_words = set(stopwords.words('english'))
+        self.language_profiles = language_profiles or {'en': 'full'}
+        self.default_profile = default_profile
     
     def _download_nltk_data(self):
         """Download required NLTK data if not already present."""
@@ -50,17 +61,7 @@ class TextPreprocessor:
         if pd.isna(text) or not isinstance(text, str):
             return ""
         
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-        
-        # Remove mentions and hashtags
-        text = re.sub(r'@\w+|#\w+', '', text)
+        text = self._remove_links_and_mentions(text)
         
         # Remove emojis and special unicode characters
         text = re.sub(r'[^\w\s]', '', text)
@@ -82,7 +83,66 @@ class TextPreprocessor:
         
         return ' '.join(tokens)
     
-    def preprocess_dataframe(self, df, text_column, apply_preprocessing=True):
+    def _remove_links_and_mentions(self, text):
+        """Lowercase text and remove URLs, email addresses, mentions and hashtags."""
+        # Convert to lowercase
+        text = text.lower()
+        
+        # Remove URLs
+        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+        
+        # Remove email addresses
+        text = re.sub(r'\S+@\S+', '', text)
+        
+        # Remove mentions and hashtags
+        text = re.sub(r'@\w+|#\w+', '', text)
+        
+        return text
+    
+    def clean_text_light(self, text):
+        """
+        Language-neutral cleaning that keeps punctuation, every script and emoji.
+        
+        Args:
+            text (str): Input text to clean
+        
+        Returns:
+            str: Cleaned text
+        """
+        if pd.isna(text) or not isinstance(text, str):
+            return ""
+        
+        text = self._remove_links_and_mentions(text)
+        
+        # Remove extra whitespace
+        return re.sub(r'\s+', ' ', text).strip()
+    
+    def clean_text_for_language(self, text, language, apply_preprocessing=True):
+        """
+        Clean text with the preprocessing profile of its language.
+        
+        The English stopword list and lemmatizer only help English text, and
+        stripping punctuation removes emoji and the combining marks of scripts such
+        as Devanagari, which the multilingual model can use. Other languages
+        therefore get the light profile by default.
+        
+        Args:
+            text (str): Input text to clean
+            language (str): Language code, e.g. from LanguageDetector
+            apply_preprocessing (bool): Whether to apply full preprocessing for 'full' profiles
+        
+        Returns:
+            str: Cleaned text
+        """
+        profile = self.language_profiles.get(language, self.default_profile)
+        
+        if profile == 'none':
+            return text if isinstance(text, str) else ""
+        if profile == 'light':
+            return self.clean_text_light(text)
+        return self.clean_text(text, apply_preprocessing)
+    
+    def preprocess_dataframe(self, df, text_column, apply_preprocessing=True, language_column=None):
         """
         Preprocess text data in a DataFrame.
         
@@ -90,16 +150,24 @@ class TextPreprocessor:
             df (pd.DataFrame): Input DataFrame
             text_column (str): Name of the text column to preprocess
             apply_preprocessing (bool): Whether to apply full preprocessing
-            
+            language_column (str): Column of language codes; if given, each row is
+                cleaned with its language's profile (optional)
+        
         Returns:
             pd.DataFrame: DataFrame with cleaned text
         """
         df_copy = df.copy()
         
         # Clean the text column
-        df_copy[f'{text_column}_cleaned'] = df_copy[text_column].apply(
-            lambda x: self.clean_text(x, apply_preprocessing)
-        )
+        if language_column:
+            df_copy[f'{text_column}_cleaned'] = [
+                self.clean_text_for_language(text, language, apply_preprocessing)
+                for text, language in zip(df_copy[text_column], df_copy[language_column])
+            ]
+        else:
+            df_copy[f'{text_column}_cleaned'] = df_copy[text_column].apply(
+                lambda x: self.clean_text(x, apply_preprocessing)
+            )
         
         # Remove empty rows after cleaning
         df_copy = df_copy[df_copy[f'{text_column}_cleaned'].str.len() > 0]
@@ -110,6 +178,9 @@ class TextPreprocessor:
         """
         Extract top keywords from text using TextBlob.
         
+        This runs the noun-phrase chunker on one text; use KeywordExtractor for
+        corpus-level keyword reports.
+        
         Args:
             text (str): Input text
             top_n (int): Number of top keywords to return
@@ -0,0 +1,77 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+
+class VisualizationCache:
+    def __init__(self, max_datasets=4):
+        """
+        Cache rendered charts per dataset fingerprint.
+
+        Args:
+            max_datasets (int): Number of datasets whose charts are kept (least recently
+                used datasets are evicted first)
+        """
+        self.max_datasets = max_datasets
+        self._charts = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(df):
+        """
+        Compute a content fingerprint of a DataFrame.
+
+        Args:
+            df (pd.DataFrame): DataFrame to fingerprint
+
+        Returns:
+            str: Hex digest identifying the DataFrame's columns and values
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(list(df.columns)).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def get(self, fingerprint, chart_name, builder):
+        """
+        Return a cached chart, building it on first request.
+
+        Args:
+            fingerprint (str): Dataset fingerprint
+            chart_name (str): Chart identifier within the dataset
+            builder (callable): Zero-argument function rendering the chart
+
+        Returns:
+            object: The rendered chart
+        """
+        with self._lock:
+            charts = self._charts.get(fingerprint)
+            if charts is not None:
+                self._charts.move_to_end(fingerprint)
+                if chart_name in charts:
+                    return charts[chart_name]
+
+        chart = builder()
+
+        with self._lock:
+            charts = self._charts.setdefault(fingerprint, {})
+            charts[chart_name] = chart
+            self._charts.move_to_end(fingerprint)
+            while len(self._charts) > self.max_datasets:
+                self._charts.popitem(last=False)
+
+        return chart
+
+    def clear(self, fingerprint=None):
+        """
+        Drop cached charts for one dataset, or for all datasets.
+
+        Args:
+            fingerprint (str): Dataset fingerprint (optional)
+        """
+        with self._lock:
+            if fingerprint is None:
+                self._charts.clear()
+            else:
+                self._charts.pop(fingerprint, None)
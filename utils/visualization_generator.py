@@ -9,6 +9,13 @@ from io import BytesIO
 import base64
 from collections import Counter
 import numpy as np
+from .term_frequency import TermFrequencyCounter
+from .sentiment_labels import SENTIMENT_LABELS, to_sentiment_categorical, sentiment_to_stars
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
 
 class VisualizationGenerator:
     def __init__(self):
@@ -20,19 +27,36 @@ class VisualizationGenerator:
             'Negative': '#e74c3c',
             'Very Negative': '#c0392b'
         }
+        self.sentiment_order = list(SENTIMENT_LABELS)
+        self.sentiment_stars = {label: stars for stars, label in enumerate(self.sentiment_order, start=1)}
+        self.timeline_granularities = {
+            'hour': pd.offsets.Hour(),
+            'day': pd.offsets.Day(),
+            'week': pd.offsets.Week(weekday=6),
+            'month': pd.offsets.MonthBegin()
+        }
+    
+    def _sentiment_counts(self, df, sentiment_column, summary):
+        """Sentiment counts, most common first, from a summary or the DataFrame."""
+        if summary is not None:
+            return pd.Series(summary.label_counts())
+        # Categorical columns also count labels that never occur
+        counts = df[sentiment_column].value_counts()
+        return counts[counts > 0]
     
-    def create_sentiment_pie_chart(self, df, sentiment_column='sentiment'):
+    def create_sentiment_pie_chart(self, df, sentiment_column='sentiment', summary=None):
         """
         Create a pie chart showing sentiment distribution.
         
         Args:
             df (pd.DataFrame): DataFrame with sentiment data
             sentiment_column (str): Name of the sentiment column
+            summary (SentimentSummary): Precomputed summary; the DataFrame is not scanned if given
             
         Returns:
             plotly.graph_objects.Figure: Pie chart figure
         """
-        sentiment_counts = df[sentiment_column].value_counts()
+        sentiment_counts = self._sentiment_counts(df, sentiment_column, summary)
         
         colors = [self.sentiment_colors.get(sentiment, '#95a5a6') 
                  for sentiment in sentiment_counts.index]
@@ -67,18 +91,19 @@ class VisualizationGenerator:
         
         return fig
     
-    def create_sentiment_bar_chart(self, df, sentiment_column='sentiment'):
+    def create_sentiment_bar_chart(self, df, sentiment_column='sentiment', summary=None):
         """
         Create a bar chart showing sentiment distribution.
         
         Args:
             df (pd.DataFrame): DataFrame with sentiment data
             sentiment_column (str): Name of the sentiment column
+            summary (SentimentSummary): Precomputed summary; the DataFrame is not scanned if given
             
         Returns:
             plotly.graph_objects.Figure: Bar chart figure
         """
-        sentiment_counts = df[sentiment_column].value_counts()
+        sentiment_counts = self._sentiment_counts(df, sentiment_column, summary)
         
         colors = [self.sentiment_colors.get(sentiment, '#95a5a6') 
                  for sentiment in sentiment_counts.index]
@@ -106,41 +131,82 @@ class VisualizationGenerator:
         
         return fig
     
-    def create_wordcloud(self, df, text_column, sentiment_filter=None):
+    def count_terms(self, df, text_column, sentiment_column='sentiment'):
         """
-        Create a word cloud from text data.
+        Count terms of a text column in one chunked pass, overall and per sentiment.
         
         Args:
             df (pd.DataFrame): DataFrame with text data
             text_column (str): Name of the text column
-            sentiment_filter (str): Filter by specific sentiment (optional)
+            sentiment_column (str): Name of the sentiment column
             
         Returns:
-            str: Base64 encoded image of the word cloud
+            TermFrequencyCounter: Term counts usable for every sentiment filter
         """
-        # Filter by sentiment if specified
-        if sentiment_filter:
-            filtered_df = df[df['sentiment'] == sentiment_filter]
-        else:
-            filtered_df = df
-        
-        if filtered_df.empty:
-            return None
+        return TermFrequencyCounter().update_dataframe(df, text_column, sentiment_column)
+    
+    def _wordcloud_frequencies(self, df, text_column, sentiment_filter, term_counts):
+        """Term frequencies for a word cloud, counting only the needed rows if no counts are given."""
+        if term_counts is not None:
+            return term_counts.frequencies(sentiment_filter, top_n=1000)
         
-        # Combine all text
-        text = ' '.join(filtered_df[text_column].astype(str))
+        if sentiment_filter:
+            df = df[df['sentiment'] == sentiment_filter]
         
-        if not text.strip():
-            return None
+        if df.empty:
+            return {}
         
-        # Generate word cloud
-        wordcloud = WordCloud(
+        term_counts = TermFrequencyCounter().update_dataframe(df, text_column, sentiment_column=None)
+        return term_counts.frequencies(top_n=1000)
+    
+    def _build_wordcloud(self, frequencies):
+        """Lay out a word cloud from term frequencies."""
+        return WordCloud(
             width=800,
             height=400,
             background_color='white',
             max_words=100,
             colormap='viridis'
-        ).generate(text)
+        ).generate_from_frequencies(frequencies)
+    
+    def create_wordcloud_image(self, df, text_column, sentiment_filter=None, term_counts=None):
+        """
+        Create a word cloud as a PIL image, without going through matplotlib or base64.
+        
+        Args:
+            df (pd.DataFrame): DataFrame with text data
+            text_column (str): Name of the text column
+            sentiment_filter (str): Filter by specific sentiment (optional)
+            term_counts (TermFrequencyCounter): Precomputed counts from ``count_terms``
+            
+        Returns:
+            PIL.Image.Image: Word cloud image, or None if there is no text
+        """
+        frequencies = self._wordcloud_frequencies(df, text_column, sentiment_filter, term_counts)
+        if not frequencies:
+            return None
+        
+        return self._build_wordcloud(frequencies).to_image()
+    
+    def create_wordcloud(self, df, text_column, sentiment_filter=None, term_counts=None):
+        """
+        Create a word cloud from text data.
+        
+        Args:
+            df (pd.DataFrame): DataFrame with text data
+            text_column (str): Name of the text column
+            sentiment_filter (str): Filter by specific sentiment (optional)
+            term_counts (TermFrequencyCounter): Precomputed counts from ``count_terms``;
+                pass the same counts for several filters to avoid re-reading the text
+            
+        Returns:
+            str: Base64 encoded image of the word cloud
+        """
+        frequencies = self._wordcloud_frequencies(df, text_column, sentiment_filter, term_counts)
+        if not frequencies:
+            return None
+        
+        wordcloud = self._build_wordcloud(frequencies)
         
         # Convert to base64 image
         plt.figure(figsize=(10, 5))
@@ -160,7 +226,57 @@ class VisualizationGenerator:
         
         return img_base64
     
-    def create_sentiment_timeline(self, df, date_column, sentiment_column='sentiment'):
+    def _guess_date_format(self, dates, sample_size=50):
+        """
+        Find one format that parses every sampled date.
+        
+        Candidates are guessed month-first and day-first from several distinct
+        values, so an ambiguous first value such as 01/02 does not decide alone.
+        
+        Args:
+            dates (pd.Series): Raw date values
+            sample_size (int): Number of distinct values checked
+            
+        Returns:
+            str: strftime format, or None if no single format fits the sample
+        """
+        sample = dates.dropna().astype(str).drop_duplicates().head(sample_size)
+        candidates = []
+        for value in sample:
+            for dayfirst in (False, True):
+                date_format = guess_datetime_format(value, dayfirst=dayfirst)
+                if date_format and date_format not in candidates:
+                    candidates.append(date_format)
+        
+        for date_format in candidates:
+            if pd.to_datetime(sample, format=date_format, errors='coerce').notna().all():
+                return date_format
+        return None
+    
+    def _parse_dates(self, dates):
+        """
+        Parse a date column with a single inferred format when one fits.
+        
+        Args:
+            dates (pd.Series): Raw date values
+            
+        Returns:
+            pd.Series: Parsed datetimes (NaT where parsing failed)
+        """
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates
+        
+        date_format = self._guess_date_format(dates)
+        if date_format:
+            parsed = pd.to_datetime(dates, format=date_format, errors='coerce', cache=True)
+            # Fall back to per-value inference if any value does not match the format
+            if not (parsed.isna() & dates.notna()).any():
+                return parsed
+        
+        return pd.to_datetime(dates, errors='coerce', cache=True)
+    
+    def create_sentiment_timeline(self, df, date_column, sentiment_column='sentiment',
+                                  granularity='day', rolling_window=None):
         """
         Create a timeline showing sentiment trends over time.
         
@@ -168,69 +284,110 @@ class VisualizationGenerator:
             df (pd.DataFrame): DataFrame with date and sentiment data
             date_column (str): Name of the date column
             sentiment_column (str): Name of the sentiment column
+            granularity (str): Bucket size: 'hour', 'day', 'week' or 'month'
+            rolling_window (int): If set, add a rolling average of the star rating over
+                this many buckets on a secondary axis
             
         Returns:
             plotly.graph_objects.Figure: Timeline figure
         """
-        # Convert date column to datetime
-        df_copy = df.copy()
-        df_copy[date_column] = pd.to_datetime(df_copy[date_column], errors='coerce')
+        if granularity not in self.timeline_granularities:
+            raise ValueError(f"Unknown granularity '{granularity}', expected one of {list(self.timeline_granularities)}")
         
-        # Remove rows with invalid dates
-        df_copy = df_copy.dropna(subset=[date_column])
+        # Only the date and sentiment columns are touched, the DataFrame is not copied
+        dates = self._parse_dates(df[date_column])
+        valid = dates.notna().to_numpy()
         
-        if df_copy.empty:
+        if not valid.any():
             return None
         
-        # Group by date and sentiment
-        timeline_data = df_copy.groupby([df_copy[date_column].dt.date, sentiment_column]).size().reset_index(name='count')
-        timeline_data['date'] = pd.to_datetime(timeline_data[date_column])
-        
-        fig = px.line(
-            timeline_data,
-            x='date',
-            y='count',
-            color=sentiment_column,
-            color_discrete_map=self.sentiment_colors,
-            title='Sentiment Trends Over Time'
+        frame = pd.DataFrame(
+            {'sentiment': to_sentiment_categorical(df[sentiment_column])[valid]},
+            index=pd.DatetimeIndex(dates.to_numpy()[valid])
         )
+        freq = self.timeline_granularities[granularity]
+        
+        # Count rows per time bucket and sentiment; empty buckets are kept as zeros
+        timeline_data = frame.groupby([pd.Grouper(freq=freq), 'sentiment'], observed=True).size().unstack(fill_value=0)
+        timeline_data = timeline_data.resample(freq).sum()
+        
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        
+        columns = [label for label in self.sentiment_order if label in timeline_data.columns]
+        columns += [label for label in timeline_data.columns if label not in columns]
+        for sentiment in columns:
+            fig.add_trace(go.Scatter(
+                x=timeline_data.index,
+                y=timeline_data[sentiment],
+                mode='lines',
+                name=str(sentiment),
+                line=dict(color=self.sentiment_colors.get(sentiment, '#95a5a6'))
+            ), secondary_y=False)
+        
+        if rolling_window:
+            stars = sentiment_to_stars(frame['sentiment']).dropna()
+            if not stars.empty:
+                score = stars.resample(freq).mean().rolling(rolling_window, min_periods=1).mean()
+                fig.add_trace(go.Scatter(
+                    x=score.index,
+                    y=score.values,
+                    mode='lines',
+                    name=f'Avg. stars ({rolling_window}-{granularity} rolling)',
+                    line=dict(color='#2c3e50', width=3, dash='dot')
+                ), secondary_y=True)
+                fig.update_yaxes(title_text='Average Stars', range=[1, 5], secondary_y=True)
         
         fig.update_layout(
             title={
+                'text': 'Sentiment Trends Over Time',
                 'x': 0.5,
                 'xanchor': 'center',
                 'font': {'size': 20}
             },
             xaxis_title='Date',
-            yaxis_title='Count',
             font=dict(size=14),
             height=500,
             hovermode='x unified'
         )
+        fig.update_yaxes(title_text='Count', secondary_y=False)
         
         return fig
     
-    def create_confidence_distribution(self, df, confidence_column='confidence'):
+    def create_confidence_distribution(self, df, confidence_column='confidence', nbins=20, summary=None):
         """
         Create a histogram showing confidence score distribution.
         
+        Bins are computed server-side, so the figure holds ``nbins`` bars no matter
+        how many rows the DataFrame has.
+        
         Args:
             df (pd.DataFrame): DataFrame with confidence data
             confidence_column (str): Name of the confidence column
+            nbins (int): Number of histogram bins over [0, 1]
+            summary (SentimentSummary): Precomputed summary; the DataFrame is not scanned if given
             
         Returns:
             plotly.graph_objects.Figure: Histogram figure
         """
-        fig = px.histogram(
-            df,
-            x=confidence_column,
-            nbins=20,
-            title='Confidence Score Distribution',
-            color_discrete_sequence=['#3498db']
-        )
+        if summary is not None:
+            counts, edges = summary.histogram(nbins)
+        else:
+            confidences = df[confidence_column].to_numpy(dtype=float, na_value=np.nan)
+            confidences = confidences[~np.isnan(confidences)]
+            counts, edges = np.histogram(confidences, bins=nbins, range=(0.0, 1.0))
+        
+        fig = go.Figure(data=[go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            marker_color='#3498db',
+            customdata=np.stack([edges[:-1], edges[1:]], axis=1),
+            hovertemplate='%{customdata[0]:.2f} - %{customdata[1]:.2f}<br>Count: %{y}<extra></extra>'
+        )])
         
         fig.update_layout(
             title={
+                'text': 'Confidence Score Distribution',
                 'x': 0.5,
                 'xanchor': 'center',
                 'font': {'size': 20}
@@ -238,38 +395,62 @@ class VisualizationGenerator:
             xaxis_title='Confidence Score',
             yaxis_title='Frequency',
             font=dict(size=14),
-            height=500
+            height=500,
+            bargap=0.05
         )
         
         return fig
     
-    def create_sentiment_confidence_scatter(self, df, sentiment_column='sentiment', confidence_column='confidence'):
+    def create_sentiment_confidence_scatter(self, df, sentiment_column='sentiment', confidence_column='confidence',
+                                            max_points=2000, random_state=0):
         """
         Create a scatter plot showing sentiment vs confidence.
         
+        At most ``max_points`` rows are drawn, sampled evenly across sentiment classes
+        and jittered horizontally, so the figure size does not grow with the data.
+        Legend entries report the full per-class counts.
+        
         Args:
             df (pd.DataFrame): DataFrame with sentiment and confidence data
             sentiment_column (str): Name of the sentiment column
             confidence_column (str): Name of the confidence column
+            max_points (int): Maximum number of points drawn in total
+            random_state (int): Seed for sampling and jitter
             
         Returns:
             plotly.graph_objects.Figure: Scatter plot figure
         """
-        fig = px.scatter(
-            df,
-            x=sentiment_column,
-            y=confidence_column,
-            color=sentiment_column,
-            color_discrete_map=self.sentiment_colors,
-            title='Sentiment vs Confidence Score'
-        )
+        rng = np.random.default_rng(random_state)
+        sentiments = df[sentiment_column].astype(str).to_numpy()
+        confidences = df[confidence_column].to_numpy(dtype=float, na_value=np.nan)
+        
+        present = set(np.unique(sentiments))
+        classes = [label for label in self.sentiment_order if label in present]
+        classes += sorted(present - set(classes))
+        per_class = max(1, max_points // max(1, len(classes)))
+        
+        fig = go.Figure()
+        for position, label in enumerate(classes):
+            indices = np.flatnonzero(sentiments == label)
+            sample = indices if len(indices) <= per_class else rng.choice(indices, per_class, replace=False)
+            
+            fig.add_trace(go.Scattergl(
+                x=position + rng.uniform(-0.3, 0.3, len(sample)),
+                y=confidences[sample],
+                mode='markers',
+                name=f"{label} (n={len(indices):,})",
+                marker=dict(color=self.sentiment_colors.get(label, '#95a5a6'), size=5, opacity=0.6),
+                hovertemplate=f'{label}<br>Confidence: %{{y:.3f}}<extra></extra>'
+            ))
         
         fig.update_layout(
             title={
+                'text': 'Sentiment vs Confidence Score',
                 'x': 0.5,
                 'xanchor': 'center',
                 'font': {'size': 20}
             },
+            xaxis=dict(tickmode='array', tickvals=list(range(len(classes))), ticktext=classes),
             xaxis_title='Sentiment',
             yaxis_title='Confidence Score',
             font=dict(size=14),
@@ -278,7 +459,7 @@ class VisualizationGenerator:
         
         return fig
     
-    def create_summary_stats_table(self, df, sentiment_column='sentiment', confidence_column='confidence'):
+    def create_summary_stats_table(self, df, sentiment_column='sentiment', confidence_column='confidence', summary=None):
         """
         Create a summary statistics table.
         
@@ -286,10 +467,14 @@ class VisualizationGenerator:
             df (pd.DataFrame): DataFrame with sentiment data
             sentiment_column (str): Name of the sentiment column
             confidence_column (str): Name of the confidence column
+            summary (SentimentSummary): Precomputed summary; the DataFrame is not scanned if given
             
         Returns:
             dict: Summary statistics
         """
+        if summary is not None:
+            return summary.to_summary_table()
+        
         stats = {
             'Total Entries': len(df),
             'Unique Sentiments': df[sentiment_column].nunique(),